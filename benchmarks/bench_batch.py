@@ -0,0 +1,68 @@
+'''
+Throughput of BatchGame in moves per second for growing batch sizes,
+against stepping separate Game objects one move at a time
+
+    python -m benchmarks.bench_batch
+'''
+import time
+import numpy as np
+from src.batch import BatchGame
+from src.game import Game
+from src.utils import Stone
+from src.exceptions import KoException, SelfDestructException
+from benchmarks.bench_resolve_board import make_config
+
+SIZES = (9, 19)
+BATCH_SIZES = (1, 16, 128, 1024)
+
+
+def random_steps(board_size, num_games, seed=0):
+    '''
+    Return board_size ** 2 steps of random flat move indices for the batch
+    '''
+    rng = np.random.default_rng(seed)
+    num_steps = board_size * board_size
+    return rng.integers(num_steps, size=(num_steps, num_games))
+
+
+def time_batch(board_size, num_games):
+    batch = BatchGame(make_config(board_size), num_games)
+    steps = random_steps(board_size, num_games)
+    stone = Stone.BLACK
+    t0 = time.perf_counter()
+    for moves in steps:
+        batch.step(stone, moves)
+        stone = Stone.WHITE if stone == Stone.BLACK else Stone.BLACK
+    return time.perf_counter() - t0
+
+
+def time_games(board_size, num_games):
+    games = [Game(make_config(board_size)) for _ in range(num_games)]
+    steps = random_steps(board_size, num_games)
+    stone = Stone.BLACK
+    t0 = time.perf_counter()
+    for moves in steps:
+        for game, move in zip(games, moves):
+            y, x = divmod(int(move), board_size)
+            if game.board[y, x] != Stone.EMPTY:
+                continue
+            try:
+                game._place_stone(stone, y, x)
+            except (KoException, SelfDestructException):
+                pass
+        stone = Stone.WHITE if stone == Stone.BLACK else Stone.BLACK
+    return time.perf_counter() - t0
+
+
+def main():
+    for board_size in SIZES:
+        num_steps = board_size * board_size
+        rate = num_steps * 16 / time_games(board_size, 16)
+        print(f'{board_size}x{board_size} Game: {rate:,.0f} moves/sec')
+        for num_games in BATCH_SIZES:
+            rate = num_steps * num_games / time_batch(board_size, num_games)
+            print(f'{board_size}x{board_size} BatchGame N={num_games}: {rate:,.0f} moves/sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+'''
+Benchmark of the eval cache on a search-like workload: from the mid-game position of a
+seeded random game, ITERATIONS walks each make one of LINES fixed lines of DEPTH moves,
+calling get_scores and legal_moves at every position, then unmake them. The time per
+query and the hit rate are reported with and without the eval cache, as well as the cost
+of get_scores, legal_moves and is_legal on a position already seen
+
+    python -m benchmarks.bench_cache
+'''
+import random
+import time
+from src.game import Game
+from src.utils import get_opposite_stone
+from benchmarks.bench_resolve_board import SIZES, make_config, random_moves
+
+LINES = 20
+DEPTH = 4
+ITERATIONS = 200
+REPEATS = 3
+NUMBER = 1000
+
+
+def mid_game(config, moves):
+    game = Game(config)
+    for stone, y, x in moves[:len(moves) // 2]:
+        game._place_stone(stone, y, x)
+    return game, get_opposite_stone(moves[len(moves) // 2 - 1][0])
+
+
+def make_lines(config, moves, rng):
+    '''
+    Return LINES lines of DEPTH legal moves from the mid-game position
+    '''
+    game, stone = mid_game(config, moves)
+    lines = []
+    for _ in range(LINES):
+        line = []
+        s = stone
+        for _ in range(DEPTH):
+            legal = game.legal_moves(s).nonzero()
+            i = rng.randrange(len(legal[0]))
+            move = (s, int(legal[0][i]), int(legal[1][i]))
+            game.make_move(*move)
+            line.append(move)
+            s = get_opposite_stone(s)
+        for _ in line:
+            game.unmake_move()
+        lines.append(line)
+    return lines
+
+
+def time_walks(config, moves, lines, rng):
+    '''
+    Return the seconds per query of the walks, and the game
+    '''
+    game, _ = mid_game(config, moves)
+    num_queries = 0
+    elapsed = 0.
+    for _ in range(ITERATIONS):
+        line = rng.choice(lines)
+        for stone, y, x in line:
+            game.make_move(stone, y, x)
+            start = time.perf_counter()
+            game.get_scores()
+            game.legal_moves(get_opposite_stone(stone))
+            elapsed += time.perf_counter() - start
+            num_queries += 2
+        for _ in line:
+            game.unmake_move()
+    return elapsed / num_queries, game
+
+
+def time_query(query):
+    '''
+    Return the seconds per call of the query
+    '''
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        query()
+    return (time.perf_counter() - start) / NUMBER
+
+
+def main():
+    for board_size in SIZES:
+        moves = random_moves(board_size)
+        config = make_config(board_size)
+        cache_config = dict(config, eval_cache=True)
+        lines = make_lines(config, moves, random.Random(0))
+
+        without = min(time_walks(config, moves, lines, random.Random(1))[0]
+                      for _ in range(REPEATS))
+        runs = [time_walks(cache_config, moves, lines, random.Random(1)) for _ in range(REPEATS)]
+        with_cache = min(seconds for seconds, _ in runs)
+        stats = runs[0][1].eval_cache.stats()
+
+        queries = []
+        for game_config in (config, cache_config):
+            game, stone = mid_game(game_config, moves)
+            game.get_scores()
+            mask = game.legal_moves(stone)
+            y, x = (int(a[0]) for a in mask.nonzero())
+            queries.append([min(time_query(query) for _ in range(REPEATS)) for query in
+                            (game.get_scores, lambda: game.legal_moves(stone),
+                             lambda: game.is_legal(stone, y, x))])
+        (scores, legal, is_legal), (cached_scores, cached_legal, cached_is_legal) = queries
+
+        print(f'{board_size}x{board_size}: walks {without * 1e6:.1f} us per query, '
+              f'{with_cache * 1e6:.1f} us with the eval cache (hit rate '
+              f'{stats["hit_rate"]:.0%}, {stats["entries"]} entries, '
+              f'{stats["bytes"] / 1024:.0f} KiB); seen position: get_scores '
+              f'{scores * 1e6:.1f} -> {cached_scores * 1e6:.2f} us, legal_moves '
+              f'{legal * 1e6:.1f} -> {cached_legal * 1e6:.2f} us, is_legal '
+              f'{is_legal * 1e6:.2f} -> {cached_is_legal * 1e6:.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+'''
+Benchmark of extending one long chain on 19x19: black grows a single serpentine chain
+of CHAIN_LENGTH stones, and the time of resolve_board per stone is reported for every
+block of BLOCK stones, which should stay flat as the chain gets longer
+
+    python -m benchmarks.bench_chain
+'''
+import time
+from src.game import Game
+from src.utils import Stone
+from benchmarks.bench_resolve_board import make_config
+
+BOARD_SIZE = 19
+CHAIN_LENGTH = 200
+BLOCK = 50
+REPEATS = 20
+
+
+def chain_coords(board_size, length):
+    '''
+    Return the coordinates of a chain running along the even rows, alternately left to
+    right and right to left, joined at the ends through the odd rows (the last row is
+    followed by a stone on the row above its end)
+    '''
+    coords = []
+    for y in range(0, board_size, 2):
+        xs = range(board_size) if y % 4 == 0 else range(board_size - 1, -1, -1)
+        coords += [(y, x) for x in xs]
+        coords.append((y + 1 if y + 1 < board_size else y - 1, xs[-1]))
+    return coords[:length]
+
+
+def time_chain(coords):
+    '''
+    Return the seconds of resolve_board for every stone of the chain, in order
+    '''
+    game = Game(make_config(BOARD_SIZE))
+    board, gm = game.board, game.gm
+    elapsed = []
+    for y, x in coords:
+        board.place_stone(Stone.BLACK, y, x)
+        t0 = time.perf_counter()
+        gm.resolve_board(y, x)
+        elapsed.append(time.perf_counter() - t0)
+        gm.update_state()
+    assert gm.is_same_group(*coords[0], *coords[-1])
+    return elapsed
+
+
+def main():
+    coords = chain_coords(BOARD_SIZE, CHAIN_LENGTH)
+    runs = [time_chain(coords) for _ in range(REPEATS)]
+    best = [min(times) for times in zip(*runs)]
+    for start in range(0, CHAIN_LENGTH, BLOCK):
+        block = best[start:start + BLOCK]
+        print(f'stones {start + 1:>3}-{start + len(block):<3}: '
+              f'{sum(block) / len(block) * 1e6:.2f} us per resolve_board')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+'''
+Benchmark of feature plane extraction on 19x19 mid-game positions, for one game
+at a time with Game.feature_planes and for a batch with batch_feature_planes
+
+    python -m benchmarks.bench_features
+'''
+import timeit
+import numpy as np
+from src.game import Game
+from src.features import NUM_PLANES, batch_feature_planes
+from src.utils import Stone
+from benchmarks.bench_resolve_board import make_config, random_moves
+
+BOARD_SIZE = 19
+NUM_MOVES = 150
+BATCH_SIZE = 256
+REPEATS = 5
+
+
+def mid_game(seed):
+    game = Game(make_config(BOARD_SIZE))
+    for stone, y, x in random_moves(BOARD_SIZE, seed)[:NUM_MOVES]:
+        game._place_stone(stone, y, x)
+    return game
+
+
+def main():
+    games = [mid_game(seed) for seed in range(8)] * (BATCH_SIZE // 8)
+    stones = [Stone.BLACK] * BATCH_SIZE
+    out = np.empty((BATCH_SIZE, NUM_PLANES, BOARD_SIZE, BOARD_SIZE), dtype=np.uint8)
+
+    single = min(timeit.repeat(lambda: games[0].feature_planes(Stone.BLACK),
+                               number=100, repeat=REPEATS)) / 100
+    batch = min(timeit.repeat(lambda: batch_feature_planes(games, stones, out),
+                              number=1, repeat=REPEATS)) / BATCH_SIZE
+    print(f'{BOARD_SIZE}x{BOARD_SIZE}, {NUM_PLANES} planes: '
+          f'feature_planes {single * 1e6:.1f} us per position, '
+          f'batch of {BATCH_SIZE} {batch * 1e6:.1f} us per position')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+'''
+Timing harness of the GTP front end. A scripted session plays seeded random games:
+boardsize, then for every game clear_board, the moves with an undo and replay of every
+UNDO_EVERY-th move, genmove, showboard and final_score. The session is
+    - run in process through GTPEngine.run, and compared to the same moves made directly
+      with Game.make_move and Game.unmake_move, giving the overhead of the protocol
+    - piped through `python -m src.gtp`, less the startup of a session of quit only
+    - sent one command at a time to `python -m src.gtp`, waiting for every response,
+      giving the round trip latency of play
+and clear_board is compared to building a new Game
+
+    python -m benchmarks.bench_gtp [--board-size 19] [--games 5]
+'''
+import argparse
+import io
+import subprocess
+import sys
+import time
+from src.game import Game
+from src.gtp import GTPEngine, COLUMNS
+from benchmarks.bench_resolve_board import make_config, random_moves
+
+UNDO_EVERY = 10
+REPEATS = 5
+NUMBER = 1000
+
+
+def vertex(board_size, y, x):
+    return f'{COLUMNS[x]}{board_size - y}'
+
+
+def make_session(board_size, num_games):
+    '''
+    Return the lines of the scripted session, and the (stone, y, x) moves of every game
+    '''
+    lines = [f'boardsize {board_size}']
+    games = []
+    for seed in range(num_games):
+        moves = random_moves(board_size, seed)
+        games.append(moves)
+        lines.append('clear_board')
+        for i, (stone, y, x) in enumerate(moves):
+            play = f'play {"b" if stone == 1 else "w"} {vertex(board_size, y, x)}'
+            lines.append(play)
+            if i % UNDO_EVERY == 0:
+                lines += ['undo', play]
+        lines += ['genmove b', 'showboard', 'final_score']
+    lines.append('quit')
+    return lines, games
+
+
+def time_direct(config, games):
+    '''
+    Return the seconds to make the moves of the session directly on a Game
+    '''
+    start = time.perf_counter()
+    for moves in games:
+        game = Game(config)
+        for i, (stone, y, x) in enumerate(moves):
+            game.make_move(stone, y, x)
+            if i % UNDO_EVERY == 0:
+                game.unmake_move()
+                game.make_move(stone, y, x)
+    return time.perf_counter() - start
+
+
+def time_in_process(config, script):
+    '''
+    Return the seconds of GTPEngine.run on the script
+    '''
+    engine = GTPEngine(config, seed=0)
+    out = io.BytesIO()
+    start = time.perf_counter()
+    engine.run(io.BytesIO(script), out)
+    return time.perf_counter() - start
+
+
+def time_piped(script):
+    '''
+    Return the seconds of `python -m src.gtp` reading the piped script
+    '''
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'src.gtp', '--seed', '0'], input=script,
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def round_trips(lines):
+    '''
+    Return the seconds from writing every play command to `python -m src.gtp` to reading
+    its response
+    '''
+    process = subprocess.Popen([sys.executable, '-m', 'src.gtp', '--seed', '0'],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    latencies = []
+    for line in lines:
+        start = time.perf_counter()
+        process.stdin.write(line.encode() + b'\n')
+        process.stdin.flush()
+        while process.stdout.readline() != b'\n':
+            pass
+        if line.startswith('play'):
+            latencies.append(time.perf_counter() - start)
+    process.stdin.close()
+    process.wait()
+    return sorted(latencies)
+
+
+def time_clear(config, moves):
+    '''
+    Return the seconds of Game.clear_board after the moves, and of Game(config)
+    '''
+    game = Game(config)
+    clear = 0.
+    for _ in range(NUMBER):
+        for stone, y, x in moves:
+            game._place_stone(stone, y, x)
+        start = time.perf_counter()
+        game.clear_board()
+        clear += time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        Game(config)
+    return clear / NUMBER, (time.perf_counter() - start) / NUMBER
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Timing harness of the GTP front end')
+    parser.add_argument('--board-size', type=int, default=19)
+    parser.add_argument('--games', type=int, default=5)
+    args = parser.parse_args()
+    config = make_config(args.board_size)
+
+    lines, games = make_session(args.board_size, args.games)
+    script = ('\n'.join(lines) + '\n').encode()
+    num_commands = len(lines)
+    direct = min(time_direct(config, games) for _ in range(REPEATS))
+    in_process = min(time_in_process(config, script) for _ in range(REPEATS))
+    print(f'{num_commands} commands: {in_process * 1e3:.1f} ms in process, '
+          f'{direct * 1e3:.1f} ms for the same moves on Game, '
+          f'{(in_process - direct) / num_commands * 1e6:.2f} us per command of protocol')
+
+    startup = min(time_piped(b'quit\n') for _ in range(REPEATS))
+    piped = min(time_piped(script) for _ in range(REPEATS))
+    print(f'piped through python -m src.gtp: {(piped - startup) * 1e3:.1f} ms '
+          f'after {startup * 1e3:.1f} ms of startup, '
+          f'{(piped - startup) / num_commands * 1e6:.2f} us per command')
+
+    latencies = round_trips(lines[:1 + len(games[0]) * 2])
+    print(f'round trip of play, one command at a time: '
+          f'p50 {latencies[len(latencies) // 2] * 1e6:.0f} us, '
+          f'p99 {latencies[int(len(latencies) * 0.99)] * 1e6:.0f} us')
+
+    clear, new = time_clear(config, games[0][:len(games[0]) // 2])
+    print(f'clear_board after {len(games[0]) // 2} moves: {clear * 1e6:.1f} us, '
+          f'Game(config): {new * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
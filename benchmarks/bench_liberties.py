@@ -0,0 +1,72 @@
+'''
+Benchmark of the liberty plane: the cost it adds to every move of a seeded random game,
+and finding the stones in atari on the mid-game position from the plane against
+one GroupManager._get_group per point
+
+    python -m benchmarks.bench_liberties
+'''
+import time
+from src.game import Game
+from benchmarks.bench_resolve_board import SIZES, make_config, random_moves
+
+REPEATS = 10
+NUMBER = 1000
+
+
+def time_moves(config, moves):
+    '''
+    Return the seconds per move to replay the moves
+    '''
+    game = Game(config)
+    start = time.perf_counter()
+    for stone, y, x in moves:
+        game._place_stone(stone, y, x)
+    return (time.perf_counter() - start) / len(moves)
+
+
+def atari_from_groups(game):
+    '''
+    Return the coordinates of the stones in atari, reading the group of every point
+    '''
+    size = game.board_size
+    gm = game.gm
+    in_atari = []
+    for y in range(size):
+        for x in range(size):
+            g = gm._get_group(y, x)
+            if g is not None and g.num_liberties == 1:
+                in_atari.append((y, x))
+    return in_atari
+
+
+def time_query(query, game):
+    '''
+    Return the seconds per call of the query
+    '''
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        query(game)
+    return (time.perf_counter() - start) / NUMBER
+
+
+def main():
+    for board_size in SIZES:
+        moves = random_moves(board_size)
+        config = make_config(board_size)
+        plane_config = dict(config, liberty_plane=True)
+        without = min(time_moves(config, moves) for _ in range(REPEATS))
+        with_plane = min(time_moves(plane_config, moves) for _ in range(REPEATS))
+
+        game = Game(plane_config)
+        for stone, y, x in moves[:len(moves) // 2]:
+            game._place_stone(stone, y, x)
+        plane = min(time_query(lambda game: (game.liberty_plane == 1).nonzero(), game)
+                    for _ in range(REPEATS))
+        groups = min(time_query(atari_from_groups, game) for _ in range(REPEATS))
+        print(f'{board_size}x{board_size}: per move {without * 1e6:.2f} us, '
+              f'{with_plane * 1e6:.2f} us with the liberty plane; stones in atari: '
+              f'plane {plane * 1e6:.1f} us, _get_group per point {groups * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
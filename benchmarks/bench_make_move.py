@@ -0,0 +1,62 @@
+'''
+Benchmark of trying a move and taking it back on a 19x19 mid-game position:
+make_move / unmake_move against copy.deepcopy of the game
+
+    python -m benchmarks.bench_make_move
+'''
+import copy
+import timeit
+from src.game import Game
+from src.utils import Stone
+from src.exceptions import KoException, SelfDestructException
+from benchmarks.bench_resolve_board import make_config, random_moves
+
+BOARD_SIZE = 19
+NUM_MOVES = 150
+REPEATS = 5
+
+
+def mid_game():
+    '''
+    Return a game after NUM_MOVES seeded random moves, and the empty points
+    '''
+    game = Game(make_config(BOARD_SIZE))
+    for stone, y, x in random_moves(BOARD_SIZE)[:NUM_MOVES]:
+        game._place_stone(stone, y, x)
+    empty = [(y, x) for y in range(BOARD_SIZE) for x in range(BOARD_SIZE)
+             if game.board[y, x] == Stone.EMPTY]
+    return game, empty
+
+
+def try_make_unmake(game, empty):
+    for y, x in empty:
+        try:
+            game.make_move(Stone.BLACK, y, x)
+        except (KoException, SelfDestructException):
+            continue
+        game.unmake_move()
+
+
+def try_deepcopy(game, empty):
+    for y, x in empty:
+        branch = copy.deepcopy(game)
+        try:
+            branch.place_black(y, x)
+        except (KoException, SelfDestructException):
+            continue
+
+
+def main():
+    game, empty = mid_game()
+    make_unmake = min(timeit.repeat(lambda: try_make_unmake(game, empty),
+                                    number=1, repeat=REPEATS)) / len(empty)
+    deepcopy = min(timeit.repeat(lambda: try_deepcopy(game, empty),
+                                 number=1, repeat=REPEATS)) / len(empty)
+    print(f'{BOARD_SIZE}x{BOARD_SIZE}, {len(empty)} candidate moves: '
+          f'make/unmake {make_unmake * 1e6:.1f} us, '
+          f'deepcopy {deepcopy * 1e6:.1f} us per move '
+          f'({deepcopy / make_unmake:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
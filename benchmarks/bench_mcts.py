@@ -0,0 +1,26 @@
+'''
+Benchmark of the Monte Carlo Tree Search player from the empty board,
+in nodes created per second
+
+    python -m benchmarks.bench_mcts
+'''
+from src.game import Game
+from src.mcts import MCTS
+from src.utils import Stone
+from benchmarks.bench_resolve_board import make_config
+
+SIZES = (9, 19)
+PLAYOUTS = {9: 500, 19: 50}
+
+
+def main():
+    for board_size in SIZES:
+        game = Game(make_config(board_size))
+        mcts = MCTS(board_size, playouts=PLAYOUTS[board_size], seed=0)
+        mcts.get_move(game, Stone.BLACK)
+        print(f'{board_size}x{board_size}: {mcts.num_playouts} playouts in '
+              f'{mcts.search_time:.2f} s, {mcts.nodes_per_sec:.1f} nodes/sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+'''
+Benchmark of the memory held by a game on a mid-game position: the first half of a
+seeded random game is replayed while tracemalloc traces the allocations, and the memory
+still allocated afterwards is reported along with the number of groups in the group map
+
+    python -m benchmarks.bench_memory
+'''
+import gc
+import tracemalloc
+from src.game import Game
+from benchmarks.bench_resolve_board import SIZES, make_config, random_moves
+
+
+def mid_game_memory(board_size, moves):
+    '''
+    Return the bytes held by a game after the moves, and the number of distinct groups
+    referenced by its group map
+    '''
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    game = Game(make_config(board_size))
+    for stone, y, x in moves:
+        game._place_stone(stone, y, x)
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    groups = {id(g) for row in game.gm._group_map for g in row if g is not None}
+    return allocated, len(groups)
+
+
+def main():
+    for board_size in SIZES:
+        moves = random_moves(board_size)
+        moves = moves[:len(moves) // 2]
+        allocated, num_groups = mid_game_memory(board_size, moves)
+        print(f'{board_size}x{board_size}: {len(moves)} moves, {allocated / 1024:.1f} KiB '
+              f'per game, {num_groups} groups in the group map')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+'''
+Benchmark of random playouts from the empty board, in playouts per second
+
+    python -m benchmarks.bench_playout
+'''
+import random
+import time
+from src.game import Game
+from src.playout import playout
+from benchmarks.bench_resolve_board import make_config
+
+SIZES = (9, 19)
+NUM_PLAYOUTS = {9: 200, 19: 20}
+
+
+def main():
+    for board_size in SIZES:
+        config = make_config(board_size)
+        rng = random.Random(0)
+        num_playouts = NUM_PLAYOUTS[board_size]
+        start = time.perf_counter()
+        for _ in range(num_playouts):
+            playout(Game(config), rng)
+        elapsed = time.perf_counter() - start
+        print(f'{board_size}x{board_size}: {num_playouts / elapsed:.1f} playouts/sec '
+              f'({elapsed / num_playouts * 1e3:.2f} ms per playout)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+'''
+Benchmark of the binary game record format: a file of NUM_MOVES moves is written from
+seeded random 19x19 playouts, then games and positions are read back at random
+
+    python -m benchmarks.bench_records [moves]
+'''
+import os
+import random
+import sys
+import tempfile
+import time
+from src.game import Game
+from src.playout import playout
+from src.records import RecordWriter, RecordReader
+from src.utils import PASS
+from benchmarks.bench_resolve_board import make_config
+
+BOARD_SIZE = 19
+NUM_DISTINCT_GAMES = 20
+NUM_MOVES = 1000000
+NUM_READS = 10000
+NUM_SAMPLES = 20
+
+
+def random_moves(seed):
+    '''
+    Return the flat moves of a seeded random playout
+    '''
+    game = Game(make_config(BOARD_SIZE))
+    playout(game, random.Random(seed))
+    return [PASS if delta is None else delta.y * BOARD_SIZE + delta.x
+            for delta, _ in game._move_stack]
+
+
+def main():
+    num_moves = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_MOVES
+    games = [random_moves(seed) for seed in range(NUM_DISTINCT_GAMES)]
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'games.bin')
+        start = time.perf_counter()
+        with RecordWriter(path, BOARD_SIZE) as writer:
+            written = 0
+            while written < num_moves:
+                moves = games[written % NUM_DISTINCT_GAMES]
+                writer.write_game(moves)
+                written += len(moves)
+        write_time = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        reader = RecordReader(path)
+        open_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(NUM_READS):
+            reader[rng.randrange(len(reader))].sum()
+        read_time = (time.perf_counter() - start) / NUM_READS
+
+        start = time.perf_counter()
+        for _ in range(NUM_SAMPLES):
+            reader.sample(rng)
+        sample_time = (time.perf_counter() - start) / NUM_SAMPLES
+        del reader
+
+    print(f'{written} moves written in {write_time:.2f} s, '
+          f'{size / written:.2f} bytes per move')
+    print(f'open {open_time * 1e3:.2f} ms, random game read {read_time * 1e6:.1f} us, '
+          f'random position replayed into a Game {sample_time * 1e3:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
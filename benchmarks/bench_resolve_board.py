@@ -0,0 +1,84 @@
+'''
+Microbenchmark of GroupManager.resolve_board
+
+A seeded random game is generated once per board size, then replayed
+several times while only the time spent inside `resolve_board` is
+accumulated.
+
+    python -m benchmarks.bench_resolve_board
+'''
+import random
+import time
+from src.game import Game
+from src.utils import Stone
+from src.exceptions import KoException, SelfDestructException
+
+SIZES = (9, 13, 19)
+BACKENDS = ('numpy', 'bitboard', 'flat')
+REPEATS = 50
+
+
+def make_config(board_size, board_backend='numpy'):
+    return {'black_stone': 'b',
+            'white_stone': 'w',
+            'board_size': board_size,
+            'enable_self_destruct': False,
+            'board_backend': board_backend}
+
+
+def random_moves(board_size, seed=0):
+    '''
+    Return a list of (stone, y, x) legal moves generated by playing a
+    seeded random game, picking among the empty points, for at most
+    2 * board_size ** 2 moves
+    '''
+    rng = random.Random(seed)
+    game = Game(make_config(board_size))
+    stone = Stone.BLACK
+    moves = []
+    while len(moves) < 2 * board_size * board_size:
+        empty = [(y, x) for y in range(board_size) for x in range(board_size)
+                 if game.board[y, x] == Stone.EMPTY]
+        rng.shuffle(empty)
+        for y, x in empty:
+            try:
+                game._place_stone(stone, y, x)
+            except (KoException, SelfDestructException):
+                continue
+            moves.append((stone, y, x))
+            break
+        else:
+            break
+        stone = Stone.WHITE if stone == Stone.BLACK else Stone.BLACK
+    return moves
+
+
+def time_resolve_board(board_size, moves, board_backend='numpy'):
+    '''
+    Replay `moves` and return the total seconds spent in resolve_board
+    '''
+    game = Game(make_config(board_size, board_backend))
+    board, gm = game.board, game.gm
+    elapsed = 0.0
+    for stone, y, x in moves:
+        board.place_stone(stone, y, x)
+        t0 = time.perf_counter()
+        gm.resolve_board(y, x)
+        elapsed += time.perf_counter() - t0
+        gm.update_state()
+    return elapsed
+
+
+def main():
+    for board_size in SIZES:
+        moves = random_moves(board_size)
+        for board_backend in BACKENDS:
+            best = min(time_resolve_board(board_size, moves, board_backend)
+                       for _ in range(REPEATS))
+            per_call = best / len(moves) * 1e6
+            print(f'{board_size}x{board_size} {board_backend}: {len(moves)} moves, '
+                  f'{per_call:.2f} us per resolve_board')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+'''
+Benchmark of territory scoring: the vectorized region labelling against
+the reference depth first search, on seeded random finished games, and
+Board.get_territory, which picks one of the two by board size
+
+    python -m benchmarks.bench_scoring
+'''
+import timeit
+import numpy as np
+from src.game import Game
+from src.scoring import count_territory
+from benchmarks.bench_resolve_board import SIZES, make_config, random_moves
+
+NUM_GAMES = 10
+REPEATS = 5
+
+
+def finished_games(board_size):
+    '''
+    Return NUM_GAMES seeded random games played until the board fills up
+    '''
+    games = []
+    for seed in range(NUM_GAMES):
+        game = Game(make_config(board_size))
+        for stone, y, x in random_moves(board_size, seed=seed):
+            game._place_stone(stone, y, x)
+        games.append(game)
+    return games
+
+
+def best_time(fn):
+    return min(timeit.repeat(fn, number=1, repeat=REPEATS))
+
+
+def main():
+    for board_size in SIZES:
+        games = finished_games(board_size)
+        for game in games:
+            assert game.board.get_territory() == game.board.get_territory_dfs()
+
+        dfs = best_time(lambda: [game.board.get_territory_dfs() for game in games])
+        boards = [game.board.to_array() for game in games]
+        vectorized = best_time(lambda: [count_territory(stones) for stones in boards])
+        selected = best_time(lambda: [game.board.get_territory() for game in games])
+        stones = np.stack(boards)
+        batched = best_time(lambda: count_territory(stones))
+
+        print(f'{board_size}x{board_size}: '
+              f'dfs {dfs / NUM_GAMES * 1e6:.1f} us, '
+              f'vectorized {vectorized / NUM_GAMES * 1e6:.1f} us, '
+              f'get_territory {selected / NUM_GAMES * 1e6:.1f} us, '
+              f'batched {batched / NUM_GAMES * 1e6:.1f} us per game')
+
+
+if __name__ == '__main__':
+    main()
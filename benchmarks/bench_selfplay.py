@@ -0,0 +1,36 @@
+'''
+Benchmark of the self-play pipeline on 9x9, in games per second for an increasing
+number of worker processes, up to the number of cores
+
+    python -m benchmarks.bench_selfplay
+'''
+import multiprocessing
+import os
+import tempfile
+import time
+from src.selfplay import run_selfplay
+from benchmarks.bench_resolve_board import make_config
+
+BOARD_SIZE = 9
+GAMES_PER_PROCESS = 8
+
+
+def main():
+    config = make_config(BOARD_SIZE)
+    num_cores = multiprocessing.cpu_count()
+    processes = sorted({1, 2, 4, num_cores} & set(range(1, num_cores + 1)))
+    with tempfile.TemporaryDirectory() as directory:
+        base = None
+        for num_processes in processes:
+            num_games = GAMES_PER_PROCESS * num_processes
+            start = time.perf_counter()
+            run_selfplay(config, num_games, os.path.join(directory, 'games.jsonl'),
+                         processes=num_processes)
+            games_per_sec = num_games / (time.perf_counter() - start)
+            base = base or games_per_sec
+            print(f'{num_processes} processes: {games_per_sec:.1f} games/sec '
+                  f'({games_per_sec / base:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
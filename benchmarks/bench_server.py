@@ -0,0 +1,127 @@
+'''
+Load generator of the multi-game server: starts a GameServer on localhost in this process,
+then `--connections` clients play `--moves` moves in each of `--games` games, spread
+over the connections, and the latency of every move command (from sending the line to
+reading the reply) is reported as percentiles. The memory per hosted game is measured
+with tracemalloc on games created through GameServer.execute, along with the size of
+an evicted game on disk
+
+    python -m benchmarks.bench_server [--games 2000] [--connections 100] [--moves 60]
+'''
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from src.server import GameServer
+from benchmarks.bench_resolve_board import make_config, random_moves
+
+NUM_SEQUENCES = 8
+
+
+def label(idx):
+    '''
+    Return the coordinate label of the index, as Board._index_to_label
+    '''
+    return str(idx) if idx < 10 else chr(idx - 10 + ord('A'))
+
+
+def move_lines(game_id, moves):
+    return [f'move {game_id} {label(y)} {label(x)}\n'.encode() for _, y, x in moves]
+
+
+async def run_client(port, game_ids, sequences, num_moves, latencies):
+    '''
+    Create the games on one connection, then play one move in every game in turn,
+    recording the seconds of every move command
+    '''
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for i in range(len(game_ids)):
+        writer.write(b'new\n')
+        game_ids[i] = (await reader.readline()).split()[1].decode()
+    lines = [move_lines(game_id, sequences[int(game_id) % len(sequences)])
+             for game_id in game_ids]
+    clock = time.perf_counter
+    for n in range(num_moves):
+        for game_lines in lines:
+            start = clock()
+            writer.write(game_lines[n])
+            reply = await reader.readline()
+            latencies.append(clock() - start)
+            assert reply == b'ok\n', reply
+    writer.close()
+
+
+async def run_load(config, num_games, num_connections, num_moves):
+    '''
+    Return the latencies of the move commands and the seconds of the whole load
+    '''
+    sequences = [random_moves(config['board_size'], seed) for seed in range(NUM_SEQUENCES)]
+    server = GameServer(config)
+    tcp_server = await server.start('127.0.0.1', 0)
+    port = tcp_server.sockets[0].getsockname()[1]
+
+    latencies = []
+    clients = []
+    for c in range(num_connections):
+        game_ids = [None] * len(range(c, num_games, num_connections))
+        clients.append(run_client(port, game_ids, sequences, num_moves, latencies))
+    start = time.perf_counter()
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - start
+    await server.close()
+    return latencies, elapsed
+
+
+def memory_per_game(config, num_games, num_moves):
+    '''
+    Return the bytes held per hosted game after `num_moves` moves, and the bytes on disk
+    of one evicted game
+    '''
+    sequence = random_moves(config['board_size'])[:num_moves]
+    with tempfile.TemporaryDirectory() as evict_dir:
+        server = GameServer(config, evict_dir=evict_dir, idle_seconds=0.)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(num_games):
+            game_id = server.execute('new').split()[1]
+            for _, y, x in sequence:
+                server.execute(f'move {game_id} {label(y)} {label(x)}')
+        allocated = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        server.evict_idle()
+        disk = os.path.getsize(os.path.join(evict_dir, f'{game_id}.json'))
+    return allocated / num_games, disk
+
+
+def percentile(values, q):
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load generator of the multi-game server')
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--moves', type=int, default=60, help='moves played in every game')
+    parser.add_argument('--board-size', type=int, default=19)
+    args = parser.parse_args()
+    config = make_config(args.board_size)
+
+    latencies, elapsed = asyncio.run(
+        run_load(config, args.games, args.connections, args.moves))
+    latencies.sort()
+    print(f'{args.games} games on {args.connections} connections, {len(latencies)} moves '
+          f'in {elapsed:.1f} s ({len(latencies) / elapsed:.0f} moves/s)')
+    print('move latency: ' + ', '.join(
+        f'p{q * 100:g} {percentile(latencies, q) * 1e3:.2f} ms' for q in (0.5, 0.9, 0.99))
+        + f', max {latencies[-1] * 1e3:.2f} ms')
+
+    in_memory, on_disk = memory_per_game(config, min(args.games, 500), args.moves)
+    print(f'memory per hosted game after {args.moves} moves: {in_memory / 1024:.1f} KiB, '
+          f'{on_disk} bytes once evicted to disk')
+
+
+if __name__ == '__main__':
+    main()
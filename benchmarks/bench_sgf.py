@@ -0,0 +1,65 @@
+'''
+Benchmark of streaming an SGF collection through replay_stream, in moves replayed
+per second. A collection of TARGET_MB megabytes is written from seeded random 19x19
+playouts, then replayed from disk
+
+    python -m benchmarks.bench_sgf [megabytes]
+'''
+import os
+import random
+import sys
+import tempfile
+import time
+from src.game import Game
+from src.playout import playout
+from src.sgf import replay_stream, to_sgf
+from src.utils import Stone, get_opposite_stone
+from benchmarks.bench_resolve_board import make_config
+
+BOARD_SIZE = 19
+NUM_DISTINCT_GAMES = 20
+TARGET_MB = 20
+
+
+def random_sgf(seed):
+    '''
+    Return the SGF text of a seeded random playout
+    '''
+    game = Game(make_config(BOARD_SIZE))
+    playout(game, random.Random(seed))
+    moves = []
+    stone = Stone.BLACK
+    for delta, _ in game._move_stack:
+        moves.append((stone, None, None) if delta is None else (stone, delta.y, delta.x))
+        stone = get_opposite_stone(stone)
+    return to_sgf(BOARD_SIZE, moves) + '\n'
+
+
+def main():
+    target_mb = float(sys.argv[1]) if len(sys.argv) > 1 else TARGET_MB
+    games = [random_sgf(seed) for seed in range(NUM_DISTINCT_GAMES)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'collection.sgf')
+        with open(path, 'w') as f:
+            size = 0
+            while size < target_mb * 1e6:
+                for text in games:
+                    f.write(text)
+                    size += len(text)
+
+        num_games = num_moves = num_illegal = 0
+        start = time.perf_counter()
+        with open(path) as f:
+            for replay in replay_stream(f, make_config(BOARD_SIZE)):
+                num_games += 1
+                num_moves += replay.num_moves
+                num_illegal += len(replay.illegal)
+        elapsed = time.perf_counter() - start
+
+    print(f'{size / 1e6:.1f} MB, {num_games} games, {num_moves} moves '
+          f'({num_illegal} illegal) in {elapsed:.1f} s: '
+          f'{num_moves / elapsed:.0f} moves/sec, {size / 1e6 / elapsed:.2f} MB/sec')
+
+
+if __name__ == '__main__':
+    main()
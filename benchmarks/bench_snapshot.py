@@ -0,0 +1,74 @@
+'''
+Benchmark of Game.snapshot on a mid-game position of a seeded random game: forks per
+second, and the memory allocated per fork measured with tracemalloc, right after the
+fork and after one move in every fork, against copy.deepcopy of the game
+
+    python -m benchmarks.bench_snapshot
+'''
+import copy
+import time
+import tracemalloc
+from src.game import Game
+from src.utils import Stone
+from benchmarks.bench_resolve_board import SIZES, make_config, random_moves
+
+NUMBER = 1000
+REPEATS = 5
+
+
+def mid_game(board_size):
+    '''
+    Return a game after the first half of a seeded random game, and the next move
+    '''
+    moves = random_moves(board_size)
+    game = Game(make_config(board_size))
+    half = len(moves) // 2
+    for stone, y, x in moves[:half]:
+        game._place_stone(stone, y, x)
+    return game, moves[half]
+
+
+def time_forks(fork):
+    '''
+    Return the seconds per call of `fork`
+    '''
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        fork()
+    return (time.perf_counter() - start) / NUMBER
+
+
+def memory_per_fork(fork, move=None):
+    '''
+    Return the bytes allocated per fork, keeping every fork alive, after playing
+    the move in every fork if given
+    '''
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    forks = [fork() for _ in range(NUMBER)]
+    if move is not None:
+        for game in forks:
+            game._place_stone(*move)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return allocated / NUMBER
+
+
+def main():
+    for board_size in SIZES:
+        game, move = mid_game(board_size)
+        num_stones = int((game.board.to_array() != Stone.EMPTY).sum())
+        deepcopy = lambda: copy.deepcopy(game)
+
+        snapshot_time = min(time_forks(game.snapshot) for _ in range(REPEATS))
+        deepcopy_time = min(time_forks(deepcopy) for _ in range(REPEATS))
+        print(f'{board_size}x{board_size} ({num_stones} stones): '
+              f'snapshot {snapshot_time * 1e6:.1f} us ({1 / snapshot_time:.0f}/s), '
+              f'deepcopy {deepcopy_time * 1e6:.1f} us ({deepcopy_time / snapshot_time:.1f}x)')
+        print(f'    memory per fork: snapshot {memory_per_fork(game.snapshot):.0f} B, '
+              f'after one move {memory_per_fork(game.snapshot, move):.0f} B, '
+              f'deepcopy {memory_per_fork(deepcopy):.0f} B')
+
+
+if __name__ == '__main__':
+    main()
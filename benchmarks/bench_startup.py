@@ -0,0 +1,80 @@
+'''
+Benchmark of the board backends for short-lived processes: the wall time from starting
+the interpreter to the end of the first move of a Game, and whether numpy was imported,
+then the cost of reading one point with board[y, x] and of writing one with place_stone
+and remove_stone, per backend
+
+    python -m benchmarks.bench_startup
+'''
+import subprocess
+import sys
+import time
+from src.board import create_board
+from src.utils import Stone
+from benchmarks.bench_resolve_board import make_config
+
+BACKENDS = ('numpy', 'bitboard', 'flat')
+BOARD_SIZE = 19
+REPEATS = 10
+NUMBER = 200
+
+# run by the child interpreter, printing the time after its first move
+FIRST_MOVE = '''
+import sys, time
+from src.game import Game
+game = Game({{'black_stone': 'b', 'white_stone': 'w', 'board_size': {board_size},
+             'enable_self_destruct': False, 'board_backend': '{backend}'}})
+game.place_black(3, 3)
+print(time.time(), 'numpy' in sys.modules)
+'''
+
+
+def time_first_move(backend):
+    '''
+    Return the seconds from starting the interpreter to the end of the first move,
+    and whether numpy was imported
+    '''
+    code = FIRST_MOVE.format(board_size=BOARD_SIZE, backend=backend)
+    start = time.time()
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            check=True).stdout.split()
+    return float(output[0]) - start, output[1] == 'True'
+
+
+def time_cells(backend):
+    '''
+    Return the seconds per point of reading every point, and of placing and removing
+    a stone at every point
+    '''
+    board = create_board(make_config(BOARD_SIZE, backend))
+    coords = [(y, x) for y in range(BOARD_SIZE) for x in range(BOARD_SIZE)]
+    place_stone, remove_stone = board.place_stone, board.remove_stone
+
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        for coord in coords:
+            board[coord]
+    read = (time.perf_counter() - start) / (NUMBER * len(coords))
+
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        for y, x in coords:
+            place_stone(Stone.BLACK, y, x)
+        for y, x in coords:
+            remove_stone(y, x)
+    write = (time.perf_counter() - start) / (NUMBER * len(coords))
+    return read, write
+
+
+def main():
+    for backend in BACKENDS:
+        runs = [time_first_move(backend) for _ in range(REPEATS)]
+        first_move = min(seconds for seconds, _ in runs)
+        read, write = min(time_cells(backend) for _ in range(REPEATS))
+        print(f'{backend:>8}: first move {first_move * 1e3:.1f} ms after starting python '
+              f'(numpy imported: {runs[0][1]}); per point on {BOARD_SIZE}x{BOARD_SIZE}: '
+              f'read {read * 1e9:.0f} ns, place and remove {write * 1e9:.0f} ns')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+'''
+Benchmark of the canonical hashes under the 8 symmetries of the board: the cost that
+keeping the packed hashes of the symmetric variants up to date adds to every move of a
+seeded random game, the cost of one canonical hash lookup (kept up to date, computed
+from the stones, or with the 8 full-board transforms of canonicalize on one position),
+and canonicalize on a batch of positions against one call per position
+
+    python -m benchmarks.bench_symmetry
+'''
+import time
+import numpy as np
+from src.game import Game
+from src.symmetry import canonicalize
+from benchmarks.bench_resolve_board import SIZES, make_config, random_moves
+
+REPEATS = 5
+NUMBER = 200
+BATCH = 1024
+
+
+def time_moves(config, moves):
+    '''
+    Return the seconds per move to replay the moves
+    '''
+    game = Game(config)
+    start = time.perf_counter()
+    for stone, y, x in moves:
+        game._place_stone(stone, y, x)
+    return (time.perf_counter() - start) / len(moves)
+
+
+def time_call(call, number=NUMBER):
+    '''
+    Return the seconds per call
+    '''
+    start = time.perf_counter()
+    for _ in range(number):
+        call()
+    return (time.perf_counter() - start) / number
+
+
+def mid_game(config, moves):
+    game = Game(config)
+    for stone, y, x in moves[:len(moves) // 2]:
+        game._place_stone(stone, y, x)
+    return game
+
+
+def main():
+    for board_size in SIZES:
+        moves = random_moves(board_size)
+        config = make_config(board_size)
+        hash_config = dict(config, canonical_hash=True)
+        without = min(time_moves(config, moves) for _ in range(REPEATS))
+        with_hashes = min(time_moves(hash_config, moves) for _ in range(REPEATS))
+
+        kept = mid_game(hash_config, moves)
+        computed = mid_game(config, moves)
+        stones = computed.board.to_array()[None]
+        lookup_kept = min(time_call(lambda: kept.canonical_hash) for _ in range(REPEATS))
+        lookup_computed = min(time_call(lambda: computed.canonical_hash)
+                              for _ in range(REPEATS))
+        lookup_transforms = min(time_call(lambda: canonicalize(stones))
+                                for _ in range(REPEATS))
+
+        positions = []
+        for seed in range(BATCH):
+            game = Game(config)
+            for stone, y, x in moves[:seed % len(moves)]:
+                game._place_stone(stone, y, x)
+            positions.append(game.board.to_array())
+        batch = np.stack(positions)
+        batched = min(time_call(lambda: canonicalize(batch), 1) for _ in range(REPEATS))
+        one_by_one = min(time_call(lambda: [canonicalize(p[None]) for p in batch], 1)
+                         for _ in range(REPEATS))
+
+        print(f'{board_size}x{board_size}: per move {without * 1e6:.2f} us, '
+              f'{with_hashes * 1e6:.2f} us keeping the symmetric hashes; canonical hash '
+              f'lookup: kept {lookup_kept * 1e6:.2f} us, from the stones '
+              f'{lookup_computed * 1e6:.1f} us, 8 transforms {lookup_transforms * 1e6:.1f} us; '
+              f'canonicalize {BATCH} positions: {batched / BATCH * 1e6:.2f} us per position '
+              f'batched, {one_by_one / BATCH * 1e6:.1f} us one by one')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+'''
+Benchmark of live score estimates: replaying a seeded random game and reading
+Game.get_scores after every move, with incremental territory tracking against a
+full recount of the empty regions
+
+    python -m benchmarks.bench_territory
+'''
+import time
+from src.game import Game
+from benchmarks.bench_resolve_board import SIZES, make_config, random_moves
+
+REPEATS = 5
+
+
+def replay_with_scores(config, moves):
+    '''
+    Return the seconds to replay the moves, reading the scores after every move
+    '''
+    game = Game(config)
+    start = time.perf_counter()
+    for stone, y, x in moves:
+        game._place_stone(stone, y, x)
+        game.get_scores()
+    return time.perf_counter() - start
+
+
+def main():
+    for board_size in SIZES:
+        moves = random_moves(board_size)
+        config = make_config(board_size)
+        recount = min(replay_with_scores(config, moves) for _ in range(REPEATS))
+        incremental = min(replay_with_scores(dict(config, incremental_territory=True), moves)
+                          for _ in range(REPEATS))
+        print(f'{board_size}x{board_size}: {len(moves)} moves, per move with scores: '
+              f'recount {recount / len(moves) * 1e6:.1f} us, '
+              f'incremental {incremental / len(moves) * 1e6:.1f} us '
+              f'({recount / incremental:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+'''
+Benchmark suite of the engine hot paths on 9x9, 13x13 and 19x19, writing the results
+as JSON so that runs can be diffed or compared
+
+    python -m benchmarks.suite [--output results.json] [--compare previous.json]
+
+Every benchmark replays fixed seeded move sequences and reports the best of REPEATS
+runs in microseconds per operation:
+    - resolve_board: seeded random game, time spent in GroupManager.resolve_board
+    - update_state_capture: capture of a (board_size - 1) ** 2 - 1 stone group
+    - get_scores: Game.get_scores on the final position of the seeded random game
+    - random_game: seeded random playout from the empty board
+    - construction: Game(config)
+'''
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import numpy as np
+from src.game import Game
+from src.playout import playout
+from src.utils import Stone
+from benchmarks.bench_resolve_board import make_config, random_moves, time_resolve_board
+
+SIZES = (9, 13, 19)
+REPEATS = 5
+SEED = 0
+
+
+def large_capture_moves(board_size):
+    '''
+    Return the (stone, y, x) moves of a position where white captures a black group
+    filling all points with y >= 1 and x >= 1, except the last one which white plays.
+    White holds row 0 and column 0, except the corner, so it keeps a liberty
+    '''
+    moves = [(Stone.WHITE, 0, x) for x in range(1, board_size)]
+    moves += [(Stone.WHITE, y, 0) for y in range(1, board_size)]
+    moves += [(Stone.BLACK, y, x) for y in range(1, board_size) for x in range(1, board_size)
+              if (y, x) != (board_size - 1, board_size - 1)]
+    moves.append((Stone.WHITE, board_size - 1, board_size - 1))
+    return moves
+
+
+def time_update_state_capture(board_size):
+    '''
+    Return the seconds spent in update_state by the capturing move of large_capture_moves
+    '''
+    game = Game(make_config(board_size))
+    moves = large_capture_moves(board_size)
+    for stone, y, x in moves[:-1]:
+        game._place_stone(stone, y, x)
+    stone, y, x = moves[-1]
+    game.board.place_stone(stone, y, x)
+    game.gm.resolve_board(y, x)
+    t0 = time.perf_counter()
+    game.gm.update_state()
+    elapsed = time.perf_counter() - t0
+    assert game.num_black_captured == (board_size - 1) ** 2 - 1
+    return elapsed
+
+
+def time_get_scores(board_size, moves, number=20):
+    '''
+    Return the seconds per Game.get_scores on the position reached by the moves
+    '''
+    game = Game(make_config(board_size))
+    for stone, y, x in moves:
+        game._place_stone(stone, y, x)
+    t0 = time.perf_counter()
+    for _ in range(number):
+        game.get_scores()
+    return (time.perf_counter() - t0) / number
+
+
+def time_random_game(board_size):
+    '''
+    Return the seconds of a seeded random playout from the empty board
+    '''
+    game = Game(make_config(board_size))
+    t0 = time.perf_counter()
+    playout(game, random.Random(SEED))
+    return time.perf_counter() - t0
+
+
+def time_construction(board_size, number=20):
+    '''
+    Return the seconds per Game construction
+    '''
+    config = make_config(board_size)
+    t0 = time.perf_counter()
+    for _ in range(number):
+        Game(config)
+    return (time.perf_counter() - t0) / number
+
+
+def run():
+    '''
+    Run every benchmark and return the results, keyed by benchmark then board size,
+    in microseconds per operation
+    '''
+    results = {}
+
+    def record(name, board_size, seconds):
+        results.setdefault(name, {})[str(board_size)] = round(seconds * 1e6, 3)
+
+    for board_size in SIZES:
+        moves = random_moves(board_size, SEED)
+        record('resolve_board', board_size, min(
+            time_resolve_board(board_size, moves) for _ in range(REPEATS)) / len(moves))
+        record('update_state_capture', board_size, min(
+            time_update_state_capture(board_size) for _ in range(REPEATS)))
+        record('get_scores', board_size, min(
+            time_get_scores(board_size, moves) for _ in range(REPEATS)))
+        record('random_game', board_size, min(
+            time_random_game(board_size) for _ in range(REPEATS)))
+        record('construction', board_size, min(
+            time_construction(board_size) for _ in range(REPEATS)))
+    return results
+
+
+def compare(results, previous):
+    '''
+    Print the ratio of every result to the same result of a previous run
+    '''
+    for name, sizes in results.items():
+        for board_size, us in sizes.items():
+            before = previous.get(name, {}).get(board_size)
+            ratio = f'{us / before:.2f}x' if before else 'new'
+            print(f'{name:>22} {board_size:>2}x{board_size:<2} {us:>12.3f} us  {ratio}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark suite of the engine hot paths')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON file of a previous run to compare with')
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeats': REPEATS,
+            'seed': SEED,
+            'unit': 'us per operation'
+        },
+        'results': run()
+    }
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report['results'], json.load(f)['results'])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+
+if __name__ == '__main__':
+    main()
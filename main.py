@@ -1,5 +1,4 @@
 import yaml
-from src.board import Board
 from src.game import GameUI
 
 def main(config):
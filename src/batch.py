@@ -0,0 +1,195 @@
+import numpy as np
+from src.utils import Stone, PASS
+from src.scoring import get_neighbor_index, count_territory
+
+class BatchGame(object):
+    '''
+    Manage N independent games of Go stacked in one (N, board_size, board_size) array.
+    Every call to `step` applies one move per game, resolving captures, self-destruction
+    and ko for the whole batch with vectorized operations. The rules match those of Game
+    '''
+    def __init__(self, config, num_games):
+
+        # dimension of the square boards
+        self.board_size = config['board_size']
+
+        # allow self-destruction
+        self.enable_self_destruct = config['enable_self_destruct']
+
+        # number of games in the batch
+        self.num_games = num_games
+
+        n = self.board_size * self.board_size
+
+        # stacked 2D boards, and their flattened view indexed by y * board_size + x
+        self.boards = np.zeros((num_games, self.board_size, self.board_size), dtype=np.int8)
+        self._flat = self.boards.reshape(num_games, n)
+
+        # flat index of the ko of every game, or -1 if there is none
+        self._ko = np.full(num_games, -1, dtype=np.int64)
+
+        # number of captured black and white stones of every game
+        self.num_black_captured = np.zeros(num_games, dtype=np.int64)
+        self.num_white_captured = np.zeros(num_games, dtype=np.int64)
+
+        # count the number of consecutive passes of every game
+        self.count_pass = np.zeros(num_games, dtype=np.int64)
+
+        # flat neighbor indices, and the index of every game
+        self._neighbor_index = get_neighbor_index(self.board_size)
+        self._games = np.arange(num_games)
+
+    def is_over(self):
+        '''
+        Return a boolean array of the games that are over (two consecutive passes)
+        '''
+        return self.count_pass >= 2
+
+    def _flood_groups(self, boards, stones, seeds):
+        '''
+        Flood fill the groups of `stones` containing the flat `seeds` on the flattened boards,
+        one seed per board. Return the group masks and whether each group has a liberty.
+        A fill stops as soon as its group reaches a liberty, so only groups without a liberty
+        are guaranteed to be complete
+        '''
+        neighbor_index = self._neighbor_index
+        rows = np.arange(boards.shape[0])
+        region = boards == stones[:, None]
+        has_empty_neighbor = (boards == Stone.EMPTY)[:, neighbor_index].any(axis=1)
+
+        groups = np.zeros(boards.shape, dtype=bool)
+        groups[rows, seeds] = True
+        has_liberty = has_empty_neighbor[rows, seeds]
+        active = np.flatnonzero(~has_liberty)
+        while active.size:
+            group = groups[active]
+            grown = (group[:, neighbor_index].any(axis=1) | group) & region[active]
+            liberty = (grown & has_empty_neighbor[active]).any(axis=1)
+            groups[active] = grown
+            has_liberty[active] = liberty
+            active = active[~(liberty | (grown == group).all(axis=1))]
+        return groups, has_liberty
+
+    def _place(self, games, points, stones):
+        '''
+        Return copies of the flattened boards of `games` with `stones` placed at `points`
+        '''
+        boards = self._flat[games]
+        boards[np.arange(games.size), points] = stones
+        return boards
+
+    def step(self, stones, moves):
+        '''
+        Play one move in every game. `stones` is the stone to play in each game
+        (or a single stone for all of them) and `moves` are flat indices
+        y * board_size + x, or PASS.
+        Return a boolean array of which moves were legal, and the number of stones
+        each move removed from the board. Illegal moves leave their game untouched
+        '''
+        games = self._games
+        flat = self._flat
+        neighbor_index = self._neighbor_index
+        stones = np.broadcast_to(np.asarray(stones, dtype=np.int8), (self.num_games,))
+        moves = np.asarray(moves, dtype=np.int64)
+
+        is_pass = moves == PASS
+        points = np.where(is_pass, 0, moves)
+        active = ~is_pass & (flat[games, points] == Stone.EMPTY)
+        opposite = np.where(stones == Stone.BLACK, Stone.WHITE, Stone.BLACK).astype(np.int8)
+
+        # the 4 neighbors of every move, and whether each of them keeps an empty
+        # neighbor of its own once the move is placed
+        neighbors = neighbor_index[:, points]
+        is_neighbor = neighbors != points
+        neighbor_stones = flat[games, neighbors]
+        second_neighbors = neighbor_index[:, neighbors]
+        keeps_liberty = ((flat[games, second_neighbors] == Stone.EMPTY)
+                         & (second_neighbors != points)).any(axis=0)
+
+        is_opposite = active & is_neighbor & (neighbor_stones == opposite)
+        is_own = active & is_neighbor & (neighbor_stones == stones)
+        has_liberty = (is_neighbor & (neighbor_stones == Stone.EMPTY)).any(axis=0)
+
+        # only opposite stones adjacent to the move that lose their last empty neighbor
+        # can be captured, so only their groups are filled
+        num_captured_adjacent = np.zeros(self.num_games, dtype=np.int64)
+        captured_point = np.zeros(self.num_games, dtype=np.int64)
+        captured_size = np.zeros(self.num_games, dtype=np.int64)
+        directions, capture_games = np.nonzero(is_opposite & ~keeps_liberty)
+        if capture_games.size:
+            groups, group_has_liberty = self._flood_groups(
+                self._place(capture_games, points[capture_games], stones[capture_games]),
+                opposite[capture_games], neighbors[directions, capture_games])
+            is_captured = ~group_has_liberty
+            directions = directions[is_captured]
+            capture_games = capture_games[is_captured]
+            groups = groups[is_captured]
+            num_captured_adjacent += np.bincount(capture_games, minlength=self.num_games)
+            captured_point[capture_games] = neighbors[directions, capture_games]
+            captured_size[capture_games] = groups.sum(axis=1)
+
+        # ko rule, as in GroupManager._check_ko
+        single = num_captured_adjacent == 1
+        ko_violation = active & single & (captured_point == self._ko)
+        new_ko = np.where(single, np.where(captured_size == 1, points, self._ko), -1)
+
+        # only moves where neither the move nor its friendly neighbors keep an
+        # empty neighbor, and nothing is captured, can self-destruct
+        self_destruct = np.zeros(self.num_games, dtype=bool)
+        destruct_games = np.flatnonzero(active & ~has_liberty & (num_captured_adjacent == 0)
+                                        & ~(is_own & keeps_liberty).any(axis=0))
+        if destruct_games.size:
+            own_groups, own_has_liberty = self._flood_groups(
+                self._place(destruct_games, points[destruct_games], stones[destruct_games]),
+                stones[destruct_games], points[destruct_games])
+            self_destruct[destruct_games] = ~own_has_liberty
+
+        legal = active & ~ko_violation
+        if not self.enable_self_destruct:
+            legal &= ~self_destruct
+
+        # commit the legal moves, then clear the captured groups
+        flat[games[legal], points[legal]] = stones[legal]
+        num_captured = np.zeros(self.num_games, dtype=np.int64)
+        num_own_captured = np.zeros(self.num_games, dtype=np.int64)
+        if capture_games.size:
+            is_legal = legal[capture_games]
+            capture_games = capture_games[is_legal]
+            groups = groups[is_legal]
+            directions = directions[is_legal]
+            removed_games = np.unique(capture_games)
+            num_opposite = (flat[removed_games] == opposite[removed_games, None]).sum(axis=1)
+            for d in range(4):
+                # a game captures at most one group per direction
+                in_direction = directions == d
+                rows = capture_games[in_direction]
+                boards = flat[rows]
+                boards[groups[in_direction]] = Stone.EMPTY
+                flat[rows] = boards
+            num_captured[removed_games] = num_opposite - (
+                flat[removed_games] == opposite[removed_games, None]).sum(axis=1)
+        if destruct_games.size:
+            is_removed = self_destruct[destruct_games] & legal[destruct_games]
+            rows = destruct_games[is_removed]
+            own_groups = own_groups[is_removed]
+            boards = flat[rows]
+            boards[own_groups] = Stone.EMPTY
+            flat[rows] = boards
+            num_own_captured[rows] = own_groups.sum(axis=1)
+
+        self._ko = np.where(legal, new_ko, self._ko)
+        is_black = stones == Stone.BLACK
+        self.num_white_captured += np.where(is_black, num_captured, num_own_captured)
+        self.num_black_captured += np.where(is_black, num_own_captured, num_captured)
+        self.count_pass = np.where(is_pass, self.count_pass + 1,
+                                   np.where(legal, 0, self.count_pass))
+
+        return legal | is_pass, num_captured + num_own_captured
+
+    def get_scores(self):
+        '''
+        Return the scores of black and white of every game as two arrays,
+        with the same territorial rules as Game.get_scores
+        '''
+        black, white = count_territory(self.boards)
+        return black - self.num_black_captured, white - self.num_white_captured
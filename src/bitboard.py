@@ -0,0 +1,237 @@
+from src.board import BoardMixin
+from src.utils import Stone, get_neighbor_table, get_zobrist_table, iter_bits
+from src.symmetry import get_packed_zobrist_table
+
+# column masks shared by all bitboards of the same size
+_edge_masks = {}
+
+def get_edge_masks(board_size):
+    '''
+    Return the masks (full, not_first_column, not_last_column) for a board of the
+    given size, with the point (y, x) stored at bit y * board_size + x
+    '''
+    masks = _edge_masks.get(board_size)
+    if masks is None:
+        first_column = 0
+        for y in range(board_size):
+            first_column |= 1 << (y * board_size)
+        last_column = first_column << (board_size - 1)
+        full = (1 << (board_size * board_size)) - 1
+        masks = _edge_masks[board_size] = (full, full & ~first_column, full & ~last_column)
+    return masks
+
+
+class BitBoard(BoardMixin):
+    '''
+    Instance of a 2D grid board storing the black, white and empty points as
+    arbitrary-precision integer bitmasks, with (y, x) at bit y * board_size + x
+    '''
+    def __init__(self, config={}):
+
+        # dimension of the board
+        self.board_size = config['board_size']
+
+        # neighbor coordinates of every point, indexed by y * board_size + x
+        self.neighbor_table = get_neighbor_table(self.board_size)
+
+        # string to display as a black stone
+        self.black_stone_render = config['black_stone']
+
+        # string to display as a white stone
+        self.white_stone_render = config['white_stone']
+
+        # masks of every point, and of the points that can shift right or left
+        self._full, self._not_first_column, self._not_last_column = \
+            get_edge_masks(self.board_size)
+
+        # the stones on the board
+        self.black = 0
+        self.white = 0
+        self.empty = self._full
+
+        # zobrist keys, and the zobrist hash of the position (0 for an empty board)
+        self.zobrist = get_zobrist_table(self.board_size)
+        self.zobrist_hash = 0
+
+        # packed zobrist keys and hashes of the symmetric variants, if kept up to date
+        self.packed_zobrist = (get_packed_zobrist_table(self.board_size)
+                               if config.get('canonical_hash', False) else None)
+        self.packed_hash = 0
+
+    def __getitem__(self, coord):
+        '''
+        Return the stone at (y, x)
+        '''
+        y, x = coord
+        idx = y * self.board_size + x
+        if self.black >> idx & 1:
+            return Stone.BLACK
+        if self.white >> idx & 1:
+            return Stone.WHITE
+        return Stone.EMPTY
+
+    def place_stone(self, stone, y, x):
+        '''
+        Place a stone at the specified coordinate
+        '''
+        idx = y * self.board_size + x
+        bit = 1 << idx
+        previous = self[y, x]
+        self.zobrist_hash ^= self.zobrist[previous][idx] ^ self.zobrist[stone][idx]
+        if self.packed_zobrist is not None:
+            self.packed_hash ^= self.packed_zobrist[previous][idx] ^ self.packed_zobrist[stone][idx]
+        if stone == Stone.BLACK:
+            self.black |= bit
+            self.white &= ~bit
+        elif stone == Stone.WHITE:
+            self.white |= bit
+            self.black &= ~bit
+        self.empty &= ~bit
+
+    def remove_stone(self, y, x):
+        '''
+        Remove the stone at the specified coordinate
+        '''
+        idx = y * self.board_size + x
+        bit = 1 << idx
+        previous = self[y, x]
+        self.zobrist_hash ^= self.zobrist[previous][idx]
+        if self.packed_zobrist is not None:
+            self.packed_hash ^= self.packed_zobrist[previous][idx]
+        self.black &= ~bit
+        self.white &= ~bit
+        self.empty |= bit
+
+    def clear(self):
+        '''
+        Remove every stone
+        '''
+        self.black = 0
+        self.white = 0
+        self.empty = self._full
+        self.zobrist_hash = 0
+        self.packed_hash = 0
+
+    def stones(self, stone):
+        '''
+        Return the mask of the points holding the specified stone
+        '''
+        if stone == Stone.BLACK:
+            return self.black
+        if stone == Stone.WHITE:
+            return self.white
+        return self.empty
+
+    def adjacent(self, mask):
+        '''
+        Return the points next to a point of the mask in the "up", "down", "left", "right"
+        directions, without wrapping around the edges of the board
+        '''
+        return ((mask << 1) & self._not_first_column
+                | (mask >> 1) & self._not_last_column
+                | (mask << self.board_size) & self._full
+                | mask >> self.board_size)
+
+    def dilate(self, mask):
+        '''
+        Return the mask grown by one point in the "up", "down", "left", "right"
+        directions, without wrapping around the edges of the board
+        '''
+        return mask | self.adjacent(mask)
+
+    def flood(self, seed, region):
+        '''
+        Return the points of `region` connected to the `seed` mask
+        '''
+        seed &= region
+        while True:
+            grown = self.dilate(seed) & region
+            if grown == seed:
+                return seed
+            seed = grown
+
+    def liberties_mask(self, mask):
+        '''
+        Return the mask of the empty points adjacent to the mask
+        '''
+        return self.dilate(mask) & self.empty
+
+    def remove_stones(self, mask):
+        '''
+        Remove the stones of the mask, such as a captured group, with one mask operation
+        per colour. Only the zobrist keys are applied point by point
+        '''
+        zobrist_hash = self.zobrist_hash
+        packed_hash = self.packed_hash
+        for stone, stones in ((Stone.BLACK, self.black & mask), (Stone.WHITE, self.white & mask)):
+            keys = self.zobrist[stone]
+            packed_keys = self.packed_zobrist[stone] if self.packed_zobrist is not None else None
+            for idx in iter_bits(stones):
+                zobrist_hash ^= keys[idx]
+                if packed_keys is not None:
+                    packed_hash ^= packed_keys[idx]
+        self.zobrist_hash = zobrist_hash
+        self.packed_hash = packed_hash
+        self.black &= ~mask
+        self.white &= ~mask
+        self.empty |= mask & self._full
+
+    def get_legal_moves(self, is_legal, ko=None, check_all=False):
+        '''
+        Return the legal moves as BoardMixin.get_legal_moves does, finding the empty points
+        with an empty neighbor with shifts of the empty mask
+        '''
+        board_size = self.board_size
+        empty = self.empty
+        if check_all:
+            to_check = empty
+        else:
+            to_check = empty & ~self.adjacent(empty)
+            if ko is not None:
+                to_check |= self.liberties_mask(1 << (ko[0] * board_size + ko[1]))
+        legal = empty & ~to_check
+        for idx in iter_bits(to_check):
+            if is_legal(idx // board_size, idx % board_size):
+                legal |= 1 << idx
+        return self._unpack(legal)
+
+    def get_territory(self):
+        '''
+        Return the number of empty points that are territory of black and white,
+        flood filling each empty region with bitmask dilations
+        '''
+        scores = {Stone.BLACK: 0,
+                  Stone.WHITE: 0
+                 }
+        remaining = self.empty
+        while remaining:
+            region = self.flood(remaining & -remaining, self.empty)
+            remaining &= ~region
+            border = self.dilate(region)
+            touches_black = border & self.black
+            touches_white = border & self.white
+            if touches_black and not touches_white:
+                scores[Stone.BLACK] += region.bit_count()
+            elif touches_white and not touches_black:
+                scores[Stone.WHITE] += region.bit_count()
+        return scores
+
+    def _unpack(self, mask):
+        '''
+        Return the mask as a 2D boolean np.ndarray
+        '''
+        import numpy as np
+        size = self.board_size
+        num_bytes = (size * size + 7) // 8
+        data = np.frombuffer(mask.to_bytes(num_bytes, 'little'), dtype=np.uint8)
+        return np.unpackbits(data, bitorder='little')[:size * size].astype(bool).reshape(size, size)
+
+    def to_array(self):
+        '''
+        Return the stones as a 2D np.ndarray
+        '''
+        import numpy as np
+        array = np.zeros((self.board_size, self.board_size), dtype=int)
+        for stone in (Stone.BLACK, Stone.WHITE):
+            array[self._unpack(self.stones(stone))] = stone
+        return array
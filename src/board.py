@@ -1,69 +1,41 @@
-import numpy as np
-from src.utils import Stone
+from src.utils import Stone, iter_bits
+from src.symmetry import get_packed_zobrist_table
 
-class Board(np.ndarray):
+class BoardMixin(object):
     '''
-    Instance of a 2D grid board extended from np.ndarray
+    Behaviour shared by every board backend. A backend stores the stones and
+    provides `board[y, x]`, `place_stone` and `remove_stone`, as well as the
+    attributes `board_size`, `neighbor_table`, `black_stone_render` and
+    `white_stone_render`. Placing and removing stones keeps the zobrist hash
+    of the position up to date in `zobrist_hash`, and, if `canonical_hash` is enabled
+    in the config, the packed hashes of its 8 symmetric variants in `packed_hash`
+    using the packed keys `packed_zobrist` (None otherwise). A backend may override
+    remove_stones, get_legal_moves and get_territory with faster versions
     '''
-    def __new__(cls, config={}):
-        '''
-        Standard procedure for subclassing np.ndarray
-        '''
-        # dimension of the board
-        board_size = config['board_size']
-        shape = (board_size, board_size)
-        obj = super(Board, cls).__new__(cls, shape, dtype=np.int)
-
-        obj.board_size = board_size
-
-        # string to display as a black stone
-        obj.black_stone_render = config['black_stone']
-
-        # string to display as a white stone
-        obj.white_stone_render = config['white_stone']
-
-        # fill board with empty slots
-        obj.fill(Stone.EMPTY)
-
-        return obj
-
-    def __array_finalize__(self, obj):
-        '''
-        Standard procedure for subclassing np.ndarray
-        '''
-        if obj is None:
-            return
-        self.board_size = getattr(obj, 'board_size')
-        self.black_stone_render = getattr(obj, 'black_stone_render')
-        self.white_stone_render = getattr(obj, 'white_stone_render')
+    def get_packed_hash(self):
+        '''
+        Return the packed zobrist hashes of the 8 symmetric variants of the position
+        (see src/symmetry.py), computed from the stones unless they are kept up to date
+        '''
+        if self.packed_zobrist is not None:
+            return self.packed_hash
+        board_size = self.board_size
+        packed_zobrist = get_packed_zobrist_table(board_size)
+        packed = 0
+        for y in range(board_size):
+            for x in range(board_size):
+                stone = self[y, x]
+                if stone != Stone.EMPTY:
+                    packed ^= packed_zobrist[stone][y * board_size + x]
+        return packed
 
     def get_liberty_coords(self, y, x):
         '''
         Return the liberty coordinates for (y, x). This constitutes
         "up", "down", "left", "right" if possible.
+        The coordinates come from the shared neighbor table and must not be modified.
         '''
-        coords = []
-        if y > 0:
-            coords.append((y-1, x))
-        if y < self.board_size-1:
-            coords.append((y+1, x))
-        if x > 0:
-            coords.append((y, x-1))
-        if x < self.board_size-1:
-            coords.append((y, x+1))
-        return coords
-
-    def place_stone(self, stone, y, x):
-        '''
-        Place a stone at the specified coordinate
-        '''
-        self[y][x] = stone
-
-    def remove_stone(self, y, x):
-        '''
-        Remove the stone at the specified coordinate
-        '''
-        self[y][x] = Stone.EMPTY
+        return self.neighbor_table[y * self.board_size + x]
 
     def is_within_bounds(self, y, x):
         '''
@@ -71,6 +43,92 @@ class Board(np.ndarray):
         '''
         return 0 <= y <= self.board_size and 0 <= x <= self.board_size
 
+    def get_territory(self):
+        '''
+        Return the number of empty points that are territory of black and white.
+        An area is a territory for a player if any area within that territory can only reach
+        stones of of that player.
+        '''
+        return self.get_territory_dfs()
+
+    def get_territory_dfs(self):
+        '''
+        Reference implementation of get_territory, traversing every empty region
+        with a depth first search
+        '''
+        board_size = self.board_size
+        neighbors = self.neighbor_table
+        scores = {Stone.BLACK: 0,
+                  Stone.WHITE: 0
+                 }
+        traversed = [False] * (board_size * board_size)
+
+        def traverse(y, x):
+            traversed[y * board_size + x] = True
+            search = [(y, x)]
+            stone = None
+            count = 1
+            is_neutral = False
+
+            while search:
+                y, x = search.pop()
+                for ly, lx in neighbors[y * board_size + x]:
+                    this_stone = self[ly, lx]
+                    if this_stone != Stone.EMPTY:
+                        stone = stone or this_stone
+                        if stone != this_stone:
+                            is_neutral = True
+                    idx = ly * board_size + lx
+                    if not traversed[idx]:
+                        if this_stone == Stone.EMPTY:
+                            count += 1
+                            search.append((ly, lx))
+                    traversed[idx] = True
+
+            if is_neutral:
+                return 0, Stone.EMPTY
+            return count, stone
+
+        for y in range(board_size):
+            for x in range(board_size):
+                if not traversed[y * board_size + x] and self[y, x] == Stone.EMPTY:
+                    score, stone = traverse(y, x)
+                    if stone is not None and stone != Stone.EMPTY:
+                        scores[stone] += score
+        return scores
+
+    def remove_stones(self, mask):
+        '''
+        Remove the stones at the flat indices y * board_size + x set in the mask
+        '''
+        board_size = self.board_size
+        for idx in iter_bits(mask):
+            self.remove_stone(idx // board_size, idx % board_size)
+
+    def get_legal_moves(self, is_legal, ko=None, check_all=False):
+        '''
+        Return a 2D boolean np.ndarray of the empty points where a stone can be placed.
+        An empty point with an empty neighbor is always legal, unless it is next to the
+        ko point `ko` or `check_all` is set, so is_legal(y, x) is only called for the
+        remaining empty points, or for every empty point with `check_all`
+        '''
+        import numpy as np
+        empty = self.to_array() == Stone.EMPTY
+        padded = np.pad(empty, 1)
+        mask = empty & (padded[:-2, 1:-1] | padded[2:, 1:-1] | padded[1:-1, :-2] | padded[1:-1, 2:])
+
+        to_check = empty & ~mask
+        if check_all:
+            to_check = empty
+        elif ko is not None:
+            for ly, lx in self.get_liberty_coords(*ko):
+                to_check[ly, lx] = empty[ly, lx]
+
+        # python ints, as the group masks are shifted by the flat index
+        for y, x in np.argwhere(to_check).tolist():
+            mask[y, x] = is_legal(y, x)
+        return mask
+
     def _value_to_render(self, stone):
         '''
         Map from the stone to the displayed string for that stone
@@ -89,17 +147,25 @@ class Board(np.ndarray):
         Render the board, with axes labelled from 0, 1, 2, ..., 9, A, B, ...
         and so on
         '''
+        print(self._render_text())
+
+    def _render_text(self):
+        '''
+        Return the lines printed by _render, starting with an empty line
+        '''
         # horizontal axis
-        print('\n   ' + '  '.join([self._index_to_label(x) \
-                            for x in range(self.board_size)]))
+        lines = ['', '   ' + '  '.join([self._index_to_label(x) \
+                                     for x in range(self.board_size)])]
 
         # vertical axis is printed with each row
         for row in range(self.board_size):
             label = self._index_to_label(row)
-            board_row = map(self._value_to_render, self[row])
-            print(f'{label} ' + ''.join(board_row))
+            board_row = map(self._value_to_render,
+                            (self[row, x] for x in range(self.board_size)))
+            lines.append(f'{label} ' + ''.join(board_row))
 
-        print('')
+        lines.append('')
+        return '\n'.join(lines)
 
     def _index_to_label(self, idx):
         '''
@@ -110,3 +176,35 @@ class Board(np.ndarray):
         if idx < 10:
             return str(idx)
         return chr(idx - 10 + ord('A'))
+
+
+def create_board(config):
+    '''
+    Create the board backend selected by `board_backend` in the config:
+        - "numpy" (default) for a Board extended from np.ndarray
+        - "bitboard" for a BitBoard storing the stones as integer bitmasks
+        - "flat" for a FlatBoard storing the stones in a bytearray, without numpy
+    The backends are imported here, so that numpy is only imported by the numpy backend
+    or by the vectorized features that need it
+    '''
+    backend = config.get('board_backend', 'numpy')
+    if backend == 'numpy':
+        from src.numpyboard import Board
+        return Board(config)
+    if backend == 'bitboard':
+        from src.bitboard import BitBoard
+        return BitBoard(config)
+    if backend == 'flat':
+        from src.flatboard import FlatBoard
+        return FlatBoard(config)
+    raise ValueError(f'Unknown board backend: {backend}')
+
+
+def __getattr__(name):
+    '''
+    Import the numpy Board on first use of src.board.Board, which moved to src.numpyboard
+    '''
+    if name == 'Board':
+        from src.numpyboard import Board
+        return Board
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,138 @@
+import pickle
+import sys
+from collections import OrderedDict
+
+def _sizeof(obj):
+    '''
+    Return an estimate of the bytes held by a key or value: the object, and the items
+    of a tuple, list or dict one level deep. np.ndarray reports its data in getsizeof
+    '''
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list)):
+        size += sum(sys.getsizeof(item) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in obj.items())
+    return size
+
+
+class EvalCache(object):
+    '''
+    Least recently used cache of the evaluations of positions, bounded by a number of
+    entries and an estimate of the bytes of the keys and values. Keys must identify
+    everything the value depends on (see Game.position_key), so entries never need to be
+    invalidated. The cache can be saved to a file and loaded by the next run with the
+    same rules
+    '''
+    def __init__(self, max_entries=100000, max_bytes=None, rules=None):
+
+        # limits on the number of entries and on their estimated bytes (None for no limit)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # rules the values depend on, checked when loading a file
+        self.rules = rules
+
+        # (value, estimated bytes) of every key, from least to most recently used
+        self._entries = OrderedDict()
+        self.num_bytes = 0
+
+        # number of lookups that found their key or not, and of entries evicted
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        '''
+        Return the value of the key, marking it most recently used, or `default`
+        '''
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+        '''
+        Store the value of the key as most recently used, then evict the least recently
+        used entries beyond the limits
+        '''
+        entries = self._entries
+        old = entries.pop(key, None)
+        if old is not None:
+            self.num_bytes -= old[1]
+        size = _sizeof(key) + _sizeof(value)
+        entries[key] = (value, size)
+        self.num_bytes += size
+
+        max_entries = self.max_entries
+        max_bytes = self.max_bytes
+        while entries and ((max_entries is not None and len(entries) > max_entries) or
+                           (max_bytes is not None and self.num_bytes > max_bytes)):
+            _, (_, size) = entries.popitem(last=False)
+            self.num_bytes -= size
+            self.evictions += 1
+
+    def lookup(self, key, compute):
+        '''
+        Return the value of the key, calling compute() and storing its result on a miss
+        '''
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        '''
+        Remove every entry, keeping the counts of hits, misses and evictions
+        '''
+        self._entries.clear()
+        self.num_bytes = 0
+
+    def stats(self):
+        '''
+        Return the number of hits, misses and evictions, the hit rate, and the number of
+        entries and their estimated bytes
+        '''
+        lookups = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.num_bytes
+               }
+
+    def save(self, path):
+        '''
+        Write the rules and the entries, from least to most recently used, to the file
+        '''
+        with open(path, 'wb') as f:
+            pickle.dump({'rules': self.rules,
+                         'entries': [(key, value) for key, (value, _) in self._entries.items()]
+                        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self, path):
+        '''
+        Add the entries of a file written by save, as the most recently used. The file is
+        unpickled, so it must be trusted. Raise ValueError if it was saved with other rules
+        '''
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        if data['rules'] != self.rules:
+            raise ValueError(f'Cache file {path} has the rules {data["rules"]}, '
+                             f'not {self.rules}')
+        for key, value in data['entries']:
+            self.put(key, value)
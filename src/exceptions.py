@@ -5,4 +5,7 @@ class KoException(Exception):
     pass
 
 class InvalidInputException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class SGFException(Exception):
+    pass
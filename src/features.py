@@ -0,0 +1,113 @@
+import numpy as np
+from src.utils import Stone
+from src.scoring import get_neighbor_index, label_regions
+
+# feature planes, from the point of view of the player to move
+OWN_STONES = 0
+OPPONENT_STONES = 1
+EMPTY = 2
+OWN_LIBERTIES_1 = 3
+OWN_LIBERTIES_2 = 4
+OWN_LIBERTIES_3 = 5
+OPPONENT_LIBERTIES_1 = 6
+OPPONENT_LIBERTIES_2 = 7
+OPPONENT_LIBERTIES_3 = 8
+CAPTURES = 9
+KO = 10
+BLACK_TO_PLAY = 11
+NUM_PLANES = 12
+
+def count_liberties(stones, board_size):
+    '''
+    Return the number of liberties of the group of every stone of a flattened
+    (N, board_size * board_size) array of stones, and 0 for empty points.
+    Groups are labelled with label_regions, then every empty point adds one liberty
+    to each distinct group around it
+    '''
+    n = board_size * board_size
+    num_boards = stones.shape[0]
+    neighbor_index = get_neighbor_index(board_size)
+
+    is_black = stones == Stone.BLACK
+    is_white = stones == Stone.WHITE
+    labels = label_regions(np.concatenate([is_black, is_white]), board_size)
+    labels = np.where(is_black, labels[:num_boards], labels[num_boards:])
+
+    # label of the group on every side of every empty point, without counting
+    # the same group twice at the same point
+    neighbor_labels = labels[:, neighbor_index]
+    counted = (neighbor_labels != n) & (stones == Stone.EMPTY)[:, None, :]
+    for d in range(1, 4):
+        for e in range(d):
+            counted[:, d] &= neighbor_labels[:, d] != neighbor_labels[:, e]
+
+    offsets = (np.arange(num_boards) * (n + 1))[:, None]
+    keys = (neighbor_labels + offsets[:, None])[counted]
+    liberties = np.bincount(keys, minlength=num_boards * (n + 1)).reshape(num_boards, n + 1)
+    return np.take_along_axis(liberties, labels, axis=1)
+
+def fill_feature_planes(stones, to_play, ko_points, out):
+    '''
+    Fill the preallocated (N, NUM_PLANES, board_size, board_size) uint8 array `out` with
+    the feature planes of a (N, board_size, board_size) array of stones, where to_play is
+    the stone to play in every position and ko_points the flat index of the point that
+    cannot be played because of ko, or -1
+    '''
+    num_boards, board_size = stones.shape[0], stones.shape[-1]
+    n = board_size * board_size
+    flat = stones.reshape(num_boards, n)
+    planes = out.reshape(num_boards, NUM_PLANES, n)
+    to_play = np.asarray(to_play).reshape(num_boards, 1)
+    opponent = np.where(to_play == Stone.BLACK, Stone.WHITE, Stone.BLACK)
+
+    own = flat == to_play
+    opposite = flat == opponent
+    empty = flat == Stone.EMPTY
+    liberties = count_liberties(flat, board_size)
+
+    planes[:, OWN_STONES] = own
+    planes[:, OPPONENT_STONES] = opposite
+    planes[:, EMPTY] = empty
+    planes[:, OWN_LIBERTIES_1] = own & (liberties == 1)
+    planes[:, OWN_LIBERTIES_2] = own & (liberties == 2)
+    planes[:, OWN_LIBERTIES_3] = own & (liberties >= 3)
+    planes[:, OPPONENT_LIBERTIES_1] = opposite & (liberties == 1)
+    planes[:, OPPONENT_LIBERTIES_2] = opposite & (liberties == 2)
+    planes[:, OPPONENT_LIBERTIES_3] = opposite & (liberties >= 3)
+
+    # empty points next to an opponent group in atari
+    in_atari = opposite & (liberties == 1)
+    planes[:, CAPTURES] = empty & in_atari[:, get_neighbor_index(board_size)].any(axis=1)
+
+    ko_points = np.asarray(ko_points).reshape(num_boards)
+    planes[:, KO] = 0
+    has_ko = np.flatnonzero(ko_points >= 0)
+    planes[has_ko, KO, ko_points[has_ko]] = 1
+
+    planes[:, BLACK_TO_PLAY] = to_play == Stone.BLACK
+    return out
+
+def get_ko_point(game, stone):
+    '''
+    Return the flat index of the point where the stone cannot play because of ko, or -1.
+    This is the last liberty of the stone that just captured a single stone
+    '''
+    gm = game.gm
+    if gm._ko is None:
+        return -1
+    g = gm._peek_group(*gm._ko)
+    if g is None or g.num_coords != 1 or g.num_liberties != 1:
+        return -1
+    y, x = divmod(g.liberty_mask.bit_length() - 1, game.board_size)
+    if game.is_legal(stone, y, x):
+        return -1
+    return y * game.board_size + x
+
+def batch_feature_planes(games, stones, out):
+    '''
+    Fill the preallocated (N, NUM_PLANES, board_size, board_size) uint8 array `out` with
+    the feature planes of N games, with stones[i] to play in games[i]
+    '''
+    boards = np.stack([game.board.to_array() for game in games])
+    ko_points = [get_ko_point(game, stone) for game, stone in zip(games, stones)]
+    return fill_feature_planes(boards, stones, ko_points, out)
@@ -0,0 +1,126 @@
+from src.board import BoardMixin
+from src.utils import Stone, get_neighbor_table, get_flat_neighbor_table, get_zobrist_table
+from src.symmetry import get_packed_zobrist_table
+
+class FlatBoard(BoardMixin):
+    '''
+    Instance of a 2D grid board storing one byte per point in a flat bytearray,
+    with (y, x) at index y * board_size + x. It needs no numpy, which is only
+    imported by to_array
+    '''
+    def __init__(self, config={}):
+
+        # dimension of the board
+        self.board_size = config['board_size']
+
+        # neighbor coordinates of every point, and the flat indices of the neighbors,
+        # indexed by y * board_size + x
+        self.neighbor_table = get_neighbor_table(self.board_size)
+        self._neighbors = get_flat_neighbor_table(self.board_size)
+
+        # string to display as a black stone
+        self.black_stone_render = config['black_stone']
+
+        # string to display as a white stone
+        self.white_stone_render = config['white_stone']
+
+        # the stone at every point, Stone.EMPTY being 0
+        self.cells = bytearray(self.board_size * self.board_size)
+
+        # zobrist keys, and the zobrist hash of the position (0 for an empty board)
+        self.zobrist = get_zobrist_table(self.board_size)
+        self.zobrist_hash = 0
+
+        # packed zobrist keys and hashes of the symmetric variants, if kept up to date
+        self.packed_zobrist = (get_packed_zobrist_table(self.board_size)
+                               if config.get('canonical_hash', False) else None)
+        self.packed_hash = 0
+
+    def __copy__(self):
+        '''
+        Return a board of the same stones, sharing only the tables
+        '''
+        board = FlatBoard.__new__(FlatBoard)
+        board.__dict__.update(self.__dict__)
+        board.cells = bytearray(self.cells)
+        return board
+
+    def __getitem__(self, coord):
+        '''
+        Return the stone at (y, x)
+        '''
+        y, x = coord
+        return self.cells[y * self.board_size + x]
+
+    def place_stone(self, stone, y, x):
+        '''
+        Place a stone at the specified coordinate
+        '''
+        idx = y * self.board_size + x
+        previous = self.cells[idx]
+        self.zobrist_hash ^= self.zobrist[previous][idx] ^ self.zobrist[stone][idx]
+        if self.packed_zobrist is not None:
+            self.packed_hash ^= self.packed_zobrist[previous][idx] ^ self.packed_zobrist[stone][idx]
+        self.cells[idx] = stone
+
+    def remove_stone(self, y, x):
+        '''
+        Remove the stone at the specified coordinate
+        '''
+        idx = y * self.board_size + x
+        previous = self.cells[idx]
+        self.zobrist_hash ^= self.zobrist[previous][idx]
+        if self.packed_zobrist is not None:
+            self.packed_hash ^= self.packed_zobrist[previous][idx]
+        self.cells[idx] = Stone.EMPTY
+
+    def clear(self):
+        '''
+        Remove every stone, in place
+        '''
+        self.cells[:] = bytes(len(self.cells))
+        self.zobrist_hash = 0
+        self.packed_hash = 0
+
+    def get_territory(self):
+        '''
+        Return the number of empty points that are territory of black and white,
+        traversing every empty region of the flat cells with a depth first search
+        '''
+        cells = self.cells
+        neighbors = self._neighbors
+        scores = {Stone.BLACK: 0,
+                  Stone.WHITE: 0
+                 }
+        traversed = bytearray(len(cells))
+        for idx, stone in enumerate(cells):
+            if stone != Stone.EMPTY or traversed[idx]:
+                continue
+            traversed[idx] = 1
+            search = [idx]
+            count = 0
+
+            # OR of the stones bordering the region, which is Stone.BLACK | Stone.WHITE
+            # if it borders both colours
+            border = Stone.EMPTY
+            while search:
+                i = search.pop()
+                count += 1
+                for n in neighbors[i]:
+                    n_stone = cells[n]
+                    if n_stone != Stone.EMPTY:
+                        border |= n_stone
+                    elif not traversed[n]:
+                        traversed[n] = 1
+                        search.append(n)
+            if border in scores:
+                scores[border] += count
+        return scores
+
+    def to_array(self):
+        '''
+        Return the stones as a 2D uint8 np.ndarray viewing the cells
+        '''
+        import numpy as np
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.board_size,
+                                                                 self.board_size)
@@ -1,5 +1,8 @@
-from src.board import Board
-from src.utils import Stone, make_2d_array
+import copy
+import os
+from src.board import create_board
+from src.symmetry import canonical, symmetric_variants
+from src.utils import Stone
 from src.group import Group, GroupManager
 from src.exceptions import (
     SelfDestructException, KoException, InvalidInputException)
@@ -10,19 +13,43 @@ class Game(object):
     '''
     def __init__(self, config):
 
-        # 2D board
-        self.board = Board(config)
+        # 2D board, using the backend selected in the config
+        self.board = create_board(config)
 
         # dimension of the square board
         self.board_size = config['board_size']
 
         # group manager instance
         self.gm = GroupManager(self.board,
-                               enable_self_destruct=config['enable_self_destruct'])
+                               enable_self_destruct=config['enable_self_destruct'],
+                               superko=config.get('superko', False),
+                               territory=config.get('incremental_territory', False),
+                               liberty_plane=config.get('liberty_plane', False))
         
         # count the number of consecutive passes
         self.count_pass = 0
 
+        # (move changes, count of passes before the move) of every move played
+        # with make_move, for unmake_move
+        self._move_stack = []
+
+        # statistics of the instrumented hot paths, if enabled
+        self._stats = None
+        if config.get('instrument', False):
+            self.enable_stats()
+
+        # cache of the evaluations of positions, if enabled (see src/cache.py),
+        # loaded from eval_cache_path if the file exists
+        self.eval_cache = None
+        if config.get('eval_cache', False):
+            from src.cache import EvalCache
+            self.eval_cache = EvalCache(config.get('eval_cache_entries', 100000),
+                                        config.get('eval_cache_bytes'),
+                                        rules=(self.board_size, config['enable_self_destruct']))
+            path = config.get('eval_cache_path')
+            if path is not None and os.path.exists(path):
+                self.eval_cache.load(path)
+
     def place_black(self, y, x):
         '''
         Place a black stone at coordinate (y, x)
@@ -35,12 +62,183 @@ class Game(object):
         '''
         self._place_stone(Stone.WHITE, y, x)
 
+    def play(self, stone, y, x):
+        '''
+        Place the stone at coordinate (y, x).
+        Throw an exception if self-destruct or ko rules are violated
+        '''
+        self._place_stone(stone, y, x)
+
+    def is_legal(self, stone, y, x):
+        '''
+        Check if placing the stone at (y, x) is legal, without changing the game.
+        Occupied points are never legal
+        '''
+        y, x = int(y), int(x)
+        if self.board[y, x] != Stone.EMPTY:
+            return False
+        if self.eval_cache is not None and not self.gm.superko:
+            mask = self.eval_cache.get(('legal_moves', self.position_key(stone)))
+            if mask is not None:
+                return bool(mask[y, x])
+        return self.gm.is_legal(stone, y, x)
+
+    def legal_moves(self, stone):
+        '''
+        Return a 2D boolean np.ndarray of the points where the stone can legally be placed.
+        With the eval cache enabled, the mask of a position seen before is returned from the
+        cache and is read-only. Legality depends on the whole history under superko,
+        which the key does not cover, so it is not cached then
+        '''
+        if self.eval_cache is None or self.gm.superko:
+            return self._legal_moves(stone)
+        return self.eval_cache.lookup(('legal_moves', self.position_key(stone)),
+                                      lambda: self._legal_moves(stone, read_only=True))
+
+    def _legal_moves(self, stone, read_only=False):
+        '''
+        Compute legal_moves with the board backend, checking the empty points that are
+        not always legal with the group manager. Every empty point is checked under
+        superko
+        '''
+        gm = self.gm
+        mask = self.board.get_legal_moves(lambda y, x: gm.is_legal(stone, y, x), gm._ko,
+                                          gm.superko)
+        if read_only:
+            mask.flags.writeable = False
+        return mask
+
+    def position_key(self, stone):
+        '''
+        Return the key of the position with the stone to play in the eval cache: the zobrist
+        hash of the board, the stone and the ko, which determine the legal moves and any
+        evaluation of the position
+        '''
+        return (self.board.zobrist_hash, stone, self.gm._ko)
+
+    def evaluate(self, name, stone, compute):
+        '''
+        Return compute(game), an evaluation of the position with the stone to play
+        (e.g. an ownership estimate) named `name`, from the eval cache if it was
+        computed before. Without the eval cache, compute is always called
+        '''
+        if self.eval_cache is None:
+            return compute(self)
+        return self.eval_cache.lookup((name, self.position_key(stone)), lambda: compute(self))
+
+    def feature_planes(self, stone):
+        '''
+        Return the (NUM_PLANES, board_size, board_size) uint8 np.ndarray of feature planes
+        of the position with the stone to play, as described in src/features.py
+        '''
+        import numpy as np
+        from src.features import NUM_PLANES, fill_feature_planes, get_ko_point
+        out = np.empty((1, NUM_PLANES, self.board_size, self.board_size), dtype=np.uint8)
+        fill_feature_planes(self.board.to_array()[None], [stone],
+                            [get_ko_point(self, stone)], out)
+        return out[0]
+
+    def enable_stats(self):
+        '''
+        Start counting and timing the hot paths of this game: moves, get_scores and the
+        group manager methods listed in GroupManager.enable_stats
+        '''
+        from src.stats import Stats
+        self.disable_stats()
+        self._stats = Stats()
+        self.gm.enable_stats(self._stats)
+        self._place_stone = self._stats.timed('move', self._place_stone)
+        self.get_scores = self._stats.timed('get_scores', self.get_scores)
+
+    def disable_stats(self):
+        '''
+        Stop the instrumentation started by enable_stats
+        '''
+        self.__dict__.pop('_place_stone', None)
+        self.__dict__.pop('get_scores', None)
+        self.gm.disable_stats()
+        self._stats = None
+
+    def stats(self):
+        '''
+        Return a snapshot of the timers (count, durations and latency histogram) and counters
+        (moves, merges, captures, stones removed, liberties restored, path compressions)
+        recorded since enable_stats, or None if instrumentation is disabled
+        '''
+        if self._stats is None:
+            return None
+        return self._stats.snapshot()
+
+    def snapshot(self):
+        '''
+        Return a fork of the game that can be played independently of this one.
+        The fork copies the board and the rows of the group map, and shares every group
+        with this game until one of them changes it, which copies that group only.
+        The fork starts with no moves to unmake and without instrumentation, and shares
+        the eval cache, whose keys cover the position
+        '''
+        if not self._move_stack:
+            # copies of shared groups are only kept to undo moves recorded before a fork
+            self.gm._clones.clear()
+        game = Game.__new__(Game)
+        game.board = copy.copy(self.board)
+        game.board_size = self.board_size
+        game.gm = self.gm.fork(game.board)
+        game.count_pass = self.count_pass
+        game._move_stack = []
+        game._stats = None
+        game.eval_cache = self.eval_cache
+        return game
+
+    def clear_board(self):
+        '''
+        Remove every stone and start the game over, reusing the board and the group
+        manager. The captures, the passes and the moves to unmake are cleared
+        '''
+        self.board.clear()
+        self.gm.reset()
+        self.count_pass = 0
+        self._move_stack.clear()
+
     def pass_turn(self):
         '''
         Pass this turn
         '''
         self.count_pass += 1
 
+    def make_move(self, stone, y=None, x=None):
+        '''
+        Place a stone at (y, x), or pass if no coordinate is given, so that the move
+        can be taken back with unmake_move.
+        Throw an exception if self-destruct or ko rules are violated, in which case
+        nothing is recorded
+        '''
+        count_pass = self.count_pass
+        if y is None:
+            self.pass_turn()
+            self._move_stack.append((None, count_pass))
+            return
+        if stone == Stone.EMPTY:
+            return
+
+        y, x = int(y), int(x)
+        self.gm.start_delta(y, x)
+        try:
+            self._place_stone(stone, y, x)
+        finally:
+            delta = self.gm.stop_delta()
+        self._move_stack.append((delta, count_pass))
+
+    def unmake_move(self):
+        '''
+        Take back the last move played with make_move, restoring the previous state
+        in time proportional to the changes made by that move
+        '''
+        delta, count_pass = self._move_stack.pop()
+        if delta is not None:
+            self.gm.undo_delta(delta)
+        self.count_pass = count_pass
+
     def is_over(self):
         '''
         Check if the game is over (only if there are two consecutive passes)
@@ -60,6 +258,8 @@ class Game(object):
         '''
         if stone == Stone.EMPTY:
             return
+        # python ints, as the group masks are shifted by the flat index
+        y, x = int(y), int(x)
         self.board.place_stone(stone, y, x)
 
         try:
@@ -70,10 +270,58 @@ class Game(object):
         except KoException as e:
             self.board.remove_stone(y, x)
             raise e
+        except Exception:
+            # leave no stone without a group behind
+            if self.board[y, x] == stone:
+                self.board.remove_stone(y, x)
+            raise
             
         self.count_pass = 0
         self.gm.update_state()
 
+    @property
+    def liberty_plane(self):
+        '''
+        Return the read-only 2D int8 np.ndarray of the liberty count of the group of every
+        stone (capped at 127, and 0 at empty points), or None unless liberty_plane is
+        enabled in the config. It is a view kept up to date with every move
+        '''
+        if self.gm.liberties is None:
+            return None
+        return self.gm.liberties.plane
+
+    @property
+    def hash(self):
+        '''
+        Return the 64-bit zobrist hash of the stones on the board
+        '''
+        return self.board.zobrist_hash
+
+    @property
+    def canonical_hash(self):
+        '''
+        Return the smallest zobrist hash of the 8 symmetric variants of the board, equal
+        for positions that are rotations or reflections of each other. With canonical_hash
+        enabled in the config, the hashes of the variants are kept up to date with every
+        move, otherwise they are computed from the stones in one pass
+        '''
+        return canonical(self.board.get_packed_hash())[0]
+
+    @property
+    def canonical_symmetry(self):
+        '''
+        Return the symmetry k of the variant of the board with the canonical hash, which is
+        symmetric_variants()[k] (see src/symmetry.py)
+        '''
+        return canonical(self.board.get_packed_hash())[1]
+
+    def symmetric_variants(self):
+        '''
+        Return the (8, board_size, board_size) np.ndarray of the stones under every symmetry:
+        the board rotated by 0, 90, 180 and 270 degrees, then its transpose rotated likewise
+        '''
+        return symmetric_variants(self.board.to_array())
+
     @property
     def num_black_captured(self):
         '''
@@ -94,56 +342,52 @@ class Game(object):
         '''
         self.board._render()
 
+    def _get_territory(self):
+        '''
+        Return the number of empty points that are territory of black and white
+        '''
+        if self.gm.territory is not None:
+            return self.gm.territory.get_territory()
+        return self.board.get_territory()
+
     def get_scores(self):
         '''
         Return the score of black and white.
         Scoring is counted based on territorial rules, with no interpolation of dead/alive groups.
         An area is a territory for a player if any area within that territory can only reach
         stones of of that player.
+        With incremental_territory enabled in the config, the territory is read in O(1),
+        and with the eval cache enabled, the territory of a board seen before is read
+        from the cache
         '''
-        scores = {Stone.BLACK: 0,
-                  Stone.WHITE: 0
-                 }
-        traversed = make_2d_array(self.board_size, self.board_size,
-                                  default=lambda: False)
-
-        def traverse(y, x):
-            traversed[y][x] = True
-            search = [(y, x)]
-            stone = None
-            count = 1
-            is_neutral = False
-
-            while search:
-                y, x = search.pop()
-                for ly, lx in self.board.get_liberty_coords(y, x):
-                    this_stone = self.board[ly, lx]
-                    if this_stone != Stone.EMPTY:
-                        stone = stone or this_stone
-                        if stone != this_stone:
-                            is_neutral = True                
-                    if not traversed[ly][lx]:
-                        if this_stone == Stone.EMPTY:
-                            count += 1
-                            search.append((ly, lx))
-                    traversed[ly][lx] = True
-
-            if is_neutral:
-                return 0, Stone.EMPTY
-            return count, stone
-
-        for y in range(self.board_size):
-            for x in range(self.board_size):
-                if not traversed[y][x] and self.board[y, x] == Stone.EMPTY:
-                    score, stone = traverse(y, x)
-                    if stone is not None and stone != Stone.EMPTY:
-                        scores[stone] += score
-
+        if self.eval_cache is not None:
+            scores = dict(self.eval_cache.lookup(('territory', self.board.zobrist_hash),
+                                                 self._get_territory))
+        else:
+            scores = self._get_territory()
         scores[Stone.BLACK] -= self.num_black_captured
         scores[Stone.WHITE] -= self.num_white_captured
         return scores
 
 
+def create_opponent(config):
+    '''
+    Create the computer opponent selected by `opponent` in the config:
+        - None (default) for no opponent, returning None
+        - "mcts" for an MCTS player searching mcts_playouts playouts, or mcts_seconds
+          seconds if it is set instead
+    '''
+    opponent = config.get('opponent')
+    if opponent is None:
+        return None
+    if opponent == 'mcts':
+        from src.mcts import MCTS
+        seconds = config.get('mcts_seconds')
+        playouts = config.get('mcts_playouts', 1000) if seconds is None else None
+        return MCTS(config['board_size'], playouts=playouts, seconds=seconds)
+    raise ValueError(f'Unknown opponent: {opponent}')
+
+
 class GameUI(object):
     '''
     Main interface between the game and the players
@@ -156,6 +400,12 @@ class GameUI(object):
         # store which player's turn it is
         self.turn = Stone.BLACK
 
+        # computer opponent playing white, if any
+        self.opponent = create_opponent(config)
+
+        # stone played by the opponent
+        self.opponent_stone = Stone.WHITE
+
     def play(self):
         '''
         Start the game of Go. Two players alternate turns placing stones on the board
@@ -166,7 +416,10 @@ class GameUI(object):
             self.game.render_board()
 
             while not is_turn_over:
-                move = self._prompt_move()
+                if self.opponent is not None and self.turn == self.opponent_stone:
+                    move = self._opponent_move()
+                else:
+                    move = self._prompt_move()
                 if move == 'pass':
                     self.game.pass_turn()
                     is_turn_over = True
@@ -211,6 +464,20 @@ class GameUI(object):
             is_turn_over = False
         return is_turn_over
 
+    def _opponent_move(self):
+        '''
+        Let the computer opponent choose its move, in the same format as _prompt_move
+        '''
+        move = self.opponent.get_move(self.game, self.turn)
+        player = self._get_player_name(self.turn)
+        if move is None:
+            print(f'{player} move: pass')
+            return 'pass'
+        y, x = move
+        print(f'{player} move: {self.game.board._index_to_label(y)} '
+              f'{self.game.board._index_to_label(x)}')
+        return move
+
     def _get_player_name(self, stone):
         '''
         Return the player name for the specified stone
@@ -261,7 +528,8 @@ class GameUI(object):
         x = self._label_to_coord(x)
         return y, x
     
-    def _label_to_coord(self, label):
+    @staticmethod
+    def _label_to_coord(label):
         '''
         Translate an individual input coordinate into a valid one.
         The labels are given as 0, 1, 2, ... , 9, A, B, ...
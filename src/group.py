@@ -1,33 +1,77 @@
-from src.utils import Stone, make_2d_array, get_opposite_stone
+import time
+from src.utils import (
+    Stone, make_2d_array, get_opposite_stone, get_neighbor_table, get_neighbor_masks, iter_bits)
 from src.exceptions import SelfDestructException, KoException
+from src.territory import Territory
 
 class Group(object):
     '''
     Representation of a group on the board.
+    The stones and liberties are stored as integer bitmasks, with the bit
+    y * board_size + x set for the point (y, x)
     '''
-    def __init__(self, stone, liberties=None, removed_liberties=None, coords=None):
+    __slots__ = ('stone', 'board_size', 'liberty_mask', 'removed_mask', 'stone_mask',
+                 '_group', 'owner')
+
+    def __init__(self, stone, board_size, liberty_mask=0, removed_mask=0, stone_mask=0):
 
         # the stone color of this group
         self.stone = stone
 
+        # dimension of the board, to translate between bits and coordinates
+        self.board_size = board_size
+
         # uncaptured liberties of the group
-        self.liberties = liberties or set()
+        self.liberty_mask = liberty_mask
 
         # captured liberties of the group
-        self.removed_liberties = removed_liberties or set()
+        self.removed_mask = removed_mask
 
-        # coordinates of stones constituting the group
-        self.coords = coords or set()
+        # stones constituting the group
+        self.stone_mask = stone_mask
 
         # the parent group (in the case of merging)
         self._group = self
 
+        # token of the group manager allowed to change the group in place. Groups shared
+        # between a game and its snapshots are owned by none of them, and are copied by
+        # whichever changes them first
+        self.owner = None
+
+    def _to_coords(self, mask):
+        '''
+        Return the set of (y, x) coordinates of the bits of the mask
+        '''
+        board_size = self.board_size
+        return {divmod(idx, board_size) for idx in iter_bits(mask)}
+
+    @property
+    def liberties(self):
+        '''
+        Return the set of (y, x) coordinates of the uncaptured liberties
+        '''
+        return self._to_coords(self.liberty_mask)
+
+    @property
+    def removed_liberties(self):
+        '''
+        Return the set of (y, x) coordinates of the captured liberties
+        '''
+        return self._to_coords(self.removed_mask)
+
+    @property
+    def coords(self):
+        '''
+        Return the set of (y, x) coordinates of the stones of the group
+        '''
+        return self._to_coords(self.stone_mask)
+
     @property
     def num_liberties(self):
         '''
         Return the number of liberties. The group is captured if there are 0
         '''
-        return len(self.liberties)
+        return self.liberty_mask.bit_count()
 
     @property
     def num_removed_liberties(self):
@@ -35,15 +79,14 @@ class Group(object):
         Return the number of "removed" liberties".
         These are the liberties that have been captured from the group
         '''
-        return len(self.removed_liberties)
+        return self.removed_mask.bit_count()
 
     @property
     def num_coords(self):
         '''
-        Return the number of stones in the group,
-        which are stored in terms of their coordinates
+        Return the number of stones in the group
         '''
-        return len(self.coords)
+        return self.stone_mask.bit_count()
 
     @property
     def group(self):
@@ -53,7 +96,7 @@ class Group(object):
         '''
         g = self
         stack = []
-        while g is not None and g != g._group:
+        while g is not None and g is not g._group:
             stack.append(g)
             g = g._group
         new_group = g
@@ -62,28 +105,17 @@ class Group(object):
 
         return new_group
 
-    @staticmethod
-    def merge(stone, groups, merge_coord, liberties=None, removed_liberties=None):
+    def merge(self, groups, liberty_mask, removed_mask, stone_mask):
         '''
-        Merge the specified groups into one.
-        The `merge_coord` is the coordinate that was placed in to merge the given groups.
-        The liberties and stones of the groups are combined to form a new group
+        Merge the specified groups into this one in place, which then has the given
+        liberties and stones of the combined group. The merged groups point to this one
+        as their parent, so their stones are found through path compression
         '''
-        liberties = liberties or set()
-        coords = set()
-        removed_liberties = removed_liberties or set()
         for g in groups:
-
-            liberties |= g.liberties
-            coords |= g.coords
-            removed_liberties |= g.removed_liberties
-
-        new_group = Group(stone, liberties=liberties,
-                                 removed_liberties=removed_liberties,
-                                 coords=coords)
-        new_group.liberties.discard(merge_coord)
-        new_group.coords.add(merge_coord)
-        return new_group
+            g.assign_group(self)
+        self.liberty_mask = liberty_mask
+        self.removed_mask = removed_mask
+        self.stone_mask = stone_mask
 
     def assign_group(self, g):
         '''
@@ -91,42 +123,85 @@ class Group(object):
         '''
         self._group = g
 
-    def remove_liberty(self, coord):
+    def remove_liberty(self, mask):
         '''
-        Capture the liberty at the specified coordinate
+        Capture the liberties at the bits of the mask
         '''
-        self.liberties.discard(coord)
-        self.removed_liberties.add(coord)
+        self.liberty_mask &= ~mask
+        self.removed_mask |= mask
 
-    def restore_liberty(self, coord):
+    def restore_liberty(self, mask):
         '''
-        Restore the liberty at the specified coordinate
+        Restore the liberties at the bits of the mask
         '''
-        self.liberties.add(coord)
-        self.removed_liberties.discard(coord)
+        self.liberty_mask |= mask
+        self.removed_mask &= ~mask
 
     def has_liberty(self, coord):
         '''
         Return true if this group has the specified liberty open
         '''
-        return coord in self.liberties
+        y, x = coord
+        return self.liberty_mask >> (y * self.board_size + x) & 1 == 1
     
     def has_removed_liberty(self, coord):
         '''
         Return true if this group has the specified liberty captured
         '''
-        return coord in self.removed_liberties
+        y, x = coord
+        return self.removed_mask >> (y * self.board_size + x) & 1 == 1
+
+
+class MoveDelta(object):
+    '''
+    The changes made by one move, recorded by GroupManager so the move can be undone
+    '''
+    __slots__ = ('y', 'x', 'ko', 'num_captured_stones', 'merged', 'absorbed', 'captured',
+                 'liberties', 'position')
+
+    def __init__(self, y, x, ko, num_captured_stones):
+
+        # coordinate of the placed stone
+        self.y = y
+        self.x = x
+
+        # ko and number of captured stones before the move
+        self.ko = ko
+        self.num_captured_stones = num_captured_stones
+
+        # friendly groups merged into the group of the placed stone
+        self.merged = ()
+
+        # (group, liberty mask, removed liberty mask, stone mask) of the friendly group
+        # the others were merged into, before the move, if any
+        self.absorbed = None
+
+        # groups captured by the move
+        self.captured = ()
+
+        # (group, liberty mask, removed liberty mask) before every liberty change
+        self.liberties = []
+
+        # zobrist hash recorded for positional superko, if any
+        self.position = None
 
 
 class GroupManager(object):
     '''
     Manages the underlying game logic of Go, mostly to do with groups.
     '''
-    def __init__(self, board, enable_self_destruct):
+    def __init__(self, board, enable_self_destruct, superko=False, territory=False,
+                 liberty_plane=False):
 
         # the 2D board instance
         self.board = board
 
+        # dimension of the board and its shared neighbor table and neighbor masks,
+        # indexed by y * board_size + x
+        self._board_size = board.board_size
+        self._neighbors = get_neighbor_table(board.board_size)
+        self._neighbor_masks = get_neighbor_masks(board.board_size)
+
         # allow self-destruction
         self.enable_self_destruct = enable_self_destruct
 
@@ -145,6 +220,106 @@ class GroupManager(object):
         # ko resulting from the previous move only to check for violation of Ko rule
         self._ko = None
 
+        # forbid any move that repeats a previous position (positional superko)
+        self.superko = superko
+
+        # zobrist hashes of every position so far, to check for violation of superko
+        self._positions = {board.zobrist_hash} if superko else None
+
+        # empty regions kept up to date with every move, if enabled
+        self.territory = Territory(board.board_size) if territory else None
+
+        # liberty count of the group of every stone kept up to date with every move,
+        # if enabled (imported here so that numpy is only needed when it is)
+        self.liberties = None
+        if liberty_plane:
+            from src.liberties import LibertyPlane
+            self.liberties = LibertyPlane(board.board_size)
+
+        # changes of the move being recorded, if any
+        self._delta = None
+
+        # statistics of the instrumented methods, if enabled
+        self._stats = None
+
+        # token of this manager, stored in the groups it may change in place
+        self._owner = object()
+
+        # copies owned by this manager of the shared groups changed since the last fork,
+        # so that moves recorded before the fork are undone on the copies
+        self._clones = {}
+
+    def reset(self):
+        '''
+        Forget every group, capture, ko and position, for the board cleared in place.
+        The group map rows and the territory and liberty plane buffers are reused
+        '''
+        for row in self._group_map:
+            row[:] = [None] * self._board_size
+        self._captured_groups.clear()
+        self._num_captured_stones[Stone.WHITE] = 0
+        self._num_captured_stones[Stone.BLACK] = 0
+        self._ko = None
+        if self.superko:
+            self._positions.clear()
+            self._positions.add(self.board.zobrist_hash)
+        if self.territory is not None:
+            self.territory.reset()
+        if self.liberties is not None:
+            self.liberties.reset()
+        self._delta = None
+        self._clones.clear()
+
+    def fork(self, board):
+        '''
+        Return a group manager of the same position on `board`, a copy of this board,
+        sharing every group with this manager. Both managers get a new token, so the
+        groups become read-only and are copied by either manager before it changes them.
+        Only the group map rows are copied, and a fork cannot undo earlier moves
+        '''
+        gm = GroupManager.__new__(GroupManager)
+        gm.board = board
+        gm._board_size = self._board_size
+        gm._neighbors = self._neighbors
+        gm._neighbor_masks = self._neighbor_masks
+        gm.enable_self_destruct = self.enable_self_destruct
+        gm._group_map = [row[:] for row in self._group_map]
+        gm._captured_groups = set()
+        gm._num_captured_stones = dict(self._num_captured_stones)
+        gm._ko = self._ko
+        gm.superko = self.superko
+        gm._positions = set(self._positions) if self.superko else None
+        gm.territory = self.territory.copy() if self.territory is not None else None
+        gm.liberties = self.liberties.copy() if self.liberties is not None else None
+        gm._delta = None
+        gm._stats = None
+        gm._owner = object()
+        gm._clones = {}
+        self._owner = object()
+        return gm
+
+    def _own(self, g):
+        '''
+        Return the copy of the group that this manager may change in place, which is
+        the group itself if this manager owns it. A shared group is copied the first time,
+        and the group map is pointed at the copy
+        '''
+        owner = self._owner
+        while g.owner is not owner:
+            clone = self._clones.get(g)
+            if clone is None:
+                clone = Group(g.stone, g.board_size, g.liberty_mask, g.removed_mask,
+                              g.stone_mask)
+                clone.owner = owner
+                self._clones[g] = clone
+                if g._group is g:
+                    group_map = self._group_map
+                    board_size = self._board_size
+                    for idx in iter_bits(clone.stone_mask):
+                        group_map[idx // board_size][idx % board_size] = clone
+            g = clone
+        return g
+
     def _get_group(self, y, x):
         '''
         Get the group that the stone at the specified coordinate belongs to.
@@ -156,8 +331,20 @@ class GroupManager(object):
         new_g = g.group
         if g != new_g:
             self._group_map[y][x] = new_g
+        if new_g is not None and new_g.owner is not self._owner:
+            new_g = self._own(new_g)
         return new_g
 
+    def _peek_group(self, y, x):
+        '''
+        Get the group that the stone at the specified coordinate belongs to,
+        without storing any new mapping
+        '''
+        g = self._group_map[y][x]
+        while g is not None and g is not g._group:
+            g = g._group
+        return g
+
     def _is_captured(self, group):
         '''
         Check if the specified group is captured
@@ -170,7 +357,7 @@ class GroupManager(object):
     def _check_ko(self, y, x, captured):
         '''
         Throw an exception if the Ko rule has been violated.
-        If there is a Ko, cache it to determine if the next move violates the Ko rule.
+        Otherwise return the Ko to cache, which determines if the next move violates the Ko rule.
         '''
         if len(captured) == 1:
             cy, cx = captured[0]
@@ -179,21 +366,92 @@ class GroupManager(object):
                 self.undo_stone(y, x)
                 raise KoException('You may not repeat the last board state. Please choose a different move')
             if captured_group.num_coords == 1:
-                self._ko = (y, x)
-        else:
-            self._ko = None
+                return (y, x)
+            return self._ko
+        return None
 
-    def _check_self_destruct(self, y, x, new_group):
+    def _check_self_destruct(self, y, x, liberty_mask):
         '''
-        Check for self-destruction, and throw an exception if it is not a legal move.
+        Check for self-destruction of the group of the placed stone, from the liberties
+        it has once merged, and throw an exception if it is not a legal move.
+        Return True if the group is captured by its own move
         '''
-        self_destruct = self._is_captured(new_group)
-        if self_destruct:
-            new_group.assign_group(None)
-            if not self.enable_self_destruct:
-                self.undo_stone(y, x)
-                raise SelfDestructException('Self destruction is not permitted. Please choose a different move.')
+        if liberty_mask:
+            return False
+        if not self.enable_self_destruct:
+            self.undo_stone(y, x)
+            raise SelfDestructException('Self destruction is not permitted. Please choose a different move.')
+        return True
         
+    def _check_superko(self, y, x, self_destruct_mask):
+        '''
+        Throw an exception if the position after this move, with captured groups cleared,
+        repeats any previous position. `self_destruct_mask` holds the stones of the group
+        of the placed stone if it destroys itself, and is 0 otherwise
+        '''
+        zobrist = self.board.zobrist
+        position = self.board.zobrist_hash
+        for g in self._captured_groups:
+            keys = zobrist[g.stone]
+            for idx in iter_bits(g.stone_mask):
+                position ^= keys[idx]
+        keys = zobrist[self.board[y, x]]
+        for idx in iter_bits(self_destruct_mask):
+            position ^= keys[idx]
+        if position in self._positions:
+            self.undo_stone(y, x)
+            raise KoException('You may not repeat a previous board state. Please choose a different move')
+
+    def is_legal(self, stone, y, x):
+        '''
+        Check if placing the stone at the empty point (y, x) is legal, without changing
+        any state. This agrees with resolve_board raising KoException or SelfDestructException
+        '''
+        y, x = int(y), int(x)
+        bit = 1 << (y * self._board_size + x)
+        opposite_stone = get_opposite_stone(stone)
+        captured = []
+        captured_groups = []
+        friendly_groups = []
+        has_liberty = False
+
+        for ly, lx in self._neighbors[y * self._board_size + x]:
+            g = self._peek_group(ly, lx)
+            if g is None:
+                has_liberty = True
+            elif g.stone == opposite_stone:
+                if g.liberty_mask == bit:
+                    captured.append((ly, lx))
+                    captured_groups.append(g)
+            else:
+                friendly_groups.append(g)
+                if g.liberty_mask & ~bit:
+                    has_liberty = True
+
+        if len(captured) == 1 and captured[0] == self._ko:
+            return False
+
+        self_destruct = not captured and not has_liberty
+        if self_destruct and not self.enable_self_destruct:
+            return False
+
+        if self.superko:
+            zobrist = self.board.zobrist
+            board_size = self._board_size
+            position = self.board.zobrist_hash ^ zobrist[stone][y * board_size + x]
+            removed = set(captured_groups)
+            if self_destruct:
+                position ^= zobrist[stone][y * board_size + x]
+                removed.update(friendly_groups)
+            for g in removed:
+                keys = zobrist[g.stone]
+                for idx in iter_bits(g.stone_mask):
+                    position ^= keys[idx]
+            if position in self._positions:
+                return False
+
+        return True
+
     def is_same_group(self, y1, x1, y2, x2):
         '''
         Check if the two specified coordinates share the same group.
@@ -201,18 +459,32 @@ class GroupManager(object):
         '''
         return self._get_group(y1, x1) == self._get_group(y2, x2)
 
+    def is_eye(self, stone, y, x):
+        '''
+        Check if (y, x) is a single-point eye of the stone, i.e. all of its neighbors
+        are stones of that colour
+        '''
+        group_map = self._group_map
+        for ly, lx in self._neighbors[y * self._board_size + x]:
+            g = group_map[ly][lx]
+            if g is None or g.stone != stone:
+                return False
+        return True
+
     def undo_stone(self, y, x):
         '''
         Undo the move at the specified coordinate.
         It is meant to undo in cases of Ko or self-destruct violation, not
         to undo a previous legal move
         '''
+        y, x = int(y), int(x)
         stone = self.board[y, x]
         opposite_stone = get_opposite_stone(stone)
-        for ly, lx in self.board.get_liberty_coords(y, x):
-            if self.board[ly, lx] == opposite_stone:
-                group = self._get_group(ly, lx)
-                group.restore_liberty((y, x))
+        bit = 1 << (y * self._board_size + x)
+        for ly, lx in self._neighbors[y * self._board_size + x]:
+            group = self._get_group(ly, lx)
+            if group is not None and group.stone == opposite_stone:
+                group.restore_liberty(bit)
                 group.assign_group(group)
                 self._captured_groups.discard(group)
 
@@ -226,42 +498,79 @@ class GroupManager(object):
         Check the liberty coordinates of (y, x) to check for captures of enemy stones
         and merging with friendly groups.
         '''
+        y, x = int(y), int(x)
         groups = set()
         stone = self.board[y, x]
         opposite_stone = get_opposite_stone(stone)
-        new_group_liberties = set()
-        new_group_removed_liberties = set()
+        board_size = self._board_size
+        bit = 1 << (y * board_size + x)
+        new_group_liberties = 0
+        new_group_removed_liberties = 0
         captured = []
 
-        for ly, lx in self.board.get_liberty_coords(y, x):
+        for ly, lx in self._neighbors[y * board_size + x]:
+            # the group map mirrors the board, so the stone is read from the group
             g = self._get_group(ly, lx)
+            neighbor_stone = g.stone if g is not None else Stone.EMPTY
 
-            if self.board[ly, lx] == Stone.EMPTY:
-                new_group_liberties.add((ly, lx))
+            if neighbor_stone == Stone.EMPTY:
+                new_group_liberties |= 1 << (ly * board_size + lx)
 
-            elif self.board[ly, lx] == opposite_stone:
-                g.remove_liberty((y, x))
+            elif neighbor_stone == opposite_stone:
+                if self._delta is not None:
+                    self._record_liberty(g)
+                g.remove_liberty(bit)
                 if self._is_captured(g):
                     captured.append((ly, lx))
-                    new_group_liberties.add((ly, lx))
+                    new_group_liberties |= 1 << (ly * board_size + lx)
                 else:
-                    new_group_removed_liberties.add((ly, lx))
+                    new_group_removed_liberties |= 1 << (ly * board_size + lx)
 
             else:
                 groups.add(g)
 
-        self._check_ko(y, x, captured)
-
-        new_group = Group.merge(stone, groups, (y, x),  
-                                liberties=new_group_liberties,
-                                removed_liberties=new_group_removed_liberties
-                               )
-
-        self._check_self_destruct(y, x, new_group)
+        ko = self._check_ko(y, x, captured)
 
+        # liberties and stones of the group of the placed stone, merged with the friendly groups
+        new_group_stones = bit
         for g in groups:
-            g.assign_group(new_group)
+            new_group_liberties |= g.liberty_mask
+            new_group_removed_liberties |= g.removed_mask
+            new_group_stones |= g.stone_mask
+        new_group_liberties &= ~bit
+
+        self_destruct = self._check_self_destruct(y, x, new_group_liberties)
+        if self.superko:
+            self._check_superko(y, x, new_group_stones if self_destruct else 0)
+        self._ko = ko
+
+        if groups:
+            # union by size: the smaller groups are merged into the largest one in place
+            new_group = max(groups, key=lambda g: g.stone_mask.bit_count())
+            groups.discard(new_group)
+            if self._delta is not None:
+                self._delta.absorbed = (new_group, new_group.liberty_mask,
+                                        new_group.removed_mask, new_group.stone_mask)
+                self._delta.merged = tuple(groups)
+            new_group.merge(groups, new_group_liberties, new_group_removed_liberties,
+                            new_group_stones)
+        else:
+            new_group = Group(stone, board_size, new_group_liberties,
+                              new_group_removed_liberties, new_group_stones)
+            new_group.owner = self._owner
+
+        if self_destruct:
+            self._captured_groups.add(new_group)
+            new_group.assign_group(None)
         self._group_map[y][x] = new_group
+        if self.territory is not None:
+            self.territory.add_stone(stone, y, x)
+        if self.liberties is not None:
+            changed = {self._peek_group(ly, lx) for ly, lx in self._neighbors[y * board_size + x]}
+            changed.add(new_group)
+            for g in changed:
+                if g is not None and (g.stone == opposite_stone or g is new_group):
+                    self.liberties.set_group(g)
 
     def update_state(self):
         '''
@@ -269,27 +578,192 @@ class GroupManager(object):
         At this point, the move prior is considered valid, and 
         all post-processing of captures occurs here
         '''
+        neighbor_masks = self._neighbor_masks
+        board_size = self._board_size
+        delta = self._delta
+        liberties = self.liberties
+        changed = set()
+        if delta is not None:
+            delta.captured = tuple(self._captured_groups)
         for g in self._captured_groups:
 
             # nullify group
             g.assign_group(None)
 
             # restore liberties to those who had liberties removed by a group that was captured
-            for y, x in g.removed_liberties:
-                group_to_change = self._get_group(y, x)
+            for idx in iter_bits(g.removed_mask):
+                group_to_change = self._get_group(idx // board_size, idx % board_size)
                 if group_to_change is None:
                     continue
-                liberty_coords = self.board.get_liberty_coords(y, x)
-                for lcoord in liberty_coords:
-                    if lcoord in g.coords:
-                        group_to_change.restore_liberty(lcoord)
+                if delta is not None:
+                    self._record_liberty(group_to_change)
+                group_to_change.restore_liberty(neighbor_masks[idx] & g.stone_mask)
+                if liberties is not None:
+                    changed.add(group_to_change)
 
             # clear captured regions on board
-            for y, x in g.coords:
-                self.board.remove_stone(y, x)
+            self.board.remove_stones(g.stone_mask)
+            for idx in iter_bits(g.stone_mask):
+                y, x = idx // board_size, idx % board_size
                 self._group_map[y][x] = None
+                if self.territory is not None:
+                    self.territory.remove_stone(y, x)
 
             # record the captured groups
             self._num_captured_stones[g.stone] += g.num_coords
+            if liberties is not None:
+                liberties.clear(g.stone_mask)
+
+        for g in changed:
+            liberties.set_group(g)
 
         self._captured_groups.clear()
+
+        if self.superko:
+            self._positions.add(self.board.zobrist_hash)
+            if delta is not None:
+                delta.position = self.board.zobrist_hash
+
+    def enable_stats(self, stats):
+        '''
+        Instrument resolve_board, _check_ko, _check_self_destruct, update_state and the
+        path compression walks of _get_group, recording into the Stats instance.
+        The methods are wrapped on this instance only, so nothing is recorded
+        (and nothing is paid) while instrumentation is disabled
+        '''
+        self.disable_stats()
+        self._stats = stats
+        counters = stats.counters
+        neighbors = self._neighbors
+        neighbor_masks = self._neighbor_masks
+        board_size = self._board_size
+        group_map = self._group_map
+
+        resolve_board = stats.timed('resolve_board', self.resolve_board)
+        def resolve_board_stats(y, x):
+            # count the friendly groups merged by the move, once it is legal
+            stone = self.board[y, x]
+            merged = {self._peek_group(ly, lx) for ly, lx in neighbors[y * board_size + x]}
+            resolve_board(y, x)
+            counters['merges'] += sum(1 for g in merged if g is not None and g.stone == stone)
+
+        update_state = stats.timed('update_state', self.update_state)
+        def update_state_stats():
+            counters['moves'] += 1
+            for g in self._captured_groups:
+                counters['captures'] += 1
+                counters['stones_removed'] += g.num_coords
+                for idx in iter_bits(g.removed_mask):
+                    counters['liberties_restored'] += (neighbor_masks[idx] & g.stone_mask).bit_count()
+            update_state()
+
+        get_group = self._get_group
+        path_compression = stats.timer('path_compression')
+        clock = time.perf_counter
+        def get_group_stats(y, x):
+            g = group_map[y][x]
+            if g is None or g._group is g and g.owner is self._owner:
+                return g
+            start = clock()
+            g = get_group(y, x)
+            path_compression.add(clock() - start)
+            counters['path_compressions'] += 1
+            return g
+
+        self.resolve_board = resolve_board_stats
+        self._check_ko = stats.timed('check_ko', self._check_ko)
+        self._check_self_destruct = stats.timed('check_self_destruct', self._check_self_destruct)
+        self.update_state = update_state_stats
+        self._get_group = get_group_stats
+
+    def disable_stats(self):
+        '''
+        Remove the instrumentation added by enable_stats
+        '''
+        for name in ['resolve_board', '_check_ko', '_check_self_destruct',
+                     'update_state', '_get_group']:
+            self.__dict__.pop(name, None)
+        self._stats = None
+
+    def _record_liberty(self, group):
+        '''
+        Record the liberties of the group before they change
+        '''
+        self._delta.liberties.append((group, group.liberty_mask, group.removed_mask))
+
+    def start_delta(self, y, x):
+        '''
+        Start recording the changes of the move at (y, x)
+        '''
+        self._delta = MoveDelta(y, x, self._ko, dict(self._num_captured_stones))
+
+    def stop_delta(self):
+        '''
+        Stop recording and return the changes of the move
+        '''
+        delta = self._delta
+        self._delta = None
+        return delta
+
+    def undo_delta(self, delta):
+        '''
+        Undo a legal move from its recorded changes, restoring the previous state.
+        Moves must be undone in the reverse order they were played
+        '''
+        board = self.board
+        board_size = self._board_size
+        group_map = self._group_map
+        territory = self.territory
+        own = self._own
+
+        if delta.position is not None:
+            self._positions.discard(delta.position)
+
+        # bring back the captured groups
+        for g in delta.captured:
+            g = own(g)
+            g.assign_group(g)
+            for idx in iter_bits(g.stone_mask):
+                y, x = idx // board_size, idx % board_size
+                board.place_stone(g.stone, y, x)
+                group_map[y][x] = g
+                if territory is not None:
+                    territory.add_stone(g.stone, y, x)
+
+        # reverse the liberty changes, latest first
+        for group, liberty_mask, removed_mask in reversed(delta.liberties):
+            group = own(group)
+            group.liberty_mask = liberty_mask
+            group.removed_mask = removed_mask
+
+        # restore the group the others were merged into, then split the merged groups,
+        # which are left unchanged by merging
+        if delta.absorbed is not None:
+            g, liberty_mask, removed_mask, stone_mask = delta.absorbed
+            g = own(g)
+            g.liberty_mask = liberty_mask
+            g.removed_mask = removed_mask
+            g.stone_mask = stone_mask
+            g.assign_group(g)
+        for g in delta.merged:
+            g = own(g)
+            g.assign_group(g)
+            for idx in iter_bits(g.stone_mask):
+                group_map[idx // board_size][idx % board_size] = g
+
+        if self.liberties is not None:
+            changed = {own(g) for g in delta.captured}
+            changed.update(own(entry[0]) for entry in delta.liberties)
+            changed.update(own(g) for g in delta.merged)
+            if delta.absorbed is not None:
+                changed.add(own(delta.absorbed[0]))
+            for g in changed:
+                self.liberties.set_group(g)
+            self.liberties.clear(1 << (delta.y * board_size + delta.x))
+
+        group_map[delta.y][delta.x] = None
+        board.remove_stone(delta.y, delta.x)
+        if territory is not None:
+            territory.remove_stone(delta.y, delta.x)
+        self._ko = delta.ko
+        self._num_captured_stones.update(delta.num_captured_stones)
@@ -0,0 +1,246 @@
+import argparse
+import random
+import sys
+from src.game import Game, create_opponent
+from src.selfplay import random_policy
+from src.utils import Stone
+from src.exceptions import SelfDestructException, KoException, InvalidInputException
+
+# column letters of the GTP vertices, which skip I
+COLUMNS = 'ABCDEFGHJKLMNOPQRSTUVWXYZ'
+
+# largest number of bytes read from the input at once
+CHUNK_SIZE = 1 << 16
+
+COLORS = {'b': Stone.BLACK,
+          'black': Stone.BLACK,
+          'w': Stone.WHITE,
+          'white': Stone.WHITE
+         }
+
+class GTPEngine(object):
+    '''
+    Go Text Protocol front end of Game, for Go tools and tournament managers.
+    Vertices are GTP letters and numbers: columns A to Z without I from the left,
+    and rows from 1 at the bottom. genmove asks the opponent of the config, or plays
+    a random move without filling its own eyes if there is none
+    '''
+    def __init__(self, config, seed=None):
+
+        # config of the games, whose board size is changed by boardsize
+        self.config = config
+
+        # the game object, and the computer player of genmove
+        self.game = Game(config)
+        self.opponent = create_opponent(config)
+
+        # source of randomness of genmove without an opponent
+        self.rng = random.Random(seed)
+
+        # points given to white in final_score
+        self.komi = float(config.get('komi', 0))
+
+        # set by the quit command
+        self.quit = False
+
+        # (handler, number of arguments) of every command. The handler is called with
+        # the arguments and returns the response
+        self._commands = {'protocol_version': (self._protocol_version, 0),
+                          'name': (self._name, 0),
+                          'version': (self._version, 0),
+                          'known_command': (self._known_command, 1),
+                          'list_commands': (self._list_commands, 0),
+                          'quit': (self._quit, 0),
+                          'boardsize': (self._boardsize, 1),
+                          'clear_board': (self._clear_board, 0),
+                          'komi': (self._komi, 1),
+                          'play': (self._play, 2),
+                          'genmove': (self._genmove, 1),
+                          'undo': (self._undo, 0),
+                          'final_score': (self._final_score, 0),
+                          'showboard': (self._showboard, 0)
+                         }
+
+    def parse_vertex(self, vertex):
+        '''
+        Return the (y, x) coordinate of the vertex, or None for pass
+        '''
+        vertex = vertex.upper()
+        if vertex == 'PASS':
+            return None
+        board_size = self.game.board_size
+        x = COLUMNS.find(vertex[:1])
+        if not vertex[1:].isdigit() or not 0 <= x < board_size:
+            raise InvalidInputException(f'invalid coordinate: {vertex}')
+        y = board_size - int(vertex[1:])
+        if not 0 <= y < board_size:
+            raise InvalidInputException(f'invalid coordinate: {vertex}')
+        return y, x
+
+    def format_vertex(self, move):
+        '''
+        Return the vertex of the (y, x) coordinate, or "pass" for None
+        '''
+        if move is None:
+            return 'pass'
+        y, x = move
+        return f'{COLUMNS[x]}{self.game.board_size - y}'
+
+    def _parse_color(self, color):
+        stone = COLORS.get(color.lower())
+        if stone is None:
+            raise InvalidInputException(f'invalid color: {color}')
+        return stone
+
+    def execute(self, line):
+        '''
+        Execute one command line and return the response, ending with an empty line,
+        or None if the line has no command
+        '''
+        args = line.split('#', 1)[0].split()
+        if not args:
+            return None
+        command_id = ''
+        if args[0].isdigit():
+            command_id = args.pop(0)
+        command = self._commands.get(args[0]) if args else None
+        if command is None:
+            return f'?{command_id} unknown command\n\n'
+        handler, num_args = command
+        if len(args) != num_args + 1:
+            return f'?{command_id} syntax error\n\n'
+        try:
+            response = handler(*args[1:])
+        except (SelfDestructException, KoException):
+            return f'?{command_id} illegal move\n\n'
+        except InvalidInputException as e:
+            return f'?{command_id} {e}\n\n'
+        except ValueError:
+            return f'?{command_id} syntax error\n\n'
+        if response:
+            return f'={command_id} {response}\n\n'
+        return f'={command_id}\n\n'
+
+    def run(self, infile=None, outfile=None):
+        '''
+        Execute the commands read from the binary file `infile` (stdin by default) and
+        write the responses to `outfile` (stdout by default), until quit or the end of
+        the input. Every read returns whatever input is available, so a command typed
+        alone is answered at once, and commands piped together are answered with one write
+        '''
+        if infile is None:
+            infile = sys.stdin.buffer
+        if outfile is None:
+            outfile = sys.stdout.buffer
+        read = getattr(infile, 'read1', infile.read)
+        execute = self.execute
+        pending = b''
+        while not self.quit:
+            data = read(CHUNK_SIZE)
+            lines = (pending + data).split(b'\n')
+            pending = lines.pop() if data else b''
+            responses = []
+            for line in lines:
+                response = execute(line.decode(errors='replace'))
+                if response is not None:
+                    responses.append(response)
+                if self.quit:
+                    break
+            if responses:
+                outfile.write(''.join(responses).encode())
+                outfile.flush()
+            if not data:
+                break
+
+    def _protocol_version(self):
+        return '2'
+
+    def _name(self):
+        return 'go'
+
+    def _version(self):
+        return ''
+
+    def _known_command(self, command):
+        return 'true' if command in self._commands else 'false'
+
+    def _list_commands(self):
+        return '\n'.join(self._commands)
+
+    def _quit(self):
+        self.quit = True
+
+    def _boardsize(self, size):
+        '''
+        Start a game on a board of the size, which is cleared in place if the size
+        is unchanged
+        '''
+        size = int(size)
+        if not 2 <= size <= len(COLUMNS):
+            raise InvalidInputException('unacceptable size')
+        if size == self.game.board_size:
+            self.game.clear_board()
+            return
+        self.config = dict(self.config, board_size=size)
+        self.game = Game(self.config)
+        self.opponent = create_opponent(self.config)
+
+    def _clear_board(self):
+        self.game.clear_board()
+
+    def _komi(self, komi):
+        self.komi = float(komi)
+
+    def _play(self, color, vertex):
+        stone = self._parse_color(color)
+        move = self.parse_vertex(vertex)
+        if move is None:
+            self.game.make_move(stone)
+            return
+        if self.game.board[move] != Stone.EMPTY:
+            raise InvalidInputException('illegal move')
+        self.game.make_move(stone, *move)
+
+    def _genmove(self, color):
+        stone = self._parse_color(color)
+        if self.opponent is not None:
+            move = self.opponent.get_move(self.game, stone)
+        else:
+            move = random_policy(self.game, stone, self.rng)
+        if move is None:
+            self.game.make_move(stone)
+        else:
+            self.game.make_move(stone, *move)
+        return self.format_vertex(move)
+
+    def _undo(self):
+        if not self.game._move_stack:
+            raise InvalidInputException('cannot undo')
+        self.game.unmake_move()
+
+    def _final_score(self):
+        scores = self.game.get_scores()
+        margin = scores[Stone.BLACK] - scores[Stone.WHITE] - self.komi
+        if margin > 0:
+            return f'B+{margin:g}'
+        if margin < 0:
+            return f'W+{-margin:g}'
+        return '0'
+
+    def _showboard(self):
+        return '\n' + self.game.board._render_text().strip('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play Go over the Go Text Protocol')
+    parser.add_argument('--seed', type=int, help='seed of the random moves of genmove')
+    args = parser.parse_args()
+
+    import yaml
+    with open('config.yaml', 'r') as f:
+        config = yaml.safe_load(f)
+    GTPEngine(config, seed=args.seed).run()
+
+
+if __name__ == '__main__':
+    main()
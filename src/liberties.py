@@ -0,0 +1,72 @@
+import numpy as np
+from src.utils import iter_bits
+
+# liberty counts above this are stored as this, to fit in int8
+MAX_LIBERTIES = 127
+
+# masks of at most this many points are written point by point
+SMALL_MASK = 8
+
+class LibertyPlane(object):
+    '''
+    Liberty count of the group of every stone as an int8 plane, and 0 at empty points.
+    The group manager rewrites the counts of the groups changed by every move only,
+    so the liberties and ataris of the whole board are read from one array
+    '''
+    def __init__(self, board_size):
+
+        # dimension of the board, and the number of bytes of a mask of all its points
+        self.board_size = board_size
+        self._num_bytes = (board_size * board_size + 7) // 8
+
+        # counts indexed by y * board_size + x
+        self._counts = np.zeros(board_size * board_size, dtype=np.int8)
+
+        # read-only 2D view of the counts
+        self.plane = self._counts.reshape(board_size, board_size)
+        self.plane.flags.writeable = False
+
+    def _points(self, mask):
+        '''
+        Return the boolean array of the points of the bitmask, indexed by y * board_size + x
+        '''
+        buffer = np.frombuffer(mask.to_bytes(self._num_bytes, 'little'), dtype=np.uint8)
+        return np.unpackbits(buffer, count=len(self._counts), bitorder='little').view(bool)
+
+    def _fill(self, mask, count):
+        '''
+        Write the count at the points of the bitmask. Small masks are written point by
+        point, which is cheaper than unpacking the whole mask
+        '''
+        if mask.bit_count() <= SMALL_MASK:
+            counts = self._counts
+            for idx in iter_bits(mask):
+                counts[idx] = count
+        else:
+            self._counts[self._points(mask)] = count
+
+    def set_group(self, group):
+        '''
+        Write the liberty count of the group at its stones
+        '''
+        self._fill(group.stone_mask, min(group.liberty_mask.bit_count(), MAX_LIBERTIES))
+
+    def clear(self, mask):
+        '''
+        Write 0 at the points of the bitmask, which are empty
+        '''
+        self._fill(mask, 0)
+
+    def reset(self):
+        '''
+        Write 0 at every point
+        '''
+        self._counts.fill(0)
+
+    def copy(self):
+        '''
+        Return an independent copy
+        '''
+        liberties = LibertyPlane(self.board_size)
+        liberties._counts[:] = self._counts
+        return liberties
@@ -0,0 +1,200 @@
+import math
+import random
+import time
+from src.utils import Stone, PASS, get_opposite_stone
+from src.playout import Playout
+
+class Node(object):
+    '''
+    Node of the search tree, reached by `stone` playing `move` from its parent
+    '''
+    __slots__ = ('move', 'stone', 'parent', 'children', 'untried', 'visits', 'wins', 'hash')
+
+    def __init__(self, move, stone, parent, game_hash):
+
+        # flat index of the move leading to this node, or PASS
+        self.move = move
+
+        # stone that played the move
+        self.stone = stone
+
+        # parent node, None for the root
+        self.parent = parent
+
+        # expanded child nodes
+        self.children = []
+
+        # legal moves that are not expanded yet, or None before the node is first visited
+        self.untried = None
+
+        # number of playouts through this node, and the wins of `stone` among them
+        self.visits = 0
+        self.wins = 0.
+
+        # zobrist hash of the position at this node
+        self.hash = game_hash
+
+
+class MCTS(object):
+    '''
+    Monte Carlo Tree Search player with UCT selection and random playouts.
+    The tree is searched by making and unmaking moves in the game itself, and the
+    subtree of the position reached is kept from one call to get_move to the next
+    '''
+    def __init__(self, board_size, playouts=1000, seconds=None, exploration=1.4, seed=None):
+
+        # dimension of the board
+        self.board_size = board_size
+
+        # default budget of every move, in playouts or wall-clock seconds
+        self.playouts = playouts
+        self.seconds = seconds
+
+        # exploration constant of UCT
+        self.exploration = exploration
+
+        # source of randomness of the playouts and expansions
+        self.rng = random.Random(seed)
+
+        # random playout driver
+        self._playout = Playout(board_size)
+
+        # root of the tree, kept between moves
+        self.root = None
+
+        # number of nodes created and playouts run by the last search, and its duration
+        self.num_nodes = 0
+        self.num_playouts = 0
+        self.search_time = 0.
+
+    @property
+    def nodes_per_sec(self):
+        '''
+        Return the number of nodes created per second by the last search
+        '''
+        if not self.search_time:
+            return 0.
+        return self.num_nodes / self.search_time
+
+    def _find_root(self, game, stone):
+        '''
+        Return the node of the current position with the stone to play, searching the
+        previous root and its children so that their subtree is reused
+        '''
+        if self.root is not None:
+            for node in [self.root] + self.root.children:
+                if node.hash == game.hash and get_opposite_stone(node.stone) == stone:
+                    node.parent = None
+                    return node
+        return Node(None, get_opposite_stone(stone), None, game.hash)
+
+    def _expand_moves(self, game, stone):
+        '''
+        Return the moves to expand in a random order: every legal move that does not fill
+        one of the stone's own eyes, and PASS
+        '''
+        board_size = self.board_size
+        moves = [int(y * board_size + x) for y, x in zip(*game.legal_moves(stone).nonzero())
+                 if not game.gm.is_eye(stone, y, x)]
+        moves.append(PASS)
+        self.rng.shuffle(moves)
+        return moves
+
+    def _select_child(self, node):
+        '''
+        Return the child with the highest upper confidence bound
+        '''
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        best = None
+        best_value = -1.
+        for child in node.children:
+            value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best = child
+                best_value = value
+        return best
+
+    def _play(self, game, stone, move):
+        '''
+        Play the flat move index with make_move
+        '''
+        if move == PASS:
+            game.make_move(stone)
+        else:
+            game.make_move(stone, *divmod(move, self.board_size))
+
+    def _search(self, game, root):
+        '''
+        Run one iteration of selection, expansion, playout and backpropagation from the root,
+        leaving the game as it was
+        '''
+        depth = len(game._move_stack)
+        node = root
+
+        # selection
+        while node.untried is not None and not node.untried and node.children:
+            node = self._select_child(node)
+            self._play(game, node.stone, node.move)
+
+        # expansion
+        stone = get_opposite_stone(node.stone)
+        if not game.is_over():
+            if node.untried is None:
+                node.untried = self._expand_moves(game, stone)
+            if node.untried:
+                move = node.untried.pop()
+                self._play(game, stone, move)
+                child = Node(move, stone, node, game.hash)
+                node.children.append(child)
+                self.num_nodes += 1
+                node = child
+                stone = get_opposite_stone(stone)
+
+        # playout
+        scores = game.get_scores() if game.is_over() else self._playout.run(game, self.rng, stone)
+        self.num_playouts += 1
+        while len(game._move_stack) > depth:
+            game.unmake_move()
+
+        # backpropagation
+        black, white = scores[Stone.BLACK], scores[Stone.WHITE]
+        result = {Stone.BLACK: 1. if black > white else 0.5 if black == white else 0.,
+                  Stone.WHITE: 1. if white > black else 0.5 if black == white else 0.}
+        while node is not None:
+            node.visits += 1
+            node.wins += result[node.stone]
+            node = node.parent
+
+    def get_move(self, game, stone, playouts=None, seconds=None):
+        '''
+        Search the position of the game with the stone to play, within a budget of playouts
+        or wall-clock seconds (the defaults of the player if neither is given).
+        Return the (y, x) coordinate of the most visited move, or None to pass.
+        The game is left unchanged
+        '''
+        if playouts is None and seconds is None:
+            playouts, seconds = self.playouts, self.seconds
+        root = self.root = self._find_root(game, stone)
+        self.num_nodes = 0
+        self.num_playouts = 0
+
+        start = time.perf_counter()
+        deadline = start + seconds if seconds is not None else None
+        while True:
+            if playouts is not None and self.num_playouts >= playouts:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._search(game, root)
+        self.search_time = time.perf_counter() - start
+
+        if not root.children:
+            return None
+        best = max(root.children, key=lambda child: child.visits)
+
+        # keep the subtree of the chosen move for the next search
+        self.root = best
+        if best.move == PASS:
+            return None
+        return divmod(best.move, self.board_size)
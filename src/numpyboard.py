@@ -0,0 +1,113 @@
+import numpy as np
+from src.board import BoardMixin
+from src.utils import Stone, get_neighbor_table, get_zobrist_table
+from src.symmetry import get_packed_zobrist_table
+from src.scoring import count_territory
+
+# smallest board size where the vectorized region labelling scores a single board faster
+# than the depth first search, which wins on small boards (about 50 us against 90 us on
+# 9x9). Batches of boards are always faster with count_territory
+VECTORIZED_TERRITORY_SIZE = 17
+
+class Board(BoardMixin, np.ndarray):
+    '''
+    Instance of a 2D grid board extended from np.ndarray
+    '''
+    def __new__(cls, config={}):
+        '''
+        Standard procedure for subclassing np.ndarray
+        '''
+        # dimension of the board
+        board_size = config['board_size']
+        shape = (board_size, board_size)
+        obj = super(Board, cls).__new__(cls, shape, dtype=int)
+
+        obj.board_size = board_size
+
+        # neighbor coordinates of every point, indexed by y * board_size + x
+        obj.neighbor_table = get_neighbor_table(board_size)
+
+        # zobrist keys, and the zobrist hash of the position (0 for an empty board)
+        obj.zobrist = get_zobrist_table(board_size)
+        obj.zobrist_hash = 0
+
+        # packed zobrist keys and hashes of the symmetric variants, if kept up to date
+        obj.packed_zobrist = (get_packed_zobrist_table(board_size)
+                              if config.get('canonical_hash', False) else None)
+        obj.packed_hash = 0
+
+        # string to display as a black stone
+        obj.black_stone_render = config['black_stone']
+
+        # string to display as a white stone
+        obj.white_stone_render = config['white_stone']
+
+        # fill board with empty slots
+        obj.fill(Stone.EMPTY)
+
+        return obj
+
+    def __array_finalize__(self, obj):
+        '''
+        Standard procedure for subclassing np.ndarray
+        '''
+        if obj is None:
+            return
+        self.board_size = getattr(obj, 'board_size')
+        self.neighbor_table = getattr(obj, 'neighbor_table')
+        self.zobrist = getattr(obj, 'zobrist')
+        self.zobrist_hash = getattr(obj, 'zobrist_hash')
+        self.packed_zobrist = getattr(obj, 'packed_zobrist')
+        self.packed_hash = getattr(obj, 'packed_hash')
+        self.black_stone_render = getattr(obj, 'black_stone_render')
+        self.white_stone_render = getattr(obj, 'white_stone_render')
+
+    def place_stone(self, stone, y, x):
+        '''
+        Place a stone at the specified coordinate
+        '''
+        idx = y * self.board_size + x
+        previous = self[y, x]
+        self.zobrist_hash ^= self.zobrist[previous][idx] ^ self.zobrist[stone][idx]
+        if self.packed_zobrist is not None:
+            self.packed_hash ^= self.packed_zobrist[previous][idx] ^ self.packed_zobrist[stone][idx]
+        self[y, x] = stone
+
+    def remove_stone(self, y, x):
+        '''
+        Remove the stone at the specified coordinate
+        '''
+        idx = y * self.board_size + x
+        previous = self[y, x]
+        self.zobrist_hash ^= self.zobrist[previous][idx]
+        if self.packed_zobrist is not None:
+            self.packed_hash ^= self.packed_zobrist[previous][idx]
+        self[y, x] = Stone.EMPTY
+
+    def clear(self):
+        '''
+        Remove every stone, in place
+        '''
+        self.fill(Stone.EMPTY)
+        self.zobrist_hash = 0
+        self.packed_hash = 0
+
+    def get_territory(self):
+        '''
+        Return the number of empty points that are territory of black and white,
+        labelling the empty regions with vectorized passes over the whole board on large
+        boards, and with a depth first search on boards smaller than
+        VECTORIZED_TERRITORY_SIZE
+        '''
+        if self.board_size < VECTORIZED_TERRITORY_SIZE:
+            return self.get_territory_dfs()
+        black, white = count_territory(self.to_array())
+        return {Stone.BLACK: int(black),
+                Stone.WHITE: int(white)
+               }
+
+    def to_array(self):
+        '''
+        Return the stones as a plain 2D np.ndarray
+        '''
+        return self.view(np.ndarray)
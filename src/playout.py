@@ -0,0 +1,127 @@
+from src.utils import Stone, get_opposite_stone, iter_bits
+
+class Playout(object):
+    '''
+    Play random games to the end for Monte Carlo evaluation.
+    The empty points are kept in a buffer allocated once per board size and reused
+    by every playout, so choosing a move neither allocates nor scans the board
+    '''
+    def __init__(self, board_size):
+
+        # dimension of the board
+        self.board_size = board_size
+
+        # flat indices of the empty points in the first `_num_empty` slots,
+        # and the slot of every flat index in `_empty`
+        self._empty = list(range(board_size * board_size))
+        self._slot = list(range(board_size * board_size))
+        self._num_empty = 0
+
+    def _reset_empty(self, board):
+        '''
+        Fill the buffer of empty points from the board
+        '''
+        board_size = self.board_size
+        empty = self._empty
+        slot = self._slot
+        num_empty = 0
+        for y in range(board_size):
+            for x in range(board_size):
+                if board[y, x] == Stone.EMPTY:
+                    idx = y * board_size + x
+                    empty[num_empty] = idx
+                    slot[idx] = num_empty
+                    num_empty += 1
+        self._num_empty = num_empty
+
+    def _swap(self, i, j):
+        '''
+        Swap two slots of the buffer of empty points
+        '''
+        empty = self._empty
+        slot = self._slot
+        a, b = empty[i], empty[j]
+        empty[i], empty[j] = b, a
+        slot[a], slot[b] = j, i
+
+    def _add_empty(self, indices):
+        '''
+        Add the points of the flat indices to the buffer of empty points
+        '''
+        empty = self._empty
+        slot = self._slot
+        num_empty = self._num_empty
+        for idx in indices:
+            empty[num_empty] = idx
+            slot[idx] = num_empty
+            num_empty += 1
+        self._num_empty = num_empty
+
+    def _select_move(self, game, stone, rng):
+        '''
+        Return the flat index of a uniformly random legal move for the stone that does not
+        fill one of its own eyes, or None if there is none. Rejected points are swapped
+        to the end of the buffer so every point is tried at most once
+        '''
+        gm = game.gm
+        board_size = self.board_size
+        empty = self._empty
+        untried = self._num_empty
+        while untried:
+            i = rng.randrange(untried)
+            idx = empty[i]
+            y, x = divmod(idx, board_size)
+            if not gm.is_eye(stone, y, x) and gm.is_legal(stone, y, x):
+                return idx
+            untried -= 1
+            self._swap(i, untried)
+        return None
+
+    def run(self, game, rng, stone=Stone.BLACK, max_moves=None):
+        '''
+        Play uniformly random moves in the game, starting with the stone, until
+        two consecutive passes or `max_moves` moves (3 * board_size ** 2 by default).
+        A player passes when every legal move would fill one of its own eyes.
+        The moves are played with Game.make_move, so they can be taken back with unmake_move.
+        Return the scores of the finished game, as Game.get_scores
+        '''
+        board_size = self.board_size
+        if max_moves is None:
+            max_moves = 3 * board_size * board_size
+        self._reset_empty(game.board)
+
+        for _ in range(max_moves):
+            if game.is_over():
+                break
+            idx = self._select_move(game, stone, rng)
+            if idx is None:
+                game.make_move(stone)
+            else:
+                y, x = divmod(idx, board_size)
+                game.make_move(stone, y, x)
+                delta = game._move_stack[-1][0]
+                self._num_empty -= 1
+                self._swap(self._slot[idx], self._num_empty)
+                if delta.captured:
+                    # in increasing order, as the order of the captured groups is arbitrary
+                    captured = 0
+                    for g in delta.captured:
+                        captured |= g.stone_mask
+                    self._add_empty(iter_bits(captured))
+            stone = get_opposite_stone(stone)
+
+        return game.get_scores()
+
+
+# playout drivers shared by all games of the same size
+_playouts = {}
+
+def playout(game, rng, stone=Stone.BLACK, max_moves=None):
+    '''
+    Play the game to the end with uniformly random moves from the seeded random.Random `rng`,
+    starting with the stone, and return the scores. The game is modified in place
+    '''
+    driver = _playouts.get(game.board_size)
+    if driver is None:
+        driver = _playouts[game.board_size] = Playout(game.board_size)
+    return driver.run(game, rng, stone=stone, max_moves=max_moves)
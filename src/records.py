@@ -0,0 +1,176 @@
+import struct
+import numpy as np
+from src.game import Game
+from src.utils import Stone, PASS
+
+# file layout: header, then the moves of every game as little-endian uint16 flat indices
+# y * board_size + x (black first, then alternating), then a uint64 index of the offset
+# of every game in the moves, followed by the total number of moves
+MAGIC = b'GORC'
+VERSION = 1
+_HEADER = struct.Struct('<4sHHHHQQ')
+HEADER_SIZE = 32
+
+# uint16 value of a pass
+PASS_MOVE = 0xFFFF
+
+# flags of the rules in the header
+_SELF_DESTRUCT = 1
+_SUPERKO = 2
+
+class RecordWriter(object):
+    '''
+    Write games to a binary record file, one game at a time. Only the offsets of the
+    games are kept in memory until the file is closed
+    '''
+    def __init__(self, path, board_size, enable_self_destruct=False, superko=False):
+
+        # dimension of the board, and the rules of the games
+        self.board_size = board_size
+        self.enable_self_destruct = enable_self_destruct
+        self.superko = superko
+
+        # offset of every game in the moves, and the number of moves written so far
+        self._offsets = [0]
+
+        self._file = open(path, 'wb')
+        self._file.write(b'\0' * HEADER_SIZE)
+
+    def write_game(self, moves):
+        '''
+        Append a game from its flat move indices, with PASS for a pass
+        '''
+        moves = np.asarray(moves, dtype=np.int64)
+        packed = np.where(moves == PASS, PASS_MOVE, moves).astype('<u2')
+        self._file.write(packed.tobytes())
+        self._offsets.append(self._offsets[-1] + len(moves))
+
+    def close(self):
+        '''
+        Write the index and the header, and close the file
+        '''
+        num_moves = self._offsets[-1]
+        index_offset = HEADER_SIZE + 2 * num_moves
+        padding = -index_offset % 8
+        self._file.write(b'\0' * padding)
+        self._file.write(np.asarray(self._offsets, dtype='<u8').tobytes())
+
+        flags = (_SELF_DESTRUCT if self.enable_self_destruct else 0) \
+              | (_SUPERKO if self.superko else 0)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, self.board_size, flags, 0,
+                                      len(self._offsets) - 1, index_offset + padding))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class RecordReader(object):
+    '''
+    Random access to the games of a binary record file. The moves and the index are
+    memory-mapped with numpy.memmap, so nothing is loaded until it is read
+    '''
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        magic, version, board_size, flags, _, num_games, index_offset = _HEADER.unpack(
+            header[:_HEADER.size])
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'Not a game record file: {path}')
+
+        # dimension of the board, and the rules of the games
+        self.board_size = board_size
+        self.enable_self_destruct = bool(flags & _SELF_DESTRUCT)
+        self.superko = bool(flags & _SUPERKO)
+
+        # offset of every game in the moves, followed by the number of moves
+        self.offsets = np.memmap(path, dtype='<u8', mode='r', offset=index_offset,
+                                 shape=(num_games + 1,))
+
+        # moves of every game, back to back
+        num_moves = int(self.offsets[-1])
+        self.moves = np.memmap(path, dtype='<u2', mode='r', offset=HEADER_SIZE,
+                               shape=(num_moves,)) if num_moves else np.zeros(0, dtype='<u2')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        '''
+        Return the uint16 moves of game i as a view of the file, with PASS_MOVE for a pass
+        '''
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f'Game index out of range: {i}')
+        return self.moves[int(self.offsets[i]):int(self.offsets[i + 1])]
+
+    @property
+    def num_moves(self):
+        '''
+        Return the total number of moves of all games
+        '''
+        return len(self.moves)
+
+    def make_config(self, config=None):
+        '''
+        Return a Game config with the board size and rules of the file, on top of `config`
+        '''
+        return dict({'black_stone': 'b', 'white_stone': 'w'}, **(config or {}),
+                    board_size=self.board_size,
+                    enable_self_destruct=self.enable_self_destruct,
+                    superko=self.superko)
+
+    def _replay(self, game, i, num_moves=None):
+        '''
+        Replay the first `num_moves` moves of game i into the game, yielding after every move
+        '''
+        board_size = self.board_size
+        stone = Stone.BLACK
+        for move in self[i][:num_moves].tolist():
+            if move == PASS_MOVE:
+                game.pass_turn()
+            elif stone == Stone.BLACK:
+                game.place_black(*divmod(move, board_size))
+            else:
+                game.place_white(*divmod(move, board_size))
+            stone = Stone.WHITE if stone == Stone.BLACK else Stone.BLACK
+            yield
+
+    def to_game(self, i, num_moves=None, config=None):
+        '''
+        Return a Game with the position after the first `num_moves` moves of game i
+        (all of them by default)
+        '''
+        game = Game(self.make_config(config))
+        for _ in self._replay(game, i, num_moves):
+            pass
+        return game
+
+    def iter_boards(self, i, config=None):
+        '''
+        Iterate over the positions of game i after every move, as 2D np.ndarray copies
+        '''
+        game = Game(self.make_config(config))
+        for _ in self._replay(game, i):
+            yield game.board.to_array().copy()
+
+    def locate(self, move_index):
+        '''
+        Return the (game, move number) of a position given by its index among the moves
+        of all games, where move number n is the position after the first n + 1 moves
+        '''
+        i = int(np.searchsorted(self.offsets, move_index, side='right')) - 1
+        return i, move_index - int(self.offsets[i])
+
+    def sample(self, rng, config=None):
+        '''
+        Return a Game with a position drawn uniformly among the positions of all games,
+        using the random.Random `rng`
+        '''
+        i, n = self.locate(rng.randrange(self.num_moves))
+        return self.to_game(i, n + 1, config)
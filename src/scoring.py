@@ -0,0 +1,85 @@
+import numpy as np
+from src.utils import Stone, get_neighbor_table
+
+# neighbor index arrays shared by all boards of the same size
+_neighbor_indices = {}
+
+def get_neighbor_index(board_size):
+    '''
+    Return a (4, board_size * board_size) array of the flat neighbor indices of
+    every point. Neighbors beyond the edge of the board point at the point itself
+    '''
+    index = _neighbor_indices.get(board_size)
+    if index is None:
+        n = board_size * board_size
+        index = np.tile(np.arange(n), (4, 1))
+        for idx, coords in enumerate(get_neighbor_table(board_size)):
+            for i, (ly, lx) in enumerate(coords):
+                index[i, idx] = ly * board_size + lx
+        index.flags.writeable = False
+        _neighbor_indices[board_size] = index
+    return index
+
+def label_regions(mask, board_size):
+    '''
+    Label the connected regions of a flattened (..., board_size * board_size) boolean mask.
+    Every point of a region is labelled with the smallest flat index in that region,
+    and points outside the mask are labelled board_size * board_size.
+    Labels are propagated from neighbors in whole-array passes, with pointer jumping
+    so that long regions converge in few passes
+    '''
+    n = board_size * board_size
+    neighbor_index = get_neighbor_index(board_size)
+    dtype = np.int16 if n < 2 ** 15 else np.int32
+
+    # the labels carry one extra slot holding n, so that pointer jumping from a
+    # point outside the mask stays outside the mask
+    extended_mask = np.zeros(mask.shape[:-1] + (n + 1,), dtype=bool)
+    extended_mask[..., :n] = mask
+    labels = np.where(extended_mask, np.arange(n + 1, dtype=dtype), dtype(n))
+    mask = extended_mask[..., :n]
+
+    while True:
+        new_labels = labels.copy()
+        core = new_labels[..., :n]
+        for d in range(4):
+            np.minimum(core, labels[..., neighbor_index[d]], out=core, where=mask)
+
+        # point every label at the label of its label
+        new_labels = np.take_along_axis(new_labels, new_labels, axis=-1)
+
+        if np.array_equal(new_labels, labels):
+            return labels[..., :n]
+        labels = new_labels
+
+def count_territory(stones):
+    '''
+    Return the number of empty points that are territory of black and white for
+    a (..., board_size, board_size) array of stones, as two arrays of shape (...).
+    An empty region is territory for a player if it only borders stones of that player
+    '''
+    board_size = stones.shape[-1]
+    n = board_size * board_size
+    batch_shape = stones.shape[:-2]
+    flat = stones.reshape(-1, n)
+    num_boards = flat.shape[0]
+
+    empty = flat == Stone.EMPTY
+    labels = label_regions(empty, board_size)
+
+    # colours bordering each point
+    neighbor_stones = flat[:, get_neighbor_index(board_size)]
+    touches_black = (neighbor_stones == Stone.BLACK).any(axis=1)
+    touches_white = (neighbor_stones == Stone.WHITE).any(axis=1)
+
+    # gather per region, offsetting the labels of each board
+    labels = labels + np.arange(num_boards)[:, None] * n
+    sizes = np.bincount(labels[empty], minlength=num_boards * n)
+    black = np.zeros(num_boards * n, dtype=bool)
+    black[labels[empty & touches_black]] = True
+    white = np.zeros(num_boards * n, dtype=bool)
+    white[labels[empty & touches_white]] = True
+
+    black_territory = np.where(black & ~white, sizes, 0).reshape(num_boards, n).sum(axis=1)
+    white_territory = np.where(white & ~black, sizes, 0).reshape(num_boards, n).sum(axis=1)
+    return black_territory.reshape(batch_shape), white_territory.reshape(batch_shape)
@@ -0,0 +1,117 @@
+import json
+import multiprocessing
+import random
+import threading
+from src.game import Game
+from src.utils import Stone, PASS, get_opposite_stone
+
+def random_policy(game, stone, rng):
+    '''
+    Move policy choosing a uniformly random legal move that does not fill one of the
+    stone's own eyes. Return the (y, x) coordinate, or None to pass
+    '''
+    moves = [(int(y), int(x)) for y, x in zip(*game.legal_moves(stone).nonzero())
+             if not game.gm.is_eye(stone, y, x)]
+    if not moves:
+        return None
+    return rng.choice(moves)
+
+def play_game(config, policy, seed, max_moves=None):
+    '''
+    Play one game where both players follow the policy, seeded with `seed`, until two
+    consecutive passes or `max_moves` moves (3 * board_size ** 2 by default).
+    Return the game record as a dictionary
+    '''
+    rng = random.Random(seed)
+    game = Game(config)
+    board_size = game.board_size
+    if max_moves is None:
+        max_moves = 3 * board_size * board_size
+
+    moves = []
+    stone = Stone.BLACK
+    while not game.is_over() and len(moves) < max_moves:
+        move = policy(game, stone, rng)
+        if move is None:
+            game.pass_turn()
+            moves.append(PASS)
+        else:
+            game.play(stone, *move)
+            moves.append(move[0] * board_size + move[1])
+        stone = get_opposite_stone(stone)
+
+    scores = game.get_scores()
+    return {'seed': seed,
+            'board_size': board_size,
+            'moves': moves,
+            'black_score': scores[Stone.BLACK],
+            'white_score': scores[Stone.WHITE],
+            'num_black_captured': game.num_black_captured,
+            'num_white_captured': game.num_white_captured
+           }
+
+# settings of the self-play worker process, set by _init_worker
+_worker = {}
+
+def _init_worker(config, policy, max_moves):
+    _worker['config'] = config
+    _worker['policy'] = policy
+    _worker['max_moves'] = max_moves
+
+def _play_worker_game(seed):
+    return play_game(_worker['config'], _worker['policy'], seed, _worker['max_moves'])
+
+def run_selfplay(config, num_games, path, policy=random_policy, processes=None,
+                 batch_size=64, max_pending=None, seed=0, max_moves=None):
+    '''
+    Play `num_games` headless games over a pool of `processes` worker processes
+    (one per core by default), each worker playing one game at a time.
+    Game i is seeded with seed + i. The finished game records are appended to `path`
+    as JSON lines, `batch_size` records at a time, in the order they finish.
+    At most `max_pending` games (4 per worker by default) are queued or unread at once,
+    so workers wait for the parent instead of piling up records in memory.
+    The policy must be picklable, e.g. a module level function. An exception raised by a
+    worker is raised here once the pool is terminated. Return the number of games
+    '''
+    processes = processes or multiprocessing.cpu_count()
+    max_pending = max_pending or 4 * processes
+    pending = threading.BoundedSemaphore(max_pending)
+
+    # set when the parent stops reading results, so that the pool's task thread stops
+    # waiting in seeds() and the pool can be terminated
+    stopped = threading.Event()
+
+    def seeds():
+        for i in range(num_games):
+            while not pending.acquire(timeout=0.1):
+                if stopped.is_set():
+                    return
+            yield seed + i
+
+    num_written = 0
+    with open(path, 'a') as f, multiprocessing.Pool(
+            processes, initializer=_init_worker, initargs=(config, policy, max_moves)) as pool:
+        batch = []
+        try:
+            for record in pool.imap_unordered(_play_worker_game, seeds()):
+                batch.append(json.dumps(record))
+                pending.release()
+                if len(batch) >= batch_size:
+                    f.write('\n'.join(batch) + '\n')
+                    num_written += len(batch)
+                    batch = []
+        finally:
+            stopped.set()
+        if batch:
+            f.write('\n'.join(batch) + '\n')
+            num_written += len(batch)
+    return num_written
+
+def read_records(path):
+    '''
+    Iterate over the game records of a self-play file
+    '''
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
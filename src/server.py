@@ -0,0 +1,313 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from src.game import Game, GameUI
+from src.utils import Stone, PASS
+from src.exceptions import SelfDestructException, KoException, InvalidInputException
+
+class HostedGame(object):
+    '''
+    A game hosted by the server, with its moves so it can be evicted and replayed
+    '''
+    __slots__ = ('game', 'moves', 'last_used')
+
+    def __init__(self, game, moves=None):
+
+        # the game object
+        self.game = game
+
+        # flat index y * board_size + x of every move, or PASS
+        self.moves = moves if moves is not None else []
+
+        # time.monotonic() of the last command on the game
+        self.last_used = time.monotonic()
+
+    @property
+    def turn(self):
+        '''
+        Return the stone to play, as black and white alternate from the first move
+        '''
+        return Stone.BLACK if len(self.moves) % 2 == 0 else Stone.WHITE
+
+
+class GameServer(object):
+    '''
+    Registry of the hosted games, executing the line-based commands of the clients
+    (see the README) and pushing an update to the clients that joined a game after
+    every move. Games idle for `idle_seconds` are evicted to `evict_dir` as their list
+    of moves, and replayed the next time they are used
+    '''
+    def __init__(self, config, evict_dir=None, idle_seconds=300.):
+
+        # config of every new game
+        self.config = config
+
+        # directory of the evicted games, and the idle time after which a game is evicted
+        self.evict_dir = evict_dir
+        self.idle_seconds = idle_seconds
+
+        # games in memory, and ids of the games evicted to disk, by id
+        self.games = {}
+        self.evicted = set()
+
+        # stream writers of the clients that joined every game, by id
+        self._subscribers = {}
+
+        # id of the next new game
+        self._next_id = 1
+
+        # tasks serving the connected clients
+        self._client_tasks = set()
+
+        self._server = None
+        self._evict_task = None
+
+    def _evict_path(self, game_id):
+        return os.path.join(self.evict_dir, f'{game_id}.json')
+
+    def new_game(self):
+        '''
+        Create a game and return its id
+        '''
+        game_id = str(self._next_id)
+        self._next_id += 1
+        self.games[game_id] = HostedGame(Game(self.config))
+        return game_id
+
+    def get_game(self, game_id):
+        '''
+        Return the hosted game of the id, replaying it from disk if it was evicted
+        '''
+        hosted = self.games.get(game_id)
+        if hosted is None:
+            if game_id not in self.evicted:
+                raise InvalidInputException(f'Unknown game: {game_id}')
+            hosted = self._load(game_id)
+        hosted.last_used = time.monotonic()
+        return hosted
+
+    def _load(self, game_id):
+        path = self._evict_path(game_id)
+        with open(path) as f:
+            moves = json.load(f)['moves']
+        game = Game(self.config)
+        board_size = game.board_size
+        hosted = HostedGame(game)
+        for move in moves:
+            if move == PASS:
+                game.pass_turn()
+            else:
+                game.play(hosted.turn, *divmod(move, board_size))
+            hosted.moves.append(move)
+        os.remove(path)
+        self.evicted.discard(game_id)
+        self.games[game_id] = hosted
+        return hosted
+
+    def evict_idle(self, now=None):
+        '''
+        Write the games idle for at least idle_seconds to evict_dir and drop them from
+        memory. Return the number of games evicted
+        '''
+        if self.evict_dir is None:
+            return 0
+        if now is None:
+            now = time.monotonic()
+        idle = [game_id for game_id, hosted in self.games.items()
+                if now - hosted.last_used >= self.idle_seconds]
+        os.makedirs(self.evict_dir, exist_ok=True)
+        for game_id in idle:
+            hosted = self.games.pop(game_id)
+            with open(self._evict_path(game_id), 'w') as f:
+                json.dump({'board_size': hosted.game.board_size, 'moves': hosted.moves}, f)
+            self.evicted.add(game_id)
+        return len(idle)
+
+    def _render(self, hosted):
+        '''
+        Return the stone to play and the board in the format of the update messages
+        '''
+        board = hosted.game.board
+        renders = {Stone.EMPTY: '.',
+                   Stone.BLACK: board.black_stone_render,
+                   Stone.WHITE: board.white_stone_render
+                  }
+        rows = '/'.join(''.join(renders[stone] for stone in row)
+                        for row in board.to_array().tolist())
+        return f'{renders[hosted.turn]} {rows}'
+
+    def _push(self, game_id, message):
+        '''
+        Send the message to every client that joined the game
+        '''
+        data = (message + '\n').encode()
+        for writer in list(self._subscribers.get(game_id, ())):
+            if writer.is_closing():
+                self._subscribers[game_id].discard(writer)
+            else:
+                writer.write(data)
+
+    def _parse_coord(self, hosted, y, x):
+        try:
+            y = GameUI._label_to_coord(y)
+            x = GameUI._label_to_coord(x)
+        except (ValueError, TypeError):
+            # labels such as '²' pass isnumeric but are not integers, and labels of
+            # several letters such as 'AB' are not characters for ord
+            raise InvalidInputException(f'Invalid coordinate: {y} {x}')
+        if not (0 <= y < hosted.game.board_size and 0 <= x < hosted.game.board_size):
+            raise InvalidInputException(f'Out of bounds: {y} {x}')
+        return y, x
+
+    def execute(self, line, writer=None):
+        '''
+        Execute one command line of the client with the stream writer `writer`,
+        and return the reply line
+        '''
+        args = line.split()
+        if not args:
+            return 'error empty command'
+        command, args = args[0], args[1:]
+        try:
+            if command == 'new' and not args:
+                return f'ok {self.new_game()}'
+
+            if command == 'join' and len(args) == 1:
+                self.get_game(args[0])
+                self._subscribers.setdefault(args[0], set()).add(writer)
+                return 'ok'
+
+            if command == 'move' and len(args) == 3:
+                hosted = self.get_game(args[0])
+                if hosted.game.is_over():
+                    raise InvalidInputException('The game is over')
+                y, x = self._parse_coord(hosted, args[1], args[2])
+                if hosted.game.board[y, x] != Stone.EMPTY:
+                    raise InvalidInputException('The point is occupied')
+                hosted.game.play(hosted.turn, y, x)
+                hosted.moves.append(y * hosted.game.board_size + x)
+                self._push(args[0], f'update {args[0]} {args[1]} {args[2]} {self._render(hosted)}')
+                return 'ok'
+
+            if command == 'pass' and len(args) == 1:
+                hosted = self.get_game(args[0])
+                if hosted.game.is_over():
+                    raise InvalidInputException('The game is over')
+                hosted.game.pass_turn()
+                hosted.moves.append(PASS)
+                self._push(args[0], f'update {args[0]} pass {self._render(hosted)}')
+                return 'ok'
+
+            if command == 'score' and len(args) == 1:
+                scores = self.get_game(args[0]).game.get_scores()
+                return f'ok {scores[Stone.BLACK]} {scores[Stone.WHITE]}'
+
+            if command == 'board' and len(args) == 1:
+                return f'ok {self._render(self.get_game(args[0]))}'
+
+        except (SelfDestructException, KoException) as e:
+            return f'error {e}'
+        except InvalidInputException as e:
+            return f'error {str(e) or "invalid coordinate"}'
+        return f'error unknown command: {line.strip()}'
+
+    async def _handle_client(self, reader, writer):
+        task = asyncio.current_task()
+        self._client_tasks.add(task)
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as e:
+                    # the last line, without a newline, or b'' once the client is gone
+                    line = e.partial
+                except asyncio.LimitOverrunError as e:
+                    if not await self._skip_line(reader, e):
+                        break
+                    writer.write(b'error line too long\n')
+                    await writer.drain()
+                    continue
+                if not line or line.strip() == b'quit':
+                    break
+                writer.write((self.execute(line.decode(errors='replace'), writer) + '\n').encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            for subscribers in self._subscribers.values():
+                subscribers.discard(writer)
+            writer.close()
+            self._client_tasks.discard(task)
+
+    async def _skip_line(self, reader, error):
+        '''
+        Discard a line longer than the limit of the stream reader, from the
+        LimitOverrunError raised while reading it. Return False if the client is gone
+        '''
+        try:
+            while True:
+                await reader.readexactly(error.consumed)
+                try:
+                    await reader.readuntil(b'\n')
+                    return True
+                except asyncio.LimitOverrunError as e:
+                    error = e
+        except asyncio.IncompleteReadError:
+            return False
+
+    async def _evict_periodically(self):
+        while True:
+            await asyncio.sleep(self.idle_seconds / 2)
+            self.evict_idle()
+
+    async def start(self, host='127.0.0.1', port=6060):
+        '''
+        Start listening, and return the asyncio.Server. The port is chosen by the
+        system if it is 0, and read from the sockets of the returned server
+        '''
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        if self.evict_dir is not None:
+            self._evict_task = asyncio.ensure_future(self._evict_periodically())
+        return self._server
+
+    async def close(self):
+        '''
+        Stop listening, disconnect the clients and stop evicting games
+        '''
+        if self._evict_task is not None:
+            self._evict_task.cancel()
+            self._evict_task = None
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._client_tasks):
+                task.cancel()
+            await asyncio.gather(*self._client_tasks, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def serve(config, host, port, evict_dir, idle_seconds):
+    server = GameServer(config, evict_dir, idle_seconds)
+    tcp_server = await server.start(host, port)
+    async with tcp_server:
+        await tcp_server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description='Host many games of Go over TCP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6060)
+    parser.add_argument('--evict-dir', help='directory where idle games are written')
+    parser.add_argument('--idle-seconds', type=float, default=300.,
+                        help='idle time after which a game is evicted')
+    args = parser.parse_args()
+
+    import yaml
+    with open('config.yaml', 'r') as f:
+        config = yaml.safe_load(f)
+    asyncio.run(serve(config, args.host, args.port, args.evict_dir, args.idle_seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+import re
+from src.game import Game
+from src.utils import Stone
+from src.exceptions import SelfDestructException, KoException, SGFException
+
+# text up to the next parenthesis outside of property values, stopping at the "[" of a
+# value that is not complete yet
+_SKIP = re.compile(r'(?:[^()\[]+|\[[^\]\\]*(?:\\.[^\]\\]*)*\])*', re.S)
+
+# tokens of a game: node and variation delimiters, and properties with their values
+_TOKEN = re.compile(r'\s*(?:([;()])|([A-Za-z]+)\s*((?:\[(?:[^\]\\]|\\.)*\]\s*)+))', re.S)
+_VALUE = re.compile(r'\[((?:[^\]\\]|\\.)*)\]', re.S)
+
+# letters of the SGF coordinates, the index of a letter being its row or column
+_LETTERS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+class SGFGame(object):
+    '''
+    Main line of a game parsed from SGF
+    '''
+    def __init__(self, properties, setup, moves, later_setup=None):
+
+        # properties of the root node, mapping each identifier to its list of values
+        self.properties = properties
+
+        # (stone, y, x) of the stones placed with AB and AW in the root node
+        self.setup = setup
+
+        # (stone, y, x) of every move, with y and x None for a pass
+        self.moves = moves
+
+        # (number of moves, stone, y, x) of the stones placed with AB and AW in later
+        # nodes, after that number of moves
+        self.later_setup = later_setup or []
+
+    @property
+    def board_size(self):
+        '''
+        Return the board size given by the SZ property, 19 by default. Raise SGFException
+        if it is not a number from 1 to 52, or if the board is not square
+        '''
+        value = self.properties.get('SZ', ['19'])[0]
+        sizes = value.split(':')
+        if len(sizes) > 2 or not all(size.strip().isdecimal() for size in sizes):
+            raise SGFException(f'Invalid board size: {value}')
+        sizes = [int(size) for size in sizes]
+        if len(set(sizes)) > 1:
+            raise SGFException(f'Unsupported rectangular board: {value}')
+        if not 1 <= sizes[0] <= len(_LETTERS):
+            raise SGFException(f'Invalid board size: {value}')
+        return sizes[0]
+
+
+class Replay(object):
+    '''
+    Result of replaying one game of a collection
+    '''
+    def __init__(self, index, sgf_game=None, game=None, illegal=None, error=None):
+
+        # position of the game in the collection
+        self.index = index
+
+        # the parsed game, and the Game it was replayed into
+        self.sgf_game = sgf_game
+        self.game = game
+
+        # (move number, stone, y, x, reason) of every illegal move, which was skipped
+        self.illegal = illegal or []
+
+        # description of the error if the game could not be parsed
+        self.error = error
+
+    @property
+    def num_moves(self):
+        '''
+        Return the number of moves of the game
+        '''
+        return len(self.sgf_game.moves) if self.sgf_game is not None else 0
+
+
+def iter_games(f, chunk_size=1 << 20):
+    '''
+    Lazily split a collection of SGF games read from the text file object `f`,
+    yielding the text of one game at a time. Only the game being read is kept in memory.
+    A truncated last game is yielded as is, so that parsing it reports the error
+    '''
+    buffer = ''
+    # start of the game being read, and position of the next character to scan
+    start = 0
+    pos = 0
+    depth = 0
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        # the buffer is trimmed once per chunk, not after every game
+        buffer = buffer[start:] + chunk
+        pos -= start
+        start = 0
+        while True:
+            i = _SKIP.match(buffer, pos).end()
+            if i == len(buffer) or buffer[i] == '[':
+                # wait for the rest of the chunk, or of the value
+                pos = i
+                break
+            if buffer[i] == '(':
+                if depth == 0:
+                    # skip the text between games
+                    start = i
+                depth += 1
+            elif depth > 0:
+                depth -= 1
+                if depth == 0:
+                    yield buffer[start:i + 1]
+                    start = i + 1
+            pos = i + 1
+        if depth == 0:
+            start = pos
+    if depth > 0:
+        yield buffer[start:]
+
+def _to_coord(value, board_size):
+    '''
+    Convert an SGF point, letters for the column then the row, to (y, x).
+    An empty point, or "tt" on boards up to 19x19, is a pass and gives (None, None)
+    '''
+    if value == '' or value == 'tt' and board_size <= 19:
+        return None, None
+    if len(value) != 2 or value[0] not in _LETTERS or value[1] not in _LETTERS:
+        raise SGFException(f'Invalid point: {value}')
+    return _LETTERS.index(value[1]), _LETTERS.index(value[0])
+
+def _to_coords(value, board_size):
+    '''
+    Convert a value of a list of points to the list of its (y, x). A compressed point list,
+    two corners separated by ":", gives every point of the rectangle between them
+    '''
+    if ':' not in value:
+        return [_to_coord(value, board_size)]
+    first, second = value.split(':', 1)
+    (y1, x1), (y2, x2) = _to_coord(first, board_size), _to_coord(second, board_size)
+    if y1 is None or y2 is None:
+        raise SGFException(f'Invalid point list: {value}')
+    return [(y, x) for y in range(min(y1, y2), max(y1, y2) + 1)
+            for x in range(min(x1, x2), max(x1, x2) + 1)]
+
+def parse_game(text):
+    '''
+    Parse the main line of one SGF game, following the first variation at every branch
+    '''
+    nodes = []
+    depth = 0
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            raise SGFException(f'Invalid SGF at character {pos}')
+        pos = m.end()
+        delimiter, identifier, values = m.groups()
+        if delimiter == '(':
+            depth += 1
+        elif delimiter == ')':
+            # the first variation to end completes the main line
+            break
+        elif delimiter == ';':
+            if depth == 0:
+                raise SGFException('Node outside of a game')
+            nodes.append({})
+        elif identifier is not None:
+            if not nodes:
+                raise SGFException(f'Property {identifier} outside of a node')
+            nodes[-1].setdefault(identifier, []).extend(_VALUE.findall(values))
+    else:
+        raise SGFException('Unterminated game')
+    if not nodes:
+        raise SGFException('Empty game')
+
+    properties = nodes[0]
+    board_size = SGFGame(properties, [], []).board_size
+    setup = []
+    later_setup = []
+    moves = []
+    for node in nodes:
+        for identifier, stone in [('AB', Stone.BLACK), ('AW', Stone.WHITE)]:
+            for value in node.get(identifier, []):
+                for y, x in _to_coords(value, board_size):
+                    if node is properties:
+                        setup.append((stone, y, x))
+                    else:
+                        later_setup.append((len(moves), stone, y, x))
+        for identifier, stone in [('B', Stone.BLACK), ('W', Stone.WHITE)]:
+            for value in node.get(identifier, []):
+                moves.append((stone,) + _to_coord(value, board_size))
+    return SGFGame(properties, setup, moves, later_setup)
+
+def replay_game(sgf_game, config):
+    '''
+    Replay a parsed game into a new Game with the settings of `config` and the board size
+    of the game. Illegal moves are skipped. Return the game and the list of
+    (move number, stone, y, x, reason) of every illegal move, where setup stones are move 0.
+    Setup stones of nodes after the root are placed after the moves before them
+    '''
+    board_size = sgf_game.board_size
+    game = Game(dict(config, board_size=board_size))
+
+    # setup stones are numbered 0, and those of later nodes are placed in between the moves
+    later_setup = {}
+    for num_moves, stone, y, x in sgf_game.later_setup:
+        later_setup.setdefault(num_moves, []).append((0, (stone, y, x)))
+    moves = [(0, move) for move in sgf_game.setup] + later_setup.get(0, [])
+    for number, move in enumerate(sgf_game.moves, 1):
+        moves.append((number, move))
+        moves.extend(later_setup.get(number, []))
+    illegal = []
+    for number, (stone, y, x) in moves:
+        if y is None:
+            if number:
+                game.pass_turn()
+            continue
+        reason = None
+        if not (0 <= y < board_size and 0 <= x < board_size):
+            reason = 'out of bounds'
+        elif game.board[y, x] != Stone.EMPTY:
+            reason = 'occupied'
+        else:
+            try:
+                if stone == Stone.BLACK:
+                    game.place_black(y, x)
+                else:
+                    game.place_white(y, x)
+            except KoException:
+                reason = 'ko'
+            except SelfDestructException:
+                reason = 'self-destruct'
+        if reason is not None:
+            illegal.append((number, stone, y, x, reason))
+    return game, illegal
+
+def replay_stream(f, config, chunk_size=1 << 20):
+    '''
+    Lazily parse and replay every game of the SGF collection read from the text file
+    object `f`, yielding a Replay per game. Games that cannot be parsed are reported
+    in Replay.error and do not stop the stream
+    '''
+    for index, text in enumerate(iter_games(f, chunk_size)):
+        try:
+            sgf_game = parse_game(text)
+        except SGFException as e:
+            yield Replay(index, error=str(e))
+            continue
+        game, illegal = replay_game(sgf_game, config)
+        yield Replay(index, sgf_game, game, illegal)
+
+def to_sgf(board_size, moves, properties=None):
+    '''
+    Write a game as SGF text, from the (stone, y, x) of its moves, with y and x None
+    for a pass
+    '''
+    root = ''.join(f'{identifier}[{value}]' for identifier, value in
+                   dict({'GM': 1, 'FF': 4, 'SZ': board_size}, **(properties or {})).items())
+    nodes = []
+    for stone, y, x in moves:
+        point = '' if y is None else _LETTERS[x] + _LETTERS[y]
+        nodes.append(f';{"B" if stone == Stone.BLACK else "W"}[{point}]')
+    return f'(;{root}{"".join(nodes)})'
@@ -0,0 +1,104 @@
+import time
+
+class Timer(object):
+    '''
+    Count and latency histogram of one instrumented call. Bucket i counts the calls
+    that took less than 2 ** i nanoseconds (and at least 2 ** (i - 1))
+    '''
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        '''
+        Forget every recorded call
+        '''
+        # number of calls, and their total and longest duration in seconds
+        self.count = 0
+        self.total = 0.
+        self.max = 0.
+
+        # number of calls in every power of two bucket of nanoseconds
+        self.buckets = [0] * 64
+
+    def add(self, seconds):
+        '''
+        Record one call that took the given number of seconds
+        '''
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(int(seconds * 1e9).bit_length(), 63)] += 1
+
+    def snapshot(self):
+        '''
+        Return the count, total, mean and max durations in microseconds, and the histogram
+        mapping the upper bound of every non-empty bucket in nanoseconds to its count
+        '''
+        return {'count': self.count,
+                'total_us': self.total * 1e6,
+                'mean_us': self.total / self.count * 1e6 if self.count else 0.,
+                'max_us': self.max * 1e6,
+                'histogram_ns': {2 ** i: n for i, n in enumerate(self.buckets) if n}
+               }
+
+
+class Stats(object):
+    '''
+    Timers and counters filled by the instrumented methods of Game and GroupManager
+    '''
+    # names of the counters
+    COUNTERS = ('moves', 'merges', 'captures', 'stones_removed', 'liberties_restored',
+                'path_compressions')
+
+    def __init__(self):
+
+        # timers of the instrumented calls, by name
+        self.timers = {}
+
+        # event counters, by name
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def timer(self, name):
+        '''
+        Return the timer of the given name, creating it if needed
+        '''
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = Timer()
+        return timer
+
+    def timed(self, name, method):
+        '''
+        Return a wrapper of `method` recording the duration of every call in the timer
+        of the given name, including calls that raise
+        '''
+        timer = self.timer(name)
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timer.add(clock() - start)
+        return wrapper
+
+    def snapshot(self):
+        '''
+        Return a copy of every timer and counter as plain dictionaries
+        '''
+        return {'timers': {name: timer.snapshot() for name, timer in self.timers.items()},
+                'counters': dict(self.counters)
+               }
+
+    def reset(self):
+        '''
+        Clear every timer and counter
+        '''
+        for timer in self.timers.values():
+            timer.clear()
+        for name in self.counters:
+            self.counters[name] = 0
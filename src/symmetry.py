@@ -0,0 +1,130 @@
+from src.utils import get_zobrist_table
+
+# number of symmetries of the square board: 4 rotations, of the board and of its transpose
+NUM_SYMMETRIES = 8
+
+# bits of the zobrist hash of one symmetry, in the packed hashes
+LANE_BITS = 64
+LANE_MASK = (1 << LANE_BITS) - 1
+
+def _transform(k, y, x, last):
+    '''
+    Return the image of (y, x) under symmetry k, where `last` is board_size - 1.
+    Symmetry k < 4 is np.rot90(a, k), and k >= 4 is np.rot90(a.T, k - 4)
+    '''
+    if k >= 4:
+        y, x = x, y
+    for _ in range(k % 4):
+        y, x = last - x, y
+    return y, x
+
+# symmetry tables shared by all boards of the same size
+_symmetry_tables = {}
+
+def get_symmetry_table(board_size):
+    '''
+    Return the flat index of the image of every point under every symmetry, indexed by
+    [k][y * board_size + x]. The table is built once per size and shared.
+    '''
+    table = _symmetry_tables.get(board_size)
+    if table is None:
+        last = board_size - 1
+        table = []
+        for k in range(NUM_SYMMETRIES):
+            images = []
+            for y in range(board_size):
+                for x in range(board_size):
+                    ty, tx = _transform(k, y, x, last)
+                    images.append(ty * board_size + tx)
+            table.append(tuple(images))
+        table = _symmetry_tables[board_size] = tuple(table)
+    return table
+
+# packed symmetric zobrist keys shared by all boards of the same size
+_packed_zobrist_tables = {}
+
+def get_packed_zobrist_table(board_size):
+    '''
+    Return the zobrist keys of every point under the 8 symmetries packed in one integer,
+    indexed by [stone][y * board_size + x]: bits 64 * k to 64 * k + 63 hold the key of
+    the image of the point under symmetry k. XORing the packed keys of the stones updates
+    the zobrist hash of the 8 symmetric variants of the position at once.
+    The keys are built once per size and shared.
+    '''
+    table = _packed_zobrist_tables.get(board_size)
+    if table is None:
+        zobrist = get_zobrist_table(board_size)
+        symmetries = get_symmetry_table(board_size)
+        table = _packed_zobrist_tables[board_size] = tuple(
+            tuple(sum(keys[images[idx]] << (LANE_BITS * k)
+                      for k, images in enumerate(symmetries))
+                  for idx in range(board_size * board_size))
+            for keys in zobrist)
+    return table
+
+def unpack_hashes(packed):
+    '''
+    Return the zobrist hashes of the 8 symmetric variants from their packed hashes
+    '''
+    return tuple(packed >> (LANE_BITS * k) & LANE_MASK for k in range(NUM_SYMMETRIES))
+
+def canonical(packed):
+    '''
+    Return (canonical hash, symmetry) of the packed hashes of a position: the smallest
+    zobrist hash of its 8 symmetric variants, and the first symmetry giving it
+    '''
+    hashes = unpack_hashes(packed)
+    h = min(hashes)
+    return h, hashes.index(h)
+
+def symmetric_variants(stones):
+    '''
+    Return the 8 symmetric variants of the (..., board_size, board_size) np.ndarray
+    of stones, stacked on a new first axis, variant k being symmetry k of get_symmetry_table
+    '''
+    import numpy as np
+    transposed = np.swapaxes(stones, -1, -2)
+    return np.stack([np.rot90(a, k, axes=(-2, -1))
+                     for a in (stones, transposed) for k in range(4)])
+
+# (symmetric keys, sources) np.ndarrays of canonicalize shared by all batches of the same size
+_canonicalize_tables = {}
+
+def _get_canonicalize_tables(board_size):
+    '''
+    Return the uint64 keys of the images of every point, indexed by
+    [k, stone, y * board_size + x], and the flat index of the point of the position
+    at every point of variant k, indexed by [k, y * board_size + x]
+    '''
+    tables = _canonicalize_tables.get(board_size)
+    if tables is None:
+        import numpy as np
+        images = np.array(get_symmetry_table(board_size))
+        keys = np.array(get_zobrist_table(board_size), dtype=np.uint64)
+        symmetric_keys = np.ascontiguousarray(keys[:, images].transpose(1, 0, 2))
+        tables = _canonicalize_tables[board_size] = (symmetric_keys, np.argsort(images, axis=1))
+    return tables
+
+def canonicalize(stones):
+    '''
+    Canonicalize a stacked (N, board_size, board_size) np.ndarray of positions with
+    vectorized operations. Return (canonical positions, canonical hashes, symmetries):
+    the variant of every position with the smallest zobrist hash, that uint64 hash,
+    and the symmetry giving it, which agree with Game.canonical_hash and
+    Game.canonical_symmetry. The hashes of the 8 variants are gathered from the keys of
+    the images of the points, so only the canonical variant is built
+    '''
+    import numpy as np
+    num_boards, board_size = stones.shape[0], stones.shape[-1]
+    n = board_size * board_size
+    symmetric_keys, sources = _get_canonicalize_tables(board_size)
+
+    flat = stones.reshape(num_boards, n)
+    points = np.arange(n)
+    hashes = np.empty((NUM_SYMMETRIES, num_boards), dtype=np.uint64)
+    for k in range(NUM_SYMMETRIES):
+        hashes[k] = np.bitwise_xor.reduce(symmetric_keys[k][flat, points], axis=-1)
+    symmetries = hashes.argmin(axis=0)
+    boards = np.arange(num_boards)
+    positions = flat[boards[:, None], sources[symmetries]].reshape(stones.shape)
+    return positions, hashes[symmetries, boards], symmetries
@@ -0,0 +1,259 @@
+from collections import deque
+from src.utils import Stone, get_neighbor_table
+
+class Region(object):
+    '''
+    Connected region of empty points
+    '''
+    __slots__ = ('points', 'black', 'white')
+
+    def __init__(self, points=None):
+
+        # flat indices of the empty points of the region
+        self.points = points if points is not None else set()
+
+        # number of (empty point, adjacent stone) contacts with black and white stones
+        self.black = 0
+        self.white = 0
+
+    @property
+    def owner(self):
+        '''
+        Return the stone owning the region as territory, i.e. the only colour bordering it,
+        or Stone.EMPTY if it borders both colours or none
+        '''
+        if self.black and not self.white:
+            return Stone.BLACK
+        if self.white and not self.black:
+            return Stone.WHITE
+        return Stone.EMPTY
+
+
+class Territory(object):
+    '''
+    Empty regions of the board and the colours bordering them, kept up to date as stones
+    are placed and removed, so that the territory of black and white can be read in O(1).
+    A stone splits its region, which is detected with one breadth first search per
+    empty neighbor run in lockstep, so only the pieces split off are traversed.
+    Removing a stone merges the regions around it, relabelling the smaller ones
+    '''
+    def __init__(self, board_size):
+
+        # dimension of the board, and the shared neighbor table as flat indices
+        self.board_size = board_size
+        self._neighbors = tuple(tuple(ly * board_size + lx for ly, lx in coords)
+                                for coords in get_neighbor_table(board_size))
+
+        # stone at every flat index, and the region of every empty point (None for stones)
+        n = board_size * board_size
+        self._stones = [Stone.EMPTY] * n
+        self._regions = [None] * n
+        self.reset()
+
+    def reset(self):
+        '''
+        Make every point empty, in place: the whole board is one region bordering no stone
+        '''
+        n = self.board_size * self.board_size
+        self._stones[:] = [Stone.EMPTY] * n
+        self._regions[:] = [Region(set(range(n)))] * n
+
+        # number of empty points that are territory of black and white
+        self.black = 0
+        self.white = 0
+
+    def copy(self):
+        '''
+        Return an independent copy, sharing only the neighbor table
+        '''
+        territory = Territory.__new__(Territory)
+        territory.board_size = self.board_size
+        territory._neighbors = self._neighbors
+        territory._stones = self._stones[:]
+        copies = {}
+        regions = []
+        for region in self._regions:
+            if region is not None:
+                copy = copies.get(id(region))
+                if copy is None:
+                    copy = copies[id(region)] = Region(set(region.points))
+                    copy.black = region.black
+                    copy.white = region.white
+                region = copy
+            regions.append(region)
+        territory._regions = regions
+        territory.black = self.black
+        territory.white = self.white
+        return territory
+
+    def get_territory(self):
+        '''
+        Return the number of empty points that are territory of black and white,
+        as BoardMixin.get_territory
+        '''
+        return {Stone.BLACK: self.black,
+                Stone.WHITE: self.white
+               }
+
+    def _count(self, region, sign):
+        '''
+        Add (sign 1) or subtract (sign -1) the territory of the region from the totals
+        '''
+        owner = region.owner
+        if owner == Stone.BLACK:
+            self.black += sign * len(region.points)
+        elif owner == Stone.WHITE:
+            self.white += sign * len(region.points)
+
+    def _add_contacts(self, region, stone, count):
+        if stone == Stone.BLACK:
+            region.black += count
+        elif stone == Stone.WHITE:
+            region.white += count
+
+    def add_stone(self, stone, y, x):
+        '''
+        Place a stone on the empty point (y, x), splitting its region if needed
+        '''
+        idx = y * self.board_size + x
+        stones = self._stones
+        regions = self._regions
+        region = regions[idx]
+        self._count(region, -1)
+
+        region.points.discard(idx)
+        regions[idx] = None
+        stones[idx] = stone
+        empty_neighbors = []
+        for n_idx in self._neighbors[idx]:
+            n_stone = stones[n_idx]
+            if n_stone == Stone.EMPTY:
+                empty_neighbors.append(n_idx)
+            else:
+                # the point no longer touches its neighbors as an empty point
+                self._add_contacts(region, n_stone, -1)
+        self._add_contacts(region, stone, len(empty_neighbors))
+
+        for piece in self._split(region, empty_neighbors):
+            self._count(piece, 1)
+        if region.points:
+            self._count(region, 1)
+
+    def _split(self, region, seeds):
+        '''
+        Split off the pieces of the region that are no longer connected, from the empty
+        neighbors of the point just filled. Searches from every seed run in lockstep and
+        join when they meet; a search that runs out of points before the others have all
+        joined it has found a separate piece, which becomes a new region.
+        Return the new regions
+        '''
+        if len(seeds) <= 1:
+            return []
+        neighbors = self._neighbors
+        regions = self._regions
+
+        # search that first reached every visited point, the parent of every joined search,
+        # and the queues and points of the searches that are still running
+        owner = {}
+        parent = list(range(len(seeds)))
+        queues = {}
+        visited = {}
+        for i, seed in enumerate(seeds):
+            if seed in owner:
+                parent[i] = owner[seed]
+                continue
+            owner[seed] = i
+            queues[i] = [deque([seed])]
+            visited[i] = [seed]
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        pieces = []
+        while len(queues) > 1:
+            for i in list(queues):
+                if i not in queues or len(queues) == 1:
+                    continue
+                i_queues = queues[i]
+                while i_queues and not i_queues[-1]:
+                    i_queues.pop()
+                if not i_queues:
+                    # every point connected to this search has been visited
+                    points = set(visited.pop(i))
+                    del queues[i]
+                    piece = Region(points)
+                    pieces.append(piece)
+                    continue
+                point = i_queues[-1].popleft()
+                for n_idx in neighbors[point]:
+                    if regions[n_idx] is not region:
+                        continue
+                    j = owner.get(n_idx)
+                    if j is None:
+                        owner[n_idx] = i
+                        visited[i].append(n_idx)
+                        i_queues[-1].append(n_idx)
+                        continue
+                    j = find(j)
+                    if j != i:
+                        # the searches meet, so they are in the same piece
+                        parent[j] = i
+                        i_queues.extend(queues.pop(j))
+                        visited[i].extend(visited.pop(j))
+
+        stones = self._stones
+        for piece in pieces:
+            region.points -= piece.points
+            for idx in piece.points:
+                regions[idx] = piece
+                for n_idx in neighbors[idx]:
+                    n_stone = stones[n_idx]
+                    if n_stone != Stone.EMPTY:
+                        self._add_contacts(piece, n_stone, 1)
+                        self._add_contacts(region, n_stone, -1)
+        return pieces
+
+    def remove_stone(self, y, x):
+        '''
+        Remove the stone at (y, x), merging the regions around it
+        '''
+        idx = y * self.board_size + x
+        stones = self._stones
+        regions = self._regions
+        stone = stones[idx]
+        stones[idx] = Stone.EMPTY
+
+        around = []
+        contacts = {Stone.BLACK: 0, Stone.WHITE: 0}
+        for n_idx in self._neighbors[idx]:
+            n_stone = stones[n_idx]
+            if n_stone == Stone.EMPTY:
+                n_region = regions[n_idx]
+                if n_region not in around:
+                    around.append(n_region)
+                    self._count(n_region, -1)
+                self._add_contacts(n_region, stone, -1)
+            else:
+                contacts[n_stone] += 1
+
+        if around:
+            region = max(around, key=lambda r: len(r.points))
+        else:
+            region = Region()
+        for other in around:
+            if other is region:
+                continue
+            region.points |= other.points
+            region.black += other.black
+            region.white += other.white
+            for o_idx in other.points:
+                regions[o_idx] = region
+
+        region.points.add(idx)
+        regions[idx] = region
+        region.black += contacts[Stone.BLACK]
+        region.white += contacts[Stone.WHITE]
+        self._count(region, 1)
@@ -1,8 +1,13 @@
+import random
+
 class Stone:
     EMPTY = 0
     BLACK = 1
     WHITE = 2
 
+# flat move index used to pass the turn
+PASS = -1
+
 def get_opposite_stone(stone):
     assert(stone != Stone.EMPTY)
     if stone == Stone.BLACK:
@@ -11,3 +16,91 @@ def get_opposite_stone(stone):
 
 def make_2d_array(h, w, default=lambda: None):
     return [[default() for i in range(w)] for j in range(h)]
+
+# neighbor tables shared by all boards of the same size
+_neighbor_tables = {}
+
+def get_neighbor_table(board_size):
+    '''
+    Return the neighbor table for a board of the given size.
+    The table is indexed by the flat index y * board_size + x, and each entry
+    is a tuple of the (y, x) coordinates "up", "down", "left", "right" if possible.
+    The table is built once per size and shared.
+    '''
+    table = _neighbor_tables.get(board_size)
+    if table is None:
+        entries = []
+        for y in range(board_size):
+            for x in range(board_size):
+                coords = []
+                if y > 0:
+                    coords.append((y-1, x))
+                if y < board_size-1:
+                    coords.append((y+1, x))
+                if x > 0:
+                    coords.append((y, x-1))
+                if x < board_size-1:
+                    coords.append((y, x+1))
+                entries.append(tuple(coords))
+        table = _neighbor_tables[board_size] = tuple(entries)
+    return table
+
+# neighbor tables of flat indices shared by all boards of the same size
+_flat_neighbor_tables = {}
+
+def get_flat_neighbor_table(board_size):
+    '''
+    Return the neighbor table for a board of the given size as flat indices:
+    each entry is a tuple of the flat indices of the neighbors of y * board_size + x,
+    in the order of get_neighbor_table. The table is built once per size and shared.
+    '''
+    table = _flat_neighbor_tables.get(board_size)
+    if table is None:
+        table = _flat_neighbor_tables[board_size] = tuple(
+            tuple(ly * board_size + lx for ly, lx in coords)
+            for coords in get_neighbor_table(board_size))
+    return table
+
+# neighbor masks shared by all boards of the same size
+_neighbor_masks = {}
+
+def get_neighbor_masks(board_size):
+    '''
+    Return the bitmask of the neighbors of every point for a board of the given size,
+    indexed by the flat index y * board_size + x, with the bit y * board_size + x set
+    for the point (y, x). The masks are built once per size and shared.
+    '''
+    masks = _neighbor_masks.get(board_size)
+    if masks is None:
+        masks = _neighbor_masks[board_size] = tuple(
+            sum(1 << (ly * board_size + lx) for ly, lx in coords)
+            for coords in get_neighbor_table(board_size))
+    return masks
+
+def iter_bits(mask):
+    '''
+    Iterate over the flat indices of the bits set in the mask, in increasing order
+    '''
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+# zobrist keys shared by all boards of the same size
+_zobrist_tables = {}
+
+def get_zobrist_table(board_size):
+    '''
+    Return the 64-bit zobrist keys for a board of the given size, indexed by
+    [stone][y * board_size + x]. The keys of empty points are 0.
+    The keys are generated deterministically so hashes are comparable across runs
+    '''
+    table = _zobrist_tables.get(board_size)
+    if table is None:
+        rng = random.Random(board_size)
+        n = board_size * board_size
+        table = _zobrist_tables[board_size] = (
+            (0,) * n,
+            tuple(rng.getrandbits(64) for _ in range(n)),
+            tuple(rng.getrandbits(64) for _ in range(n)))
+    return table
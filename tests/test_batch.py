@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+from src.batch import BatchGame, PASS
+from src.game import Game
+from src.utils import Stone, get_opposite_stone
+from src.exceptions import SelfDestructException, KoException
+
+class TestBatchGame(unittest.TestCase):
+    '''
+    Test case for the batched games against separate Game objects
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 5,
+                        'enable_self_destruct': False
+        }
+        self.num_games = 16
+
+    def play_random(self, num_steps, seed):
+        '''
+        Play the same random moves in a BatchGame and in separate Game objects,
+        checking that they agree after every step
+        '''
+        rng = np.random.default_rng(seed)
+        board_size = self.configs['board_size']
+        batch = BatchGame(self.configs, self.num_games)
+        games = [Game(self.configs) for _ in range(self.num_games)]
+        stones = np.full(self.num_games, Stone.BLACK)
+
+        for _ in range(num_steps):
+            empty = batch.boards.reshape(self.num_games, -1) == Stone.EMPTY
+            moves = np.argmax(rng.random(empty.shape) * empty, axis=1)
+            moves[rng.random(self.num_games) < 0.05] = PASS
+
+            legal, removed = batch.step(stones, moves)
+
+            for i, game in enumerate(games):
+                captured = game.num_black_captured + game.num_white_captured
+                is_legal = True
+                if moves[i] == PASS:
+                    game.pass_turn()
+                else:
+                    y, x = divmod(int(moves[i]), board_size)
+                    try:
+                        game._place_stone(int(stones[i]), y, x)
+                    except (SelfDestructException, KoException):
+                        is_legal = False
+                self.assertEqual(legal[i], is_legal)
+                self.assertEqual(removed[i], game.num_black_captured + game.num_white_captured - captured)
+                self.assertTrue(np.array_equal(batch.boards[i], game.board.to_array()))
+                self.assertEqual(batch.num_black_captured[i], game.num_black_captured)
+                self.assertEqual(batch.num_white_captured[i], game.num_white_captured)
+                self.assertEqual(batch.count_pass[i], game.count_pass)
+                if legal[i]:
+                    stones[i] = get_opposite_stone(int(stones[i]))
+        return batch, games
+
+    def test__random_games(self):
+        batch, games = self.play_random(60, seed=0)
+        black, white = batch.get_scores()
+        for i, game in enumerate(games):
+            scores = game.get_scores()
+            self.assertEqual(black[i], scores[Stone.BLACK])
+            self.assertEqual(white[i], scores[Stone.WHITE])
+
+    def test__random_games_self_destruct(self):
+        self.configs['enable_self_destruct'] = True
+        self.play_random(60, seed=1)
+
+    def test__occupied(self):
+        batch = BatchGame(self.configs, 2)
+        batch.step(Stone.BLACK, [0, 1])
+        legal, removed = batch.step(Stone.WHITE, [0, 2])
+        self.assertEqual(legal.tolist(), [False, True])
+        self.assertEqual(batch.boards[0, 0, 0], Stone.BLACK)
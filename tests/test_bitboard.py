@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+from src.game import Game
+from src.bitboard import BitBoard
+from src.utils import Stone
+from src.exceptions import SelfDestructException
+from tests.utils import (
+    capture1, capture2, capture3,
+    self_destruct1, self_destruct2, self_destruct3, random_game)
+
+class TestBitBoard(unittest.TestCase):
+    '''
+    Test case for the bitboard backend against the default numpy backend
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': True
+        }
+        self.make_games()
+
+    def make_games(self):
+        self.game = Game(dict(self.configs, board_backend='bitboard'))
+        self.reference = Game(self.configs)
+
+    def assertSameGame(self):
+        self.assertTrue(np.array_equal(self.game.board.to_array(),
+                                       self.reference.board.to_array()))
+        self.assertEqual(self.game.num_black_captured, self.reference.num_black_captured)
+        self.assertEqual(self.game.num_white_captured, self.reference.num_white_captured)
+        self.assertEqual(self.game.get_scores(), self.reference.get_scores())
+
+    def test__backend(self):
+        self.assertEqual(type(self.game.board), BitBoard)
+
+    def test__scenarios(self):
+        for scenario in [capture1, capture2, capture3,
+                         self_destruct1, self_destruct2, self_destruct3]:
+            self.make_games()
+            scenario(self.game)
+            scenario(self.reference)
+            self.assertSameGame()
+
+    def test__random_game(self):
+        for enable_self_destruct in [True, False]:
+            self.configs['enable_self_destruct'] = enable_self_destruct
+            self.make_games()
+            random_game(self.game, seed=1)
+            random_game(self.reference, seed=1)
+            self.assertSameGame()
+
+    def test__masks(self):
+        capture3(self.game)
+        board = self.game.board
+        group = (1 << 3 * 7 + 3) | (1 << 3 * 7 + 4) | (1 << 4 * 7 + 3)
+        self.assertEqual(board.flood(1 << 3 * 7 + 3, board.white), group)
+        self.assertEqual(board.liberties_mask(group).bit_count(), 7)
+
+    def test__remove_stones(self):
+        # removing stones with masks agrees with removing them one by one
+        boards = [BitBoard(dict(self.configs, canonical_hash=True)) for _ in range(2)]
+        for board in boards:
+            for stone, y, x in [(Stone.BLACK, 3, 3), (Stone.BLACK, 3, 4), (Stone.WHITE, 2, 3),
+                                (Stone.WHITE, 0, 0)]:
+                board.place_stone(stone, y, x)
+        mask = (1 << 3 * 7 + 3) | (1 << 3 * 7 + 4) | (1 << 2 * 7 + 3)
+        boards[0].remove_stones(mask)
+        for y, x in [(3, 3), (3, 4), (2, 3)]:
+            boards[1].remove_stone(y, x)
+        for attribute in ['black', 'white', 'empty', 'zobrist_hash', 'packed_hash']:
+            self.assertEqual(getattr(boards[0], attribute), getattr(boards[1], attribute))
+        self.assertEqual(boards[0].white, 1)
+
+    def test__disabled_self_destruct(self):
+        self.configs['enable_self_destruct'] = False
+        self.make_games()
+        with self.assertRaises(SelfDestructException):
+            self_destruct1(self.game)
+        self.assertEqual(self.game.board[4, 4], Stone.EMPTY)
+        self.assertEqual(self.game.board[4, 3], Stone.WHITE)
@@ -0,0 +1,178 @@
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+from src.cache import EvalCache
+from src.game import Game
+from src.utils import Stone, get_opposite_stone
+
+class TestEvalCache(unittest.TestCase):
+    '''
+    Test case for the LRU cache of evaluations
+    '''
+    def test__lru(self):
+        cache = EvalCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.lookup('c', lambda: 0), 3)
+        self.assertEqual(cache.lookup('d', lambda: 4), 4)
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.stats(), {'hits': 2,
+                                         'misses': 2,
+                                         'hit_rate': 0.5,
+                                         'evictions': 2,
+                                         'entries': 2,
+                                         'bytes': cache.num_bytes
+                                        })
+
+    def test__max_bytes(self):
+        cache = EvalCache(max_entries=None, max_bytes=2000)
+        for i in range(10):
+            cache.put(i, np.zeros(400, dtype=bool))
+        self.assertLessEqual(cache.num_bytes, 2000)
+        self.assertEqual(len(cache), 3)
+        self.assertIn(9, cache)
+        cache.put(9, np.zeros(4000, dtype=bool))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.num_bytes, 0)
+
+    def test__save_load(self):
+        cache = EvalCache(rules=(9, False))
+        cache.put(('territory', 1), {Stone.BLACK: 3, Stone.WHITE: 0})
+        cache.put(('legal_moves', (1, Stone.BLACK, None)), np.ones((9, 9), dtype=bool))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.pickle')
+            cache.save(path)
+            loaded = EvalCache(rules=(9, False))
+            loaded.load(path)
+            self.assertEqual(loaded.get(('territory', 1)), {Stone.BLACK: 3, Stone.WHITE: 0})
+            self.assertTrue(loaded.get(('legal_moves', (1, Stone.BLACK, None))).all())
+            with self.assertRaises(ValueError):
+                EvalCache(rules=(9, True)).load(path)
+
+
+class TestGameEvalCache(unittest.TestCase):
+    '''
+    Test case for the eval cache attached to Game
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False,
+                        'eval_cache': True
+        }
+
+    def test__same_results(self):
+        # cached and uncached games agree while moves are made, unmade and made again
+        game = Game(self.configs)
+        reference = Game(dict(self.configs, eval_cache=False))
+        rng = random.Random(0)
+        size = game.board_size
+        stone = Stone.BLACK
+        for _ in range(300):
+            for s in [Stone.BLACK, Stone.WHITE]:
+                self.assertTrue(np.array_equal(game.legal_moves(s), reference.legal_moves(s)))
+            self.assertEqual(game.get_scores(), reference.get_scores())
+            y, x = rng.randrange(size), rng.randrange(size)
+            self.assertEqual(game.is_legal(stone, y, x), reference.is_legal(stone, y, x))
+            if rng.random() < 0.3 and game._move_stack:
+                game.unmake_move()
+                reference.unmake_move()
+                stone = get_opposite_stone(stone)
+            elif game.is_legal(stone, y, x):
+                game.make_move(stone, y, x)
+                reference.make_move(stone, y, x)
+                stone = get_opposite_stone(stone)
+        self.assertGreater(game.eval_cache.hits, 0)
+
+    def test__hits(self):
+        game = Game(self.configs)
+        game.place_black(3, 3)
+        scores = game.get_scores()
+        mask = game.legal_moves(Stone.WHITE)
+        self.assertEqual(game.eval_cache.stats()['misses'], 2)
+        self.assertEqual(game.get_scores(), scores)
+        self.assertIs(game.legal_moves(Stone.WHITE), mask)
+        self.assertFalse(mask.flags.writeable)
+        self.assertFalse(game.is_legal(Stone.WHITE, 3, 3))
+        self.assertTrue(game.is_legal(Stone.WHITE, 0, 0))
+        self.assertEqual(game.eval_cache.stats()['hits'], 3)
+
+    def test__ko_key(self):
+        # the same stones with and without a ko have different legal moves
+        game = Game(self.configs)
+        for y, x in [(0, 1), (1, 0), (2, 1)]:
+            game.place_black(y, x)
+        for y, x in [(0, 2), (1, 3), (2, 2), (1, 1)]:
+            game.place_white(y, x)
+        game.make_move(Stone.BLACK, 1, 2)
+        self.assertFalse(game.legal_moves(Stone.WHITE)[1, 1])
+        key = game.position_key(Stone.WHITE)
+        game.gm._ko = None
+        self.assertNotEqual(game.position_key(Stone.WHITE), key)
+        self.assertTrue(game.legal_moves(Stone.WHITE)[1, 1])
+
+    def test__captures(self):
+        # the territory is cached by board, and the captures are subtracted on every call
+        game = Game(self.configs)
+        other = game.snapshot()
+        game.place_black(0, 0)
+        game.place_white(0, 1)
+        game.place_white(1, 0)
+        self.assertEqual(game.num_black_captured, 1)
+        other.place_white(0, 1)
+        other.place_white(1, 0)
+        self.assertEqual(other.hash, game.hash)
+
+        scores = game.get_scores()
+        hits = game.eval_cache.hits
+        other_scores = other.get_scores()
+        self.assertEqual(game.eval_cache.hits, hits + 1)
+        self.assertEqual(other_scores[Stone.BLACK], scores[Stone.BLACK] + 1)
+        self.assertEqual(other_scores[Stone.WHITE], scores[Stone.WHITE])
+
+    def test__evaluate(self):
+        game = Game(self.configs)
+        calls = []
+        def ownership(g):
+            calls.append(g.hash)
+            return g.board.to_array().copy()
+        game.place_black(2, 2)
+        first = game.evaluate('ownership', Stone.WHITE, ownership)
+        self.assertIs(game.evaluate('ownership', Stone.WHITE, ownership), first)
+        game.evaluate('ownership', Stone.BLACK, ownership)
+        self.assertEqual(len(calls), 2)
+
+    def test__snapshot_shares_cache(self):
+        game = Game(self.configs)
+        game.place_black(2, 2)
+        game.get_scores()
+        fork = game.snapshot()
+        self.assertIs(fork.eval_cache, game.eval_cache)
+        fork.get_scores()
+        self.assertEqual(game.eval_cache.hits, 1)
+
+    def test__superko(self):
+        game = Game(dict(self.configs, superko=True))
+        game.legal_moves(Stone.BLACK)
+        game.legal_moves(Stone.BLACK)
+        self.assertEqual(len(game.eval_cache), 0)
+
+    def test__persist(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            configs = dict(self.configs, eval_cache_path=os.path.join(tmp, 'cache.pickle'))
+            game = Game(configs)
+            game.place_black(2, 2)
+            game.legal_moves(Stone.WHITE)
+            game.eval_cache.save(configs['eval_cache_path'])
+
+            game = Game(configs)
+            game.place_black(2, 2)
+            game.legal_moves(Stone.WHITE)
+            self.assertEqual(game.eval_cache.stats()['hits'], 1)
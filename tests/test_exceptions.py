@@ -98,6 +98,18 @@ class TestSelfDestructDisabled(unittest.TestCase):
         self.assertTrue(white_group5.has_liberty((2, 5)))
         self.assertTrue(white_group5.has_liberty((5, 5)))
 
+    def test__self_destruct_then_move(self):
+        with self.assertRaises(SelfDestructException):
+            self_destruct2(self.game)
+        self.game.place_white(0, 0)
+
+        self.assertEqual(self.game.board[4, 3], Stone.BLACK)
+        self.assertEqual(self.game.board[3, 4], Stone.BLACK)
+        self.assertEqual(self.game.board[4, 4], Stone.EMPTY)
+        self.assertEqual(self.game.num_black_captured, 0)
+        self.assertFalse(self.game.gm.is_same_group(4, 3, 3, 4))
+        self.assertIsNotNone(self.game.gm._get_group(3, 4))
+
     def test__self_destruct3(self):
         with self.assertRaises(SelfDestructException):
             self_destruct3(self.game)
@@ -167,3 +179,48 @@ class TestKo(unittest.TestCase):
         self.assertEqual(self.game.board[0, 2], Stone.BLACK)
         self.assertEqual(self.game.board[1, 0], Stone.WHITE)
         self.assertEqual(self.game.board[0, 1], Stone.WHITE)
+
+
+class TestSuperko(unittest.TestCase):
+    '''
+    Test case for raising positional superko violation exceptions
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': True,
+                        'superko': True
+        }
+
+        self.game = Game(self.configs)
+
+    def test__self_destruct_repeats_position(self):
+        # the single stone destroys itself, repeating the position before it was placed
+        with self.assertRaises(KoException):
+            self_destruct1(self.game)
+        self.assertEqual(self.game.board[4, 4], Stone.EMPTY)
+        self.assertEqual(self.game.num_black_captured, 0)
+        self.assertIsNone(self.game.gm._get_group(4, 4))
+
+        # a different move is still allowed and is unaffected by the rejected one
+        self.game.place_black(0, 0)
+        self.assertEqual(self.game.board[4, 3], Stone.WHITE)
+        self.assertEqual(self.game.num_black_captured, 0)
+
+    def test__self_destruct_without_superko(self):
+        self.configs['superko'] = False
+        self.game = Game(self.configs)
+        self_destruct1(self.game)
+        self.assertEqual(self.game.num_black_captured, 1)
+
+    def test__ko(self):
+        self.game.place_black(0, 0)
+        self.game.place_black(1, 1)
+        self.game.place_black(0, 2)
+        self.game.place_white(1, 0)
+        self.game.place_white(0, 1)
+
+        with self.assertRaises(KoException):
+            self.game.place_black(0, 0)
+        self.assertEqual(self.game.board[0, 1], Stone.WHITE)
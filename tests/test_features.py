@@ -0,0 +1,95 @@
+import unittest
+import numpy as np
+from src.game import Game
+from src.features import (
+    NUM_PLANES, OWN_STONES, OPPONENT_STONES, EMPTY, OWN_LIBERTIES_1, OWN_LIBERTIES_2,
+    OWN_LIBERTIES_3, OPPONENT_LIBERTIES_1, OPPONENT_LIBERTIES_2, OPPONENT_LIBERTIES_3,
+    CAPTURES, KO, BLACK_TO_PLAY, batch_feature_planes)
+from src.utils import Stone, get_opposite_stone
+from tests.utils import capture2, random_game
+
+class TestFeatures(unittest.TestCase):
+    '''
+    Test case for the feature planes, against the group manager
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False
+        }
+
+    def expected_planes(self, game, stone):
+        '''
+        Feature planes built point by point from the groups and is_legal
+        '''
+        size = game.board_size
+        planes = np.zeros((NUM_PLANES, size, size), dtype=np.uint8)
+        opposite = get_opposite_stone(stone)
+        for y in range(size):
+            for x in range(size):
+                g = game.gm._get_group(y, x)
+                if g is None:
+                    planes[EMPTY, y, x] = 1
+                    captures = any(game.gm._get_group(ly, lx) is not None
+                                   and game.gm._get_group(ly, lx).stone == opposite
+                                   and game.gm._get_group(ly, lx).num_liberties == 1
+                                   for ly, lx in game.board.get_liberty_coords(y, x))
+                    planes[CAPTURES, y, x] = captures
+                    planes[KO, y, x] = captures and not game.is_legal(stone, y, x)
+                    continue
+                own = g.stone == stone
+                planes[OWN_STONES if own else OPPONENT_STONES, y, x] = 1
+                liberties = min(g.num_liberties, 3)
+                first = OWN_LIBERTIES_1 if own else OPPONENT_LIBERTIES_1
+                planes[first + liberties - 1, y, x] = 1
+        planes[BLACK_TO_PLAY] = stone == Stone.BLACK
+        return planes
+
+    def test__random_games(self):
+        for seed in range(4):
+            game = Game(self.configs)
+            random_game(game, seed=seed, num_moves=30 + 15 * seed)
+            for stone in [Stone.BLACK, Stone.WHITE]:
+                planes = game.feature_planes(stone)
+                self.assertEqual(planes.dtype, np.uint8)
+                self.assertTrue(np.array_equal(planes, self.expected_planes(game, stone)))
+
+    def test__ko(self):
+        game = Game(self.configs)
+        for y, x in [(0, 1), (1, 0), (2, 1)]:
+            game.place_black(y, x)
+        for y, x in [(0, 2), (1, 3), (2, 2), (1, 1)]:
+            game.place_white(y, x)
+        game.place_black(1, 2)
+        planes = game.feature_planes(Stone.WHITE)
+        self.assertEqual(list(zip(*planes[KO].nonzero())), [(1, 1)])
+        self.assertEqual(planes[OPPONENT_LIBERTIES_1, 1, 2], 1)
+        self.assertEqual(game.feature_planes(Stone.BLACK)[KO].sum(), 0)
+
+    def test__liberty_planes(self):
+        # groups with 2 and with 3 or more liberties, for the player and the opponent
+        game = Game(self.configs)
+        game.place_black(3, 3)
+        game.place_black(0, 6)
+        game.place_white(0, 0)
+        game.place_white(6, 3)
+        planes = game.feature_planes(Stone.BLACK)
+        for plane, points in [(OWN_LIBERTIES_2, [(0, 6)]), (OWN_LIBERTIES_3, [(3, 3)]),
+                              (OPPONENT_LIBERTIES_2, [(0, 0)]),
+                              (OPPONENT_LIBERTIES_3, [(6, 3)])]:
+            self.assertEqual([tuple(map(int, p)) for p in zip(*planes[plane].nonzero())],
+                             points)
+        self.assertEqual(planes[OWN_LIBERTIES_1].sum() + planes[OPPONENT_LIBERTIES_1].sum(), 0)
+
+    def test__batch(self):
+        games = [Game(self.configs) for _ in range(3)]
+        capture2(games[0])
+        random_game(games[1], seed=5, num_moves=40)
+        stones = [Stone.WHITE, Stone.BLACK, Stone.WHITE]
+        out = np.full((3, NUM_PLANES, 7, 7), 7, dtype=np.uint8)
+        result = batch_feature_planes(games, stones, out)
+        self.assertIs(result, out)
+        for game, stone, planes in zip(games, stones, out):
+            self.assertTrue(np.array_equal(planes, game.feature_planes(stone)))
+        self.assertEqual(out[2, EMPTY].sum(), 49)
@@ -0,0 +1,78 @@
+import copy
+import subprocess
+import sys
+import unittest
+import numpy as np
+from src.game import Game
+from src.flatboard import FlatBoard
+from src.utils import Stone
+from tests.utils import (
+    capture1, capture2, capture3,
+    self_destruct1, self_destruct2, self_destruct3, random_game)
+
+class TestFlatBoard(unittest.TestCase):
+    '''
+    Test case for the bytearray backend against the default numpy backend
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': True
+        }
+        self.make_games()
+
+    def make_games(self):
+        self.game = Game(dict(self.configs, board_backend='flat'))
+        self.reference = Game(self.configs)
+
+    def assertSameGame(self):
+        self.assertTrue(np.array_equal(self.game.board.to_array(),
+                                       self.reference.board.to_array()))
+        self.assertEqual(self.game.num_black_captured, self.reference.num_black_captured)
+        self.assertEqual(self.game.num_white_captured, self.reference.num_white_captured)
+        self.assertEqual(self.game.get_scores(), self.reference.get_scores())
+        self.assertEqual(self.game.hash, self.reference.hash)
+
+    def test__backend(self):
+        self.assertEqual(type(self.game.board), FlatBoard)
+
+    def test__scenarios(self):
+        for scenario in [capture1, capture2, capture3,
+                         self_destruct1, self_destruct2, self_destruct3]:
+            self.make_games()
+            scenario(self.game)
+            scenario(self.reference)
+            self.assertSameGame()
+
+    def test__random_game(self):
+        for enable_self_destruct in [True, False]:
+            self.configs['enable_self_destruct'] = enable_self_destruct
+            for seed in range(3):
+                self.make_games()
+                random_game(self.game, seed=seed)
+                random_game(self.reference, seed=seed)
+                self.assertSameGame()
+
+    def test__copy(self):
+        capture1(self.game)
+        board = copy.copy(self.game.board)
+        board.place_stone(Stone.BLACK, 0, 0)
+        self.assertEqual(self.game.board[0, 0], Stone.EMPTY)
+        self.assertEqual(board[3, 4], Stone.WHITE)
+        self.assertNotEqual(board.zobrist_hash, self.game.board.zobrist_hash)
+
+    def test__without_numpy(self):
+        # a game on the flat board is played without importing numpy
+        code = ('import sys\n'
+                'from src.game import Game\n'
+                'game = Game({"black_stone": "b", "white_stone": "w", "board_size": 9,\n'
+                '             "enable_self_destruct": False, "board_backend": "flat"})\n'
+                'game.make_move(1, 4, 4)\n'
+                'game.make_move(2, 4, 5)\n'
+                'game.unmake_move()\n'
+                'game.get_scores()\n'
+                'print("numpy" in sys.modules)\n')
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                text=True, check=True).stdout
+        self.assertEqual(output.strip(), 'False')
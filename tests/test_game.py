@@ -1,10 +1,10 @@
 import unittest
 import numpy as np
 from src.game import Game
-from src.utils import Stone
+from src.utils import Stone, get_zobrist_table
 from tests.utils import (
     capture1, capture2, capture3,
-    self_destruct1, self_destruct2, self_destruct3)
+    self_destruct1, self_destruct2, self_destruct3, random_game)
 
 class TestBoard(unittest.TestCase):
     '''
@@ -31,6 +31,17 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(np.where(self.game.board == Stone.BLACK), (4, 4))
         self.assertEqual(np.where(self.game.board == Stone.WHITE), (4, 5))
 
+    def test__play(self):
+        self.game.play(Stone.BLACK, 4, 4)
+        self.game.play(Stone.WHITE, 4, 5)
+        self.assertEqual(self.game.board[4, 4], Stone.BLACK)
+        self.assertEqual(self.game.board[4, 5], Stone.WHITE)
+        self.assertFalse(self.game.gm.is_eye(Stone.WHITE, 6, 6))
+        for y, x in [(5, 6), (6, 5)]:
+            self.game.play(Stone.WHITE, y, x)
+        self.assertTrue(self.game.gm.is_eye(Stone.WHITE, 6, 6))
+        self.assertFalse(self.game.gm.is_eye(Stone.BLACK, 6, 6))
+
     def test__capture1(self):
         capture1(self.game)
         self.assertEqual(self.game.board[4, 4], Stone.EMPTY)
@@ -139,3 +150,51 @@ class TestScore(unittest.TestCase):
         scores = self.game.get_scores()
         self.assertEqual(scores[Stone.BLACK], -3)
         self.assertEqual(scores[Stone.WHITE], 3)
+
+
+class TestHash(unittest.TestCase):
+    '''
+    Test case for the incrementally updated zobrist hash
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False
+        }
+
+    def full_hash(self, game):
+        zobrist = get_zobrist_table(game.board_size)
+        h = 0
+        for y in range(game.board_size):
+            for x in range(game.board_size):
+                h ^= zobrist[game.board[y, x]][y * game.board_size + x]
+        return h
+
+    def test__empty(self):
+        self.assertEqual(Game(self.configs).hash, 0)
+
+    def test__captures(self):
+        for scenario in [capture1, capture2, capture3]:
+            game = Game(self.configs)
+            scenario(game)
+            self.assertEqual(game.hash, self.full_hash(game))
+
+    def test__random_games(self):
+        for board_backend in ['numpy', 'bitboard', 'flat']:
+            for seed in range(3):
+                game = Game(dict(self.configs, board_backend=board_backend))
+                random_game(game, seed=seed)
+                self.assertNotEqual(game.hash, 0)
+                self.assertEqual(game.hash, self.full_hash(game))
+
+    def test__transposition(self):
+        game1 = Game(self.configs)
+        game1.place_black(1, 1)
+        game1.place_white(2, 2)
+        game1.place_black(3, 3)
+        game2 = Game(self.configs)
+        game2.place_black(3, 3)
+        game2.place_white(2, 2)
+        game2.place_black(1, 1)
+        self.assertEqual(game1.hash, game2.hash)
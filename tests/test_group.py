@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from src.game import Game, Group
 from src.utils import Stone
 from tests.utils import capture1, capture2, capture3
@@ -218,3 +219,26 @@ class TestGameGroups(unittest.TestCase):
         self.assertTrue(white_group2.has_liberty((6, 5)))
         self.assertTrue(white_group2.has_liberty((5, 6)))
         self.assertTrue(white_group2.has_liberty((4, 6)))
+
+    def test__numpy_coords(self):
+        # coordinates given as numpy ints, e.g. from np.nonzero, on small and large boards
+        for board_size in [7, 19]:
+            for backend in ['numpy', 'bitboard', 'flat']:
+                game = Game({'black_stone': 'b',
+                             'white_stone': 'w',
+                             'board_size': board_size,
+                             'enable_self_destruct': False,
+                             'board_backend': backend
+                })
+                y, x = np.int64(4), np.int64(4)
+                game.place_black(y, x)
+                for ly, lx in [(4, 5), (4, 3), (3, 4)]:
+                    game.place_white(np.int64(ly), np.int64(lx))
+                self.assertEqual(game.gm._get_group(4, 4).liberties, {(5, 4)})
+                self.assertTrue(game.is_legal(Stone.WHITE, np.int64(5), np.int64(4)))
+                game.make_move(Stone.WHITE, np.int64(5), np.int64(4))
+                self.assertEqual(game.num_black_captured, 1)
+                self.assertEqual(game.board[4, 4], Stone.EMPTY)
+                game.unmake_move()
+                self.assertEqual(game.gm._get_group(4, 4).liberties, {(5, 4)})
+                self.assertEqual(game.gm._get_group(4, 5).num_liberties, 3)
@@ -0,0 +1,141 @@
+import io
+import unittest
+import numpy as np
+from src.game import Game
+from src.gtp import GTPEngine
+from src.utils import Stone
+from tests.utils import random_game
+
+class TestGTPEngine(unittest.TestCase):
+    '''
+    Test case for the Go Text Protocol front end
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 9,
+                        'enable_self_destruct': False
+        }
+        self.engine = GTPEngine(self.configs, seed=0)
+
+    def test__vertices(self):
+        self.assertEqual(self.engine.parse_vertex('A9'), (0, 0))
+        self.assertEqual(self.engine.parse_vertex('j1'), (8, 8))
+        self.assertEqual(self.engine.parse_vertex('PASS'), None)
+        self.assertEqual(self.engine.format_vertex((4, 7)), 'H5')
+        self.assertEqual(self.engine.execute('play b I5'), '? invalid coordinate: I5\n\n')
+        self.assertEqual(self.engine.execute('play b A10'), '? invalid coordinate: A10\n\n')
+
+    def test__play_undo(self):
+        self.assertEqual(self.engine.execute('1 play b D5'), '=1\n\n')
+        self.assertEqual(self.engine.execute('play white C5'), '=\n\n')
+        self.assertEqual(self.engine.execute('play b D5'), '? illegal move\n\n')
+        self.assertEqual(self.engine.game.board[4, 3], Stone.BLACK)
+        self.assertEqual(self.engine.game.board[4, 2], Stone.WHITE)
+        self.assertEqual(self.engine.execute('undo'), '=\n\n')
+        self.assertEqual(self.engine.game.board[4, 2], Stone.EMPTY)
+        self.assertEqual(self.engine.execute('undo'), '=\n\n')
+        self.assertEqual(self.engine.execute('undo'), '? cannot undo\n\n')
+
+    def test__ko(self):
+        for vertex in ['D5', 'E6', 'E4']:
+            self.engine.execute(f'play b {vertex}')
+        for vertex in ['F6', 'F4', 'G5', 'E5']:
+            self.engine.execute(f'play w {vertex}')
+        self.assertEqual(self.engine.execute('play b F5'), '=\n\n')
+        self.assertEqual(self.engine.game.board[4, 4], Stone.EMPTY)
+        self.assertEqual(self.engine.execute('play w E5'), '? illegal move\n\n')
+
+    def test__genmove(self):
+        response = self.engine.execute('genmove b')
+        self.assertTrue(response.startswith('= '))
+        y, x = self.engine.parse_vertex(response[2:].strip())
+        self.assertEqual(self.engine.game.board[y, x], Stone.BLACK)
+        self.engine.execute('undo')
+        self.assertEqual(self.engine.game.board[y, x], Stone.EMPTY)
+
+    def test__final_score(self):
+        self.engine.execute('komi 6.5')
+        self.assertEqual(self.engine.execute('final_score'), '= W+6.5\n\n')
+        self.engine.execute('play b E5')
+        self.assertEqual(self.engine.execute('final_score'), '= B+73.5\n\n')
+
+    def test__showboard(self):
+        self.engine.execute('play b A1')
+        response = self.engine.execute('showboard')
+        lines = response.split('\n')
+        self.assertEqual(lines[0], '= ')
+        self.assertEqual(lines[-3], '8 [b][ ][ ][ ][ ][ ][ ][ ][ ]')
+        self.assertTrue(response.endswith('\n\n'))
+        self.assertNotIn('\n\n', response[:-2])
+
+    def test__boardsize(self):
+        game = self.engine.game
+        self.engine.execute('play b E5')
+        self.assertEqual(self.engine.execute('boardsize 9'), '=\n\n')
+        self.assertIs(self.engine.game, game)
+        self.assertEqual(game.board[4, 4], Stone.EMPTY)
+        self.assertEqual(self.engine.execute('boardsize 13'), '=\n\n')
+        self.assertEqual(self.engine.game.board_size, 13)
+        self.assertEqual(self.engine.execute('boardsize 40'), '? unacceptable size\n\n')
+        self.assertEqual(self.engine.execute('boardsize x'), '? syntax error\n\n')
+
+    def test__errors(self):
+        self.assertEqual(self.engine.execute('# comment'), None)
+        self.assertEqual(self.engine.execute('  '), None)
+        self.assertEqual(self.engine.execute('3 bogus'), '?3 unknown command\n\n')
+        self.assertEqual(self.engine.execute('play b'), '? syntax error\n\n')
+        self.assertEqual(self.engine.execute('play x A1'), '? invalid color: x\n\n')
+        self.assertEqual(self.engine.execute('known_command play'), '= true\n\n')
+        self.assertEqual(self.engine.execute('known_command bogus'), '= false\n\n')
+
+    def test__run(self):
+        script = b'boardsize 9\nclear_board\nplay b E5\n\n2 final_score\nquit\nplay w A1\n'
+        out = io.BytesIO()
+        self.engine.run(io.BytesIO(script), out)
+        self.assertEqual(out.getvalue(), b'=\n\n=\n\n=\n\n=2 B+80\n\n=\n\n')
+        self.assertEqual(self.engine.game.board[8, 0], Stone.EMPTY)
+
+    def test__run_without_newline(self):
+        out = io.BytesIO()
+        self.engine.run(io.BytesIO(b'play b E5\r\nname'), out)
+        self.assertEqual(out.getvalue(), b'=\n\n= go\n\n')
+
+
+class TestClearBoard(unittest.TestCase):
+    '''
+    Test case for clearing the board of a game in place
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False,
+                        'superko': True,
+                        'incremental_territory': True,
+                        'liberty_plane': True
+        }
+
+    def test__same_as_new_game(self):
+        for board_backend in ['numpy', 'bitboard', 'flat']:
+            configs = dict(self.configs, board_backend=board_backend)
+            game = Game(configs)
+            board, gm = game.board, game.gm
+            random_game(game, seed=0)
+            game.make_move(Stone.BLACK)
+            game.clear_board()
+            self.assertIs(game.board, board)
+            self.assertIs(game.gm, gm)
+            self.assertEqual(game.hash, 0)
+            self.assertEqual(game.count_pass, 0)
+            self.assertEqual(game.num_black_captured, 0)
+            self.assertEqual(game.get_scores(), {Stone.BLACK: 0, Stone.WHITE: 0})
+            self.assertFalse(game.liberty_plane.any())
+
+            new_game = Game(configs)
+            random_game(game, seed=1)
+            random_game(new_game, seed=1)
+            np.testing.assert_array_equal(game.board.to_array(), new_game.board.to_array())
+            np.testing.assert_array_equal(game.liberty_plane, new_game.liberty_plane)
+            self.assertEqual(game.get_scores(), new_game.get_scores())
+            self.assertEqual(game.num_white_captured, new_game.num_white_captured)
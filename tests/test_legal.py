@@ -0,0 +1,104 @@
+import random
+import unittest
+import numpy as np
+from src.game import Game
+from src.utils import Stone, get_opposite_stone
+from src.exceptions import SelfDestructException, KoException
+from tests.utils import game_state, self_destruct1
+
+class TestLegal(unittest.TestCase):
+    '''
+    Test case for checking legality without exceptions
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False
+        }
+
+    def is_placeable(self, game, stone, y, x):
+        '''
+        Reference legality, trying the move and unmaking it
+        '''
+        if game.board[y, x] != Stone.EMPTY:
+            return False
+        try:
+            game.make_move(stone, y, x)
+        except (SelfDestructException, KoException):
+            return False
+        game.unmake_move()
+        return True
+
+    def check_random_game(self, configs, seed):
+        rng = random.Random(seed)
+        game = Game(configs)
+        size = game.board_size
+        stone = Stone.BLACK
+        for _ in range(120):
+            state = game_state(game)
+            for s in [Stone.BLACK, Stone.WHITE]:
+                mask = game.legal_moves(s)
+                self.assertEqual(game_state(game), state)
+                for y in range(size):
+                    for x in range(size):
+                        expected = self.is_placeable(game, s, y, x)
+                        self.assertEqual(game.is_legal(s, y, x), expected)
+                        self.assertEqual(mask[y, x], expected)
+            self.assertEqual(game_state(game), state)
+
+            y, x = rng.randrange(size), rng.randrange(size)
+            if game.is_legal(stone, y, x):
+                game.make_move(stone, y, x)
+                stone = get_opposite_stone(stone)
+
+    def test__random_games(self):
+        for seed in range(2):
+            self.check_random_game(self.configs, seed)
+
+    def test__random_games_self_destruct(self):
+        self.configs['enable_self_destruct'] = True
+        self.check_random_game(self.configs, 0)
+
+    def test__random_games_superko(self):
+        self.configs['superko'] = True
+        self.check_random_game(self.configs, 0)
+
+    def test__backends(self):
+        for board_backend in ['bitboard', 'flat']:
+            self.check_random_game(dict(self.configs, board_backend=board_backend), 0)
+            self.check_random_game(dict(self.configs, board_backend=board_backend,
+                                        superko=True), 1)
+
+    def test__ko(self):
+        game = Game(self.configs)
+        for y, x in [(0, 1), (1, 0), (2, 1)]:
+            game.place_black(y, x)
+        for y, x in [(0, 2), (1, 3), (2, 2), (1, 1)]:
+            game.place_white(y, x)
+        self.assertTrue(game.is_legal(Stone.BLACK, 1, 2))
+        game.place_black(1, 2)
+        self.assertFalse(game.is_legal(Stone.WHITE, 1, 1))
+        self.assertFalse(game.legal_moves(Stone.WHITE)[1, 1])
+        self.assertTrue(game.is_legal(Stone.BLACK, 1, 1))
+
+    def test__self_destruct(self):
+        game = Game(self.configs)
+        with self.assertRaises(SelfDestructException):
+            self_destruct1(game)
+        self.assertFalse(game.is_legal(Stone.BLACK, 4, 4))
+        self.assertFalse(game.is_legal(Stone.BLACK, 4, 3))
+        mask = game.legal_moves(Stone.BLACK)
+        self.assertEqual(mask.dtype, np.bool_)
+        self.assertEqual(mask.shape, (7, 7))
+        self.assertFalse(mask[4, 4])
+        self.assertTrue(mask[0, 0])
+
+    def test__large_board(self):
+        # flat indices beyond 63 do not fit the masks in an int64
+        game = Game(dict(self.configs, board_size=19))
+        for y, x in [(17, 18), (18, 17)]:
+            game.place_white(y, x)
+        mask = game.legal_moves(Stone.BLACK)
+        self.assertFalse(mask[18, 18])
+        self.assertTrue(game.legal_moves(Stone.WHITE)[18, 18])
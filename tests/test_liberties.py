@@ -0,0 +1,86 @@
+import random
+import unittest
+from src.game import Game
+from src.utils import Stone, get_opposite_stone
+from src.exceptions import SelfDestructException, KoException
+from tests.utils import capture3
+
+class TestLibertyPlane(unittest.TestCase):
+    '''
+    Test case for the liberty plane kept up to date by the group manager
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False,
+                        'liberty_plane': True
+        }
+
+    def assertPlane(self, game):
+        gm = game.gm
+        expected = [[0] * game.board_size for _ in range(game.board_size)]
+        for y in range(game.board_size):
+            for x in range(game.board_size):
+                g = gm._peek_group(y, x)
+                if g is not None:
+                    expected[y][x] = min(g.num_liberties, 127)
+        self.assertEqual(game.liberty_plane.tolist(), expected)
+
+    def play_random(self, seed):
+        rng = random.Random(seed)
+        game = Game(self.configs)
+        size = game.board_size
+        stone = Stone.BLACK
+        forks = []
+        for i in range(150):
+            y, x = rng.randrange(size), rng.randrange(size)
+            if game.board[y, x] != Stone.EMPTY:
+                continue
+            try:
+                game.make_move(stone, y, x)
+            except (SelfDestructException, KoException):
+                self.assertPlane(game)
+                continue
+            self.assertPlane(game)
+            if rng.random() < 0.2:
+                game.unmake_move()
+                self.assertPlane(game)
+                continue
+            if i % 30 == 0:
+                forks.append(game.snapshot())
+            stone = get_opposite_stone(stone)
+
+        for fork in forks:
+            self.assertPlane(fork)
+        while game._move_stack:
+            game.unmake_move()
+            self.assertPlane(game)
+        self.assertFalse(game.liberty_plane.any())
+
+    def test__random_games(self):
+        for seed in range(3):
+            self.play_random(seed)
+
+    def test__random_games_rules(self):
+        self.configs['enable_self_destruct'] = True
+        self.configs['superko'] = True
+        for seed in range(3):
+            self.play_random(seed)
+
+    def test__capture(self):
+        game = Game(self.configs)
+        capture3(game)
+        self.assertPlane(game)
+        self.assertEqual(game.liberty_plane[4, 4], 0)
+
+    def test__read_only(self):
+        game = Game(self.configs)
+        game.place_black(0, 0)
+        self.assertEqual(game.liberty_plane[0, 0], 2)
+        with self.assertRaises(ValueError):
+            game.liberty_plane[0, 0] = 1
+
+    def test__disabled(self):
+        del self.configs['liberty_plane']
+        self.assertIsNone(Game(self.configs).liberty_plane)
@@ -0,0 +1,80 @@
+import random
+import unittest
+from src.game import Game
+from src.utils import Stone, get_opposite_stone
+from src.exceptions import SelfDestructException, KoException
+from tests.utils import game_state
+
+class TestMakeMove(unittest.TestCase):
+    '''
+    Test case for making and unmaking moves
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False
+        }
+
+    def play_and_unmake(self, configs, seed):
+        rng = random.Random(seed)
+        game = Game(configs)
+        size = game.board_size
+        stone = Stone.BLACK
+        states = []
+        for _ in range(150):
+            state = game_state(game)
+            if rng.random() < 0.05:
+                move = (None, None)
+            else:
+                move = (rng.randrange(size), rng.randrange(size))
+                if game.board[move] != Stone.EMPTY:
+                    continue
+            try:
+                game.make_move(stone, *move)
+            except (SelfDestructException, KoException):
+                self.assertEqual(game_state(game), state)
+                continue
+
+            # unmaking restores the state, and the move can be replayed
+            game.unmake_move()
+            self.assertEqual(game_state(game), state)
+            game.make_move(stone, *move)
+            states.append(state)
+            stone = get_opposite_stone(stone)
+
+        # unmake every move back to the empty board
+        while states:
+            game.unmake_move()
+            self.assertEqual(game_state(game), states.pop())
+        self.assertEqual(game.hash, 0)
+
+    def test__random_games(self):
+        for seed in range(3):
+            self.play_and_unmake(self.configs, seed)
+
+    def test__random_games_self_destruct(self):
+        self.configs['enable_self_destruct'] = True
+        for seed in range(3):
+            self.play_and_unmake(self.configs, seed)
+
+    def test__random_games_superko(self):
+        self.configs['superko'] = True
+        self.configs['board_backend'] = 'bitboard'
+        for seed in range(3):
+            self.play_and_unmake(self.configs, seed)
+
+    def test__capture(self):
+        game = Game(self.configs)
+        for y, x in [(4, 3), (3, 4), (4, 4)]:
+            game.make_move(Stone.BLACK, y, x)
+        for y, x in [(2, 4), (3, 3), (4, 2), (5, 3), (5, 4), (4, 5)]:
+            game.make_move(Stone.WHITE, y, x)
+        state = game_state(game)
+
+        game.make_move(Stone.WHITE, 3, 5)
+        self.assertEqual(game.num_black_captured, 3)
+        game.unmake_move()
+        self.assertEqual(game_state(game), state)
+        self.assertTrue(game.gm.is_same_group(4, 3, 3, 4))
+        self.assertEqual(game.gm._get_group(4, 4).num_liberties, 1)
@@ -0,0 +1,62 @@
+import contextlib
+import io
+import unittest
+from src.game import Game, GameUI
+from src.mcts import MCTS
+from src.utils import Stone
+from tests.utils import game_state
+
+class TestMCTS(unittest.TestCase):
+    '''
+    Test case for the Monte Carlo Tree Search player
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 5,
+                        'enable_self_destruct': False
+        }
+        self.game = Game(self.configs)
+        self.mcts = MCTS(5, playouts=200, seed=0)
+
+    def test__game_unchanged(self):
+        self.game.place_black(2, 2)
+        state = game_state(self.game)
+        move = self.mcts.get_move(self.game, Stone.WHITE)
+        self.assertEqual(game_state(self.game), state)
+        self.assertTrue(self.game.is_legal(Stone.WHITE, *move))
+        self.assertEqual(self.mcts.num_playouts, 200)
+        self.assertGreater(self.mcts.nodes_per_sec, 0)
+
+    def test__visits(self):
+        self.mcts.get_move(self.game, Stone.BLACK)
+        root = self.mcts.root.parent
+        self.assertIsNone(root.parent)
+        self.assertEqual(root.visits, 200)
+        self.assertEqual(sum(child.visits for child in root.children), 200)
+        for child in root.children:
+            self.assertEqual(child.stone, Stone.BLACK)
+            self.assertLessEqual(child.wins, child.visits)
+
+    def test__tree_reuse(self):
+        self.mcts.get_move(self.game, Stone.BLACK)
+        self.mcts._play(self.game, Stone.BLACK, self.mcts.root.move)
+        reply = max(self.mcts.root.children, key=lambda child: child.visits)
+        visits = reply.visits
+        self.mcts._play(self.game, Stone.WHITE, reply.move)
+
+        self.mcts.get_move(self.game, Stone.BLACK, playouts=50)
+        self.assertIsNone(reply.parent)
+        self.assertEqual(reply.visits, visits + 50)
+
+    def test__wall_clock(self):
+        self.mcts.get_move(self.game, Stone.BLACK, seconds=0.05)
+        self.assertGreater(self.mcts.num_playouts, 0)
+        self.assertLess(self.mcts.search_time, 1)
+
+    def test__opponent(self):
+        ui = GameUI(dict(self.configs, opponent='mcts', mcts_playouts=20))
+        ui.turn = ui.opponent_stone
+        with contextlib.redirect_stdout(io.StringIO()):
+            move = ui._opponent_move()
+        self.assertTrue(move == 'pass' or ui.game.is_legal(Stone.WHITE, *move))
@@ -0,0 +1,48 @@
+import random
+import unittest
+from src.game import Game
+from src.playout import Playout, playout
+from src.utils import Stone
+
+class TestPlayout(unittest.TestCase):
+    '''
+    Test case for random playouts
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False
+        }
+
+    def test__reproducible(self):
+        results = []
+        for _ in range(2):
+            game = Game(self.configs)
+            scores = playout(game, random.Random(3))
+            results.append((scores, game.board.to_array().tolist()))
+        self.assertEqual(results[0], results[1])
+
+    def test__finished_game(self):
+        driver = Playout(7)
+        for seed in range(5):
+            game = Game(self.configs)
+            scores = driver.run(game, random.Random(seed))
+            self.assertTrue(game.is_over())
+            self.assertEqual(scores, game.get_scores())
+
+            # the buffer of empty points matches the board
+            empty = sorted(driver._empty[:driver._num_empty])
+            self.assertEqual(empty, [y * 7 + x for y in range(7) for x in range(7)
+                                     if game.board[y, x] == Stone.EMPTY])
+
+            # the only moves left fill the eyes of the player
+            for stone in [Stone.BLACK, Stone.WHITE]:
+                for y, x in zip(*game.legal_moves(stone).nonzero()):
+                    self.assertTrue(game.gm.is_eye(stone, y, x))
+
+    def test__max_moves(self):
+        game = Game(self.configs)
+        playout(game, random.Random(0), stone=Stone.WHITE, max_moves=1)
+        self.assertEqual((game.board.to_array() == Stone.WHITE).sum(), 1)
+        self.assertFalse(game.is_over())
@@ -0,0 +1,77 @@
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+from src.records import RecordWriter, RecordReader, PASS_MOVE
+from src.selfplay import play_game, random_policy
+from src.utils import Stone, PASS
+from tests.test_selfplay import TestSelfPlay
+
+class TestRecords(unittest.TestCase):
+    '''
+    Test case for the binary game record format
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False
+        }
+        self.records = [play_game(self.configs, random_policy, seed) for seed in range(4)]
+        self.records.insert(2, dict(self.records[0], moves=[], num_black_captured=0,
+                                    num_white_captured=0))
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'games.bin')
+        with RecordWriter(self.path, 7, superko=True) as writer:
+            for record in self.records:
+                writer.write_game(record['moves'])
+        self.reader = RecordReader(self.path)
+
+    def tearDown(self):
+        del self.reader
+        self.directory.cleanup()
+
+    def test__header(self):
+        self.assertEqual(len(self.reader), 5)
+        self.assertEqual(self.reader.board_size, 7)
+        self.assertTrue(self.reader.superko)
+        self.assertFalse(self.reader.enable_self_destruct)
+        self.assertEqual(self.reader.num_moves,
+                         sum(len(record['moves']) for record in self.records))
+
+    def test__moves(self):
+        for i, record in enumerate(self.records):
+            moves = self.reader[i]
+            if len(moves):
+                self.assertIsInstance(moves, np.memmap)
+            self.assertEqual(moves.dtype, np.dtype('<u2'))
+            expected = [PASS_MOVE if move == PASS else move for move in record['moves']]
+            self.assertEqual(moves.tolist(), expected)
+        self.assertEqual(self.reader[-1].tolist(), self.reader[4].tolist())
+        with self.assertRaises(IndexError):
+            self.reader[5]
+
+    def test__to_game(self):
+        replay = TestSelfPlay.replay
+        for i, record in enumerate(self.records):
+            game = self.reader.to_game(i)
+            self.assertEqual(game.num_black_captured, record['num_black_captured'])
+            self.assertEqual(game.num_white_captured, record['num_white_captured'])
+            expected = replay(self, record).board.to_array()
+            self.assertTrue(np.array_equal(game.board.to_array(), expected))
+
+    def test__boards(self):
+        boards = list(self.reader.iter_boards(1))
+        self.assertEqual(len(boards), len(self.records[1]['moves']))
+        self.assertTrue(np.array_equal(boards[-1], self.reader.to_game(1).board.to_array()))
+        self.assertEqual(boards[0][divmod(int(self.reader[1][0]), 7)], Stone.BLACK)
+        self.assertTrue(np.array_equal(boards[9], self.reader.to_game(1, 10).board.to_array()))
+
+    def test__sample(self):
+        num_moves = [len(record['moves']) for record in self.records]
+        self.assertEqual(self.reader.locate(0), (0, 0))
+        self.assertEqual(self.reader.locate(num_moves[0]), (1, 0))
+        self.assertEqual(self.reader.locate(num_moves[0] + num_moves[1]), (3, 0))
+        game = self.reader.sample(random.Random(0))
+        self.assertEqual(game.board_size, 7)
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+from src.game import Game
+from src.numpyboard import VECTORIZED_TERRITORY_SIZE
+from src.scoring import label_regions, count_territory
+from src.utils import Stone
+from tests.utils import capture1, capture2, random_game
+
+class TestScoring(unittest.TestCase):
+    '''
+    Test case for the vectorized territory scoring against the depth first search
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False
+        }
+
+    def vectorized(self, game):
+        black, white = count_territory(game.board.to_array())
+        return {Stone.BLACK: int(black),
+                Stone.WHITE: int(white)
+               }
+
+    def test__label_regions(self):
+        mask = np.array([[1, 1, 0],
+                         [0, 1, 0],
+                         [1, 0, 1]], dtype=bool).reshape(-1)
+        labels = label_regions(mask, 3)
+        self.assertEqual(labels.tolist(), [0, 0, 9, 9, 0, 9, 6, 9, 8])
+
+    def test__spiral(self):
+        # a single long winding region converges to one label
+        board_size = 9
+        stones = np.zeros((board_size, board_size), dtype=int)
+        stones[1, 0:8] = Stone.BLACK
+        stones[3, 1:9] = Stone.BLACK
+        stones[5, 0:8] = Stone.BLACK
+        stones[7, 1:9] = Stone.BLACK
+        empty = (stones == Stone.EMPTY).reshape(-1)
+        labels = label_regions(empty, board_size)
+        self.assertEqual(set(labels[empty].tolist()), {0})
+        black, white = count_territory(stones)
+        self.assertEqual((black, white), (49, 0))
+
+    def test__scenarios(self):
+        for scenario in [capture1, capture2]:
+            game = Game(self.configs)
+            scenario(game)
+            self.assertEqual(self.vectorized(game), game.board.get_territory_dfs())
+
+    def test__random_games(self):
+        games = []
+        for seed in range(10):
+            game = Game(dict(self.configs, board_size=9))
+            random_game(game, seed=seed, num_moves=seed * 20)
+            self.assertEqual(self.vectorized(game), game.board.get_territory_dfs())
+            games.append(game)
+
+        # batched scoring of all the boards at once
+        stones = np.stack([game.board.to_array() for game in games])
+        black, white = count_territory(stones)
+        for i, game in enumerate(games):
+            territory = game.board.get_territory_dfs()
+            self.assertEqual(black[i], territory[Stone.BLACK])
+            self.assertEqual(white[i], territory[Stone.WHITE])
+
+    def test__board_sizes(self):
+        # get_territory uses the depth first search on small boards only
+        for board_size in [VECTORIZED_TERRITORY_SIZE - 1, VECTORIZED_TERRITORY_SIZE, 19]:
+            for seed in range(3):
+                game = Game(dict(self.configs, board_size=board_size))
+                random_game(game, seed=seed, num_moves=board_size * board_size)
+                territory = game.board.get_territory_dfs()
+                self.assertEqual(game.board.get_territory(), territory)
+                self.assertEqual(self.vectorized(game), territory)
@@ -0,0 +1,71 @@
+import os
+import random
+import tempfile
+import unittest
+from src.game import Game
+from src.selfplay import random_policy, play_game, run_selfplay, read_records
+from src.utils import Stone, PASS
+
+def failing_policy(game, stone, rng):
+    raise RuntimeError('policy failed')
+
+class TestSelfPlay(unittest.TestCase):
+    '''
+    Test case for the self-play pipeline
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 5,
+                        'enable_self_destruct': False
+        }
+
+    def replay(self, record):
+        game = Game(self.configs)
+        stone = Stone.BLACK
+        for move in record['moves']:
+            if move == PASS:
+                game.pass_turn()
+            elif stone == Stone.BLACK:
+                game.place_black(*divmod(move, record['board_size']))
+            else:
+                game.place_white(*divmod(move, record['board_size']))
+            stone = Stone.WHITE if stone == Stone.BLACK else Stone.BLACK
+        return game
+
+    def test__play_game(self):
+        record = play_game(self.configs, random_policy, seed=1)
+        self.assertEqual(record, play_game(self.configs, random_policy, seed=1))
+        game = self.replay(record)
+        self.assertTrue(game.is_over())
+        self.assertEqual(record['moves'][-2:], [PASS, PASS])
+        self.assertEqual(record['num_black_captured'], game.num_black_captured)
+        self.assertEqual(record['num_white_captured'], game.num_white_captured)
+        scores = game.get_scores()
+        self.assertEqual(record['black_score'], scores[Stone.BLACK])
+        self.assertEqual(record['white_score'], scores[Stone.WHITE])
+
+    def test__random_policy(self):
+        game = Game(self.configs)
+        game.place_black(2, 2)
+        y, x = random_policy(game, Stone.WHITE, random.Random(0))
+        self.assertTrue(game.is_legal(Stone.WHITE, y, x))
+
+    def test__run_selfplay(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.jsonl')
+            num_games = run_selfplay(self.configs, 7, path, processes=2,
+                                     batch_size=3, max_pending=2, seed=10)
+            self.assertEqual(num_games, 7)
+            records = sorted(read_records(path), key=lambda record: record['seed'])
+        self.assertEqual([record['seed'] for record in records], list(range(10, 17)))
+        for record in records:
+            self.assertEqual(record, play_game(self.configs, random_policy, record['seed']))
+
+    def test__run_selfplay_error(self):
+        # the error of a worker reaches the caller instead of leaving the pool waiting
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.jsonl')
+            with self.assertRaises(RuntimeError):
+                run_selfplay(self.configs, 20, path, policy=failing_policy, processes=2,
+                             max_pending=2)
@@ -0,0 +1,117 @@
+import asyncio
+import tempfile
+import unittest
+from src.server import GameServer
+from src.utils import Stone
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    '''
+    Test case for the multi-game server, over TCP on localhost
+    '''
+    async def asyncSetUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False
+        }
+        self.evict_dir = tempfile.TemporaryDirectory()
+        self.server = GameServer(self.configs, evict_dir=self.evict_dir.name,
+                                 idle_seconds=3600.)
+        tcp_server = await self.server.start('127.0.0.1', 0)
+        self.port = tcp_server.sockets[0].getsockname()[1]
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for _, writer in self.clients:
+            writer.close()
+        await self.server.close()
+        self.evict_dir.cleanup()
+
+    async def connect(self):
+        client = await asyncio.open_connection('127.0.0.1', self.port)
+        self.clients.append(client)
+        return client
+
+    async def send(self, client, line):
+        reader, writer = client
+        writer.write((line + '\n').encode())
+        await writer.drain()
+        return (await reader.readline()).decode().strip()
+
+    async def test__play(self):
+        client = await self.connect()
+        reply = await self.send(client, 'new')
+        self.assertTrue(reply.startswith('ok '))
+        game_id = reply.split()[1]
+
+        self.assertEqual(await self.send(client, f'move {game_id} 3 3'), 'ok')
+        self.assertEqual(await self.send(client, f'move {game_id} 3 4'), 'ok')
+        self.assertEqual(await self.send(client, f'pass {game_id}'), 'ok')
+        self.assertEqual(await self.send(client, f'board {game_id}'),
+                         'ok w ......./......./......./...bw../......./......./.......')
+        self.assertEqual(await self.send(client, f'score {game_id}'), 'ok 0 0')
+
+        game = self.server.games[game_id].game
+        self.assertEqual(game.board[3, 3], Stone.BLACK)
+        self.assertEqual(game.board[3, 4], Stone.WHITE)
+
+    async def test__errors(self):
+        client = await self.connect()
+        game_id = (await self.send(client, 'new')).split()[1]
+        await self.send(client, f'move {game_id} 0 0')
+        self.assertTrue((await self.send(client, f'move {game_id} 0 0')).startswith('error'))
+        self.assertTrue((await self.send(client, f'move {game_id} 7 0')).startswith('error'))
+        self.assertTrue((await self.send(client, f'move {game_id} x 0')).startswith('error'))
+        self.assertTrue((await self.send(client, 'move 99 0 0')).startswith('error'))
+        self.assertTrue((await self.send(client, 'resign')).startswith('error'))
+        self.assertTrue((await self.send(client, f'move {game_id} \u00b2 3')).startswith('error'))
+        self.assertEqual(self.server.games[game_id].moves, [0])
+
+        # bytes that are not UTF-8 get an error reply and the connection stays usable
+        reader, writer = client
+        writer.write(b'\xff\xfe move\n')
+        await writer.drain()
+        self.assertTrue((await reader.readline()).decode().startswith('error'))
+        self.assertEqual(await self.send(client, f'move {game_id} 1 1'), 'ok')
+
+        # labels of several letters, and lines over the limit of the stream reader
+        self.assertTrue((await self.send(client, f'move {game_id} AB 3')).startswith('error'))
+        self.assertEqual(await self.send(client, 'x' * 200000), 'error line too long')
+        self.assertEqual(await self.send(client, f'move {game_id} 2 2'), 'ok')
+
+        # the game is over after two passes
+        await self.send(client, f'pass {game_id}')
+        await self.send(client, f'pass {game_id}')
+        self.assertTrue((await self.send(client, f'move {game_id} 1 1')).startswith('error'))
+
+    async def test__updates(self):
+        player = await self.connect()
+        watcher = await self.connect()
+        game_id = (await self.send(player, 'new')).split()[1]
+        self.assertEqual(await self.send(watcher, f'join {game_id}'), 'ok')
+
+        await self.send(player, f'move {game_id} 0 1')
+        update = (await watcher[0].readline()).decode().strip()
+        self.assertEqual(update, f'update {game_id} 0 1 w .b...../......./......./'
+                                 '......./......./......./.......')
+        await self.send(player, f'pass {game_id}')
+        update = (await watcher[0].readline()).decode().strip()
+        self.assertTrue(update.startswith(f'update {game_id} pass b '))
+
+    async def test__evict(self):
+        client = await self.connect()
+        game_ids = [(await self.send(client, 'new')).split()[1] for _ in range(3)]
+        for y, x in [(0, 0), (0, 1), (1, 1), (1, 0)]:
+            await self.send(client, f'move {game_ids[0]} {y} {x}')
+        self.server.games[game_ids[2]].last_used += 7200.
+
+        self.assertEqual(self.server.evict_idle(self.server.games[game_ids[2]].last_used), 2)
+        self.assertEqual(list(self.server.games), [game_ids[2]])
+
+        # an evicted game is replayed when it is used
+        self.assertEqual(await self.send(client, f'move {game_ids[0]} 2 2'), 'ok')
+        hosted = self.server.games[game_ids[0]]
+        self.assertEqual(hosted.moves, [0, 1, 8, 7, 16])
+        self.assertEqual(hosted.game.num_black_captured, 1)
+        self.assertEqual(hosted.turn, Stone.WHITE)
+        self.assertNotIn(game_ids[0], self.server.evicted)
@@ -0,0 +1,133 @@
+import io
+import unittest
+from src.sgf import iter_games, parse_game, replay_game, replay_stream, to_sgf
+from src.selfplay import play_game, random_policy
+from src.utils import Stone, PASS
+from src.exceptions import SGFException
+
+COLLECTION = r'''
+(;GM[1]FF[4]SZ[9]PB[Black \] player]C[a comment with ( and ) \\]
+;B[ee];W[cc](;B[dc];W[tt];B[])(;B[gg]))
+garbage between games
+(;GM[1]SZ[5]AB[aa][ba]AW[bb]
+;W[ab];B[ab];W[ca];B[];W[]
+)
+(;GM[1]SZ[5];B[ab
+'''
+
+class TestSGF(unittest.TestCase):
+    '''
+    Test case for reading and replaying SGF
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 19,
+                        'enable_self_destruct': False
+        }
+
+    def test__iter_games(self):
+        for chunk_size in [1, 2, 7, 1 << 20]:
+            games = list(iter_games(io.StringIO(COLLECTION), chunk_size))
+            self.assertEqual(len(games), 3)
+            self.assertTrue(games[0].startswith('(;GM[1]FF[4]SZ[9]'))
+            self.assertTrue(games[0].endswith('(;B[gg]))'))
+            self.assertTrue(games[1].startswith('(;GM[1]SZ[5]AB'))
+            self.assertEqual(games[2], '(;GM[1]SZ[5];B[ab\n')
+
+    def test__parse_game(self):
+        sgf_game = parse_game(next(iter_games(io.StringIO(COLLECTION))))
+        self.assertEqual(sgf_game.board_size, 9)
+        self.assertEqual(sgf_game.properties['PB'], [r'Black \] player'])
+        self.assertEqual(sgf_game.moves, [(Stone.BLACK, 4, 4), (Stone.WHITE, 2, 2),
+                                          (Stone.BLACK, 2, 3), (Stone.WHITE, None, None),
+                                          (Stone.BLACK, None, None)])
+        with self.assertRaises(SGFException):
+            parse_game('(;SZ[9];B[ee]')
+        with self.assertRaises(SGFException):
+            parse_game('(;SZ[9];B[e])')
+
+    def test__replay_stream(self):
+        replays = list(replay_stream(io.StringIO(COLLECTION), self.configs, chunk_size=5))
+        self.assertEqual(len(replays), 3)
+
+        first = replays[0]
+        self.assertIsNone(first.error)
+        self.assertEqual(first.illegal, [])
+        self.assertEqual(first.num_moves, 5)
+        self.assertTrue(first.game.is_over())
+        self.assertEqual(first.game.board[2, 3], Stone.BLACK)
+
+        # black plays on the white stone at (1, 0), then white captures the setup stones
+        second = replays[1]
+        self.assertEqual(second.game.board_size, 5)
+        self.assertEqual(second.illegal, [(2, Stone.BLACK, 1, 0, 'occupied')])
+        self.assertEqual(second.game.board[0, 0], Stone.EMPTY)
+        self.assertEqual(second.game.num_black_captured, 2)
+        self.assertTrue(second.game.is_over())
+
+        self.assertIsNotNone(replays[2].error)
+        self.assertIsNone(replays[2].game)
+
+    def test__ko(self):
+        sgf = '(;SZ[7];B[ba];B[ab];B[bc];W[ca];W[db];W[cc];W[bb];B[cb];W[bb];W[dd])'
+        replay = next(replay_stream(io.StringIO(sgf), self.configs))
+        self.assertEqual(replay.illegal, [(9, Stone.WHITE, 1, 1, 'ko')])
+        self.assertEqual(replay.game.board[3, 3], Stone.WHITE)
+
+    def test__round_trip(self):
+        record = play_game(dict(self.configs, board_size=7), random_policy, seed=0)
+        stone = Stone.BLACK
+        moves = []
+        for move in record['moves']:
+            moves.append((stone, None, None) if move == PASS else (stone,) + divmod(move, 7))
+            stone = Stone.WHITE if stone == Stone.BLACK else Stone.BLACK
+        replay = next(replay_stream(io.StringIO(to_sgf(7, moves)), self.configs))
+        self.assertEqual(replay.illegal, [])
+        self.assertEqual(replay.sgf_game.moves, moves)
+        self.assertEqual(replay.game.num_black_captured, record['num_black_captured'])
+        self.assertEqual(replay.game.num_white_captured, record['num_white_captured'])
+
+    def test__invalid_board_size(self):
+        # a game with a bad SZ is reported and the games around it are still replayed
+        sgf = '(;SZ[5];B[aa])(;SZ[abc];B[aa])(;SZ[0])(;SZ[5:7])(;SZ[5];W[bb])'
+        replays = list(replay_stream(io.StringIO(sgf), self.configs))
+        self.assertEqual(len(replays), 5)
+        self.assertEqual(replays[0].game.board[0, 0], Stone.BLACK)
+        for replay in replays[1:4]:
+            self.assertIsNotNone(replay.error)
+            self.assertIsNone(replay.game)
+        self.assertEqual(replays[4].game.board[1, 1], Stone.WHITE)
+        self.assertEqual(parse_game('(;SZ[7:7])').board_size, 7)
+
+    def test__compressed_points(self):
+        sgf_game = parse_game('(;SZ[5]AB[aa:bc][ee]AW[dc:cd];B[ea])')
+        self.assertEqual(sgf_game.setup, [(Stone.BLACK, 0, 0), (Stone.BLACK, 0, 1),
+                                          (Stone.BLACK, 1, 0), (Stone.BLACK, 1, 1),
+                                          (Stone.BLACK, 2, 0), (Stone.BLACK, 2, 1),
+                                          (Stone.BLACK, 4, 4), (Stone.WHITE, 2, 2),
+                                          (Stone.WHITE, 2, 3), (Stone.WHITE, 3, 2),
+                                          (Stone.WHITE, 3, 3)])
+        with self.assertRaises(SGFException):
+            parse_game('(;SZ[5]AB[aa:])')
+
+    def test__replay_game(self):
+        game, illegal = replay_game(parse_game('(;SZ[5]AB[bb];W[bb];W[cc];B[];W[])'),
+                                    self.configs)
+        self.assertEqual(game.board_size, 5)
+        self.assertEqual(illegal, [(1, Stone.WHITE, 1, 1, 'occupied')])
+        self.assertEqual(game.board[1, 1], Stone.BLACK)
+        self.assertEqual(game.board[2, 2], Stone.WHITE)
+        self.assertTrue(game.is_over())
+
+    def test__later_setup(self):
+        # the setup stone of the third node captures the white stone played before it, and
+        # would have made that white move self-destruct if placed before the first move
+        sgf_game = parse_game('(;SZ[5]AW[ee];B[ab];W[aa];AB[ba];W[cc]AW[dd])')
+        self.assertEqual(sgf_game.setup, [(Stone.WHITE, 4, 4)])
+        self.assertEqual(sgf_game.later_setup, [(2, Stone.BLACK, 0, 1), (2, Stone.WHITE, 3, 3)])
+        game, illegal = replay_game(sgf_game, self.configs)
+        self.assertEqual(illegal, [])
+        self.assertEqual(game.num_white_captured, 1)
+        self.assertEqual(game.board[0, 0], Stone.EMPTY)
+        self.assertEqual(game.board[3, 3], Stone.WHITE)
@@ -0,0 +1,118 @@
+import random
+import unittest
+from src.game import Game
+from src.utils import Stone, get_opposite_stone
+from src.exceptions import SelfDestructException, KoException
+from tests.utils import game_state
+
+class TestSnapshot(unittest.TestCase):
+    '''
+    Test case for forking games with Game.snapshot
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False
+        }
+
+    def play(self, game, rng, stone, moves, num_moves, use_make_move=False):
+        '''
+        Play random legal moves, appending them to `moves`, and return the stone to play
+        '''
+        size = game.board_size
+        while num_moves > 0:
+            y, x = rng.randrange(size), rng.randrange(size)
+            if game.board[y, x] != Stone.EMPTY:
+                continue
+            try:
+                if use_make_move:
+                    game.make_move(stone, y, x)
+                else:
+                    game._place_stone(stone, y, x)
+            except (SelfDestructException, KoException):
+                continue
+            moves.append((stone, y, x))
+            stone = get_opposite_stone(stone)
+            num_moves -= 1
+        return stone
+
+    def assertReplays(self, game, moves):
+        '''
+        Check that the game is in the state reached by replaying the moves on a new game
+        '''
+        replay = Game(self.configs)
+        for stone, y, x in moves:
+            replay._place_stone(stone, y, x)
+        self.assertEqual(game_state(game), game_state(replay))
+        self.assertEqual(game.get_scores(), replay.get_scores())
+
+    def fork_and_play(self, seed):
+        rng = random.Random(seed)
+        games = [(Game(self.configs), [], Stone.BLACK)]
+        for _ in range(4):
+            forks = []
+            for game, moves, stone in games:
+                fork = game.snapshot()
+                self.assertIsNot(fork.gm._group_map, game.gm._group_map)
+                forks.append((fork, list(moves), stone))
+            games += forks
+
+            # play different moves in every game, which must not affect the others
+            games = [(game, moves, self.play(game, rng, stone, moves, 6))
+                     for game, moves, stone in games]
+            for game, moves, _ in games:
+                self.assertReplays(game, moves)
+
+    def test__independent_forks(self):
+        for seed in range(3):
+            self.fork_and_play(seed)
+
+    def test__independent_forks_rules(self):
+        self.configs['enable_self_destruct'] = True
+        self.configs['superko'] = True
+        self.configs['incremental_territory'] = True
+        self.configs['board_backend'] = 'bitboard'
+        for seed in range(3):
+            self.fork_and_play(seed)
+
+    def test__unmake_after_snapshot(self):
+        self.configs['superko'] = True
+        for seed in range(3):
+            rng = random.Random(seed)
+            game = Game(self.configs)
+            moves = []
+            stone = self.play(game, rng, Stone.BLACK, moves, 20, use_make_move=True)
+            fork = game.snapshot()
+            fork_moves = list(moves)
+            fork_stone = stone
+
+            # both games change the shared groups, then the game unmakes every move
+            # including those played before the fork
+            for _ in range(3):
+                stone = self.play(game, rng, stone, moves, 5, use_make_move=True)
+                fork_stone = self.play(fork, rng, fork_stone, fork_moves, 5, use_make_move=True)
+                fork.snapshot()
+            while moves:
+                game.unmake_move()
+                moves.pop()
+                self.assertReplays(game, moves)
+            self.assertReplays(fork, fork_moves)
+
+            # the fork starts with nothing to unmake
+            self.assertEqual(len(game.snapshot()._move_stack), 0)
+
+    def test__snapshot_state(self):
+        self.configs['instrument'] = True
+        game = Game(self.configs)
+        game.place_black(1, 1)
+        game.pass_turn()
+        fork = game.snapshot()
+        self.assertEqual(fork.count_pass, 1)
+        self.assertEqual(fork.hash, game.hash)
+        self.assertIsNone(fork.stats())
+        self.assertEqual(game.stats()['counters']['moves'], 1)
+        fork.place_white(1, 2)
+        self.assertEqual(game.board[1, 2], Stone.EMPTY)
+        self.assertNotEqual(fork.hash, game.hash)
+        self.assertEqual(game.stats()['counters']['moves'], 1)
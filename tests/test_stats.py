@@ -0,0 +1,74 @@
+import unittest
+from src.game import Game
+from src.exceptions import SelfDestructException
+from tests.utils import capture2, self_destruct1, random_game
+
+class TestStats(unittest.TestCase):
+    '''
+    Test case for the instrumentation of the hot paths
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False
+        }
+
+    def test__disabled(self):
+        game = Game(self.configs)
+        self.assertIsNone(game.stats())
+        self.assertNotIn('resolve_board', game.gm.__dict__)
+        self.assertNotIn('get_scores', game.__dict__)
+
+    def test__counters(self):
+        game = Game(dict(self.configs, instrument=True))
+        capture2(game)
+        game.get_scores()
+        stats = game.stats()
+        counters = stats['counters']
+        self.assertEqual(counters['moves'], 10)
+        self.assertEqual(counters['captures'], 1)
+        self.assertEqual(counters['stones_removed'], 3)
+        # (4, 4) joins two black stones, (5, 4) and (3, 5) each join one white stone
+        self.assertEqual(counters['merges'], 4)
+        # one liberty for every contact between the captured stones and white stones
+        self.assertEqual(counters['liberties_restored'], 8)
+
+        timers = stats['timers']
+        self.assertEqual(timers['move']['count'], 10)
+        self.assertEqual(timers['resolve_board']['count'], 10)
+        self.assertEqual(timers['update_state']['count'], 10)
+        self.assertEqual(timers['check_ko']['count'], 10)
+        self.assertEqual(timers['check_self_destruct']['count'], 10)
+        self.assertEqual(timers['get_scores']['count'], 1)
+        self.assertEqual(sum(timers['move']['histogram_ns'].values()), 10)
+        self.assertGreater(timers['move']['max_us'], 0)
+
+    def test__rejected_move(self):
+        game = Game(self.configs)
+        game.enable_stats()
+        with self.assertRaises(SelfDestructException):
+            self_destruct1(game)
+        stats = game.stats()
+        self.assertEqual(stats['counters']['moves'], 4)
+        self.assertEqual(stats['timers']['resolve_board']['count'], 5)
+        self.assertEqual(stats['timers']['move']['count'], 5)
+
+    def test__same_game(self):
+        game = Game(self.configs)
+        reference = Game(self.configs)
+        game.enable_stats()
+        random_game(game, seed=2)
+        random_game(reference, seed=2)
+        self.assertEqual(game.board.to_array().tolist(), reference.board.to_array().tolist())
+        self.assertEqual(game.get_scores(), reference.get_scores())
+        self.assertEqual(game.stats()['counters']['stones_removed'],
+                         game.num_black_captured + game.num_white_captured)
+        self.assertGreater(game.stats()['counters']['path_compressions'], 0)
+
+        game._stats.reset()
+        self.assertEqual(game.stats()['counters']['moves'], 0)
+        self.assertEqual(game.stats()['timers']['move']['count'], 0)
+        game.disable_stats()
+        self.assertIsNone(game.stats())
+        self.assertNotIn('_get_group', game.gm.__dict__)
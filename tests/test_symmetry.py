@@ -0,0 +1,106 @@
+import random
+import unittest
+import numpy as np
+from src.game import Game
+from src.symmetry import (
+    NUM_SYMMETRIES, get_symmetry_table, symmetric_variants, canonicalize)
+from src.utils import Stone, get_opposite_stone
+from tests.utils import random_game
+
+class TestSymmetry(unittest.TestCase):
+    '''
+    Test case for the symmetric variants and canonical hashes of positions
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False,
+                        'canonical_hash': True
+        }
+
+    def replay(self, configs, stones):
+        '''
+        Return a game with the stones of the 2D array placed on the board
+        '''
+        game = Game(configs)
+        for y, x in zip(*np.nonzero(stones)):
+            game.board.place_stone(int(stones[y, x]), int(y), int(x))
+        return game
+
+    def test__variants(self):
+        size = self.configs['board_size']
+        points = np.arange(size * size).reshape(size, size)
+        variants = symmetric_variants(points)
+        self.assertEqual(variants.shape, (NUM_SYMMETRIES, size, size))
+        self.assertTrue(np.array_equal(variants[1], np.rot90(points)))
+        self.assertTrue(np.array_equal(variants[4], points.T))
+        for k, images in enumerate(get_symmetry_table(size)):
+            flat = variants[k].reshape(-1)
+            self.assertEqual([flat[images[idx]] for idx in range(size * size)],
+                             list(range(size * size)))
+        self.assertEqual(len({v.tobytes() for v in variants}), NUM_SYMMETRIES)
+
+    def test__symmetric_positions(self):
+        for board_backend in ['numpy', 'bitboard', 'flat']:
+            configs = dict(self.configs, board_backend=board_backend)
+            game = Game(configs)
+            random_game(game, seed=0, num_moves=30)
+            variants = game.symmetric_variants()
+            for k in range(NUM_SYMMETRIES):
+                variant = self.replay(configs, variants[k])
+                self.assertEqual(variant.canonical_hash, game.canonical_hash)
+                self.assertTrue(np.array_equal(
+                    variant.symmetric_variants()[variant.canonical_symmetry],
+                    variants[game.canonical_symmetry]))
+
+            other = Game(configs)
+            random_game(other, seed=1, num_moves=30)
+            self.assertNotEqual(other.canonical_hash, game.canonical_hash)
+
+    def test__incremental(self):
+        # the packed hashes kept up to date agree with those computed from the stones
+        for board_backend in ['numpy', 'bitboard', 'flat']:
+            configs = dict(self.configs, board_backend=board_backend)
+            reference = dict(configs, canonical_hash=False)
+            rng = random.Random(0)
+            game = Game(configs)
+            size = game.board_size
+            stone = Stone.BLACK
+            for _ in range(80):
+                y, x = rng.randrange(size), rng.randrange(size)
+                if game.is_legal(stone, y, x):
+                    game.make_move(stone, y, x)
+                    stone = get_opposite_stone(stone)
+                    if rng.random() < 0.2:
+                        game.unmake_move()
+                        stone = get_opposite_stone(stone)
+                copy = self.replay(reference, game.board.to_array())
+                self.assertEqual(game.board.packed_hash, copy.board.get_packed_hash())
+                self.assertEqual(game.canonical_hash, copy.canonical_hash)
+
+            fork = game.snapshot()
+            self.assertEqual(fork.canonical_hash, game.canonical_hash)
+            game.clear_board()
+            self.assertEqual(game.board.packed_hash, 0)
+            self.assertEqual(game.canonical_hash, 0)
+
+    def test__canonicalize(self):
+        games = []
+        for seed in range(4):
+            game = Game(self.configs)
+            random_game(game, seed=seed, num_moves=25)
+            games.append(game)
+        stones = np.stack([v for game in games for v in game.symmetric_variants()])
+
+        canonical, hashes, symmetries = canonicalize(stones)
+        self.assertEqual(canonical.shape, stones.shape)
+        self.assertEqual(hashes.dtype, np.uint64)
+        for i, game in enumerate(games):
+            rows = slice(i * NUM_SYMMETRIES, (i + 1) * NUM_SYMMETRIES)
+            self.assertEqual(set(hashes[rows].tolist()), {game.canonical_hash})
+            self.assertEqual(len({c.tobytes() for c in canonical[rows]}), 1)
+            self.assertEqual(symmetries[i * NUM_SYMMETRIES], game.canonical_symmetry)
+            self.assertTrue(np.array_equal(
+                canonical[i * NUM_SYMMETRIES],
+                game.symmetric_variants()[game.canonical_symmetry]))
@@ -0,0 +1,90 @@
+import random
+import unittest
+from src.game import Game
+from src.utils import Stone, get_opposite_stone
+from src.exceptions import SelfDestructException, KoException
+from tests.utils import capture3, self_destruct3
+
+class TestTerritory(unittest.TestCase):
+    '''
+    Test case for incremental territory tracking against the full recount
+    '''
+    def setUp(self):
+        self.configs = {'black_stone': 'b',
+                        'white_stone': 'w',
+                        'board_size': 7,
+                        'enable_self_destruct': False,
+                        'incremental_territory': True
+        }
+
+    def assertTerritory(self, game):
+        territory = game.gm.territory
+        self.assertEqual(territory.get_territory(), game.board.get_territory_dfs())
+
+        # every empty point is in exactly one region, with the right contacts
+        size = game.board_size
+        regions = {id(region): region for region in territory._regions if region is not None}
+        points = set()
+        for region in regions.values():
+            self.assertFalse(points & region.points)
+            points |= region.points
+            contacts = {Stone.BLACK: 0, Stone.WHITE: 0}
+            for idx in region.points:
+                for ly, lx in game.board.get_liberty_coords(*divmod(idx, size)):
+                    if game.board[ly, lx] != Stone.EMPTY:
+                        contacts[game.board[ly, lx]] += 1
+            self.assertEqual((region.black, region.white),
+                             (contacts[Stone.BLACK], contacts[Stone.WHITE]))
+        self.assertEqual(points, {y * size + x for y in range(size) for x in range(size)
+                                  if game.board[y, x] == Stone.EMPTY})
+
+    def play_random(self, configs, seed, num_moves=150, unmake=False):
+        rng = random.Random(seed)
+        game = Game(configs)
+        size = game.board_size
+        stone = Stone.BLACK
+        for _ in range(num_moves):
+            y, x = rng.randrange(size), rng.randrange(size)
+            if game.board[y, x] != Stone.EMPTY:
+                continue
+            try:
+                game.make_move(stone, y, x)
+            except (SelfDestructException, KoException):
+                continue
+            self.assertTerritory(game)
+            if unmake and rng.random() < 0.3:
+                game.unmake_move()
+                self.assertTerritory(game)
+                continue
+            stone = get_opposite_stone(stone)
+        return game
+
+    def test__random_games(self):
+        for seed in range(4):
+            game = self.play_random(self.configs, seed)
+            reference = game.board.get_territory_dfs()
+            scores = game.get_scores()
+            self.assertEqual(scores[Stone.BLACK], reference[Stone.BLACK] - game.num_black_captured)
+            self.assertEqual(scores[Stone.WHITE], reference[Stone.WHITE] - game.num_white_captured)
+
+    def test__random_games_unmake(self):
+        for seed in range(3):
+            game = self.play_random(self.configs, seed, unmake=True)
+            while game._move_stack:
+                game.unmake_move()
+                self.assertTerritory(game)
+            self.assertEqual(game.gm.territory.get_territory(), {Stone.BLACK: 0, Stone.WHITE: 0})
+
+    def test__self_destruct(self):
+        self.configs['enable_self_destruct'] = True
+        self.play_random(dict(self.configs, board_backend='bitboard'), 0)
+        game = Game(self.configs)
+        self_destruct3(game)
+        self.assertTerritory(game)
+        # the white ring owns the cleared inside and the whole outside
+        self.assertEqual(game.get_scores(), {Stone.BLACK: -9, Stone.WHITE: 49 - 16})
+
+    def test__capture(self):
+        game = Game(self.configs)
+        capture3(game)
+        self.assertTerritory(game)
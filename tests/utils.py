@@ -1,3 +1,7 @@
+import random
+from src.utils import Stone, get_opposite_stone
+from src.exceptions import SelfDestructException, KoException
+
 def capture1(game):
     '''
     Case of capture where white captures black as follows
@@ -119,3 +123,40 @@ def self_destruct3(game):
         game.place_white(y, x)
 
     game.place_black(3, 3)
+
+def random_game(game, seed=0, num_moves=None):
+    '''
+    Play a seeded random game, alternating black and white stones on random
+    empty coordinates. Moves violating the self-destruct or ko rules are skipped
+    '''
+    rng = random.Random(seed)
+    size = game.board_size
+    stone = Stone.BLACK
+    for _ in range(num_moves or 3 * size * size):
+        y, x = rng.randrange(size), rng.randrange(size)
+        if game.board[y, x] != Stone.EMPTY:
+            continue
+        try:
+            if stone == Stone.BLACK:
+                game.place_black(y, x)
+            else:
+                game.place_white(y, x)
+        except (SelfDestructException, KoException):
+            continue
+        stone = get_opposite_stone(stone)
+
+def game_state(game):
+    '''
+    Return everything that determines how the game plays on
+    '''
+    gm = game.gm
+    groups = {}
+    for y in range(game.board_size):
+        for x in range(game.board_size):
+            g = gm._get_group(y, x)
+            if g is not None:
+                groups[(y, x)] = (g.stone, frozenset(g.liberties),
+                                  frozenset(g.removed_liberties), frozenset(g.coords))
+    positions = frozenset(gm._positions) if gm._positions is not None else None
+    return (game.board.to_array().tolist(), game.hash, gm._ko, dict(gm._num_captured_stones),
+            game.count_pass, groups, positions)